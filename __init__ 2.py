@@ -14,9 +14,11 @@ from .room import (
 )
 from .guest import (
     GuestBase, GuestCreate, GuestUpdate, GuestResponse,
+    GuestSearchResult, GuestSearchResponse, GuestMergeRequest, GuestMergeResponse,
     ReservationBase, ReservationCreate, ReservationUpdate,
-    ReservationCheckin, ReservationCheckout, ReservationResponse,
-    ReservationSummary
+    ReservationCheckin, ReservationCheckout, ReservationBulkCheckin,
+    ReservationBulkCheckout, ReservationBulkResult, ReservationBulkResponse,
+    ReservationResponse, ReservationSummary
 )
 from .fnb import (
     OutletBase, OutletCreate, OutletUpdate, OutletResponse,
@@ -29,10 +31,13 @@ from .fnb import (
 from .analytics import (
     RevenueResponse, OccupancyRateResponse, TopItemSold, TopItemsResponse,
     GuestSpending, GuestSpendingResponse, RevenueSplitItem, RevenueSplitResponse,
-    ARPRResponse, DashboardKPIs, DateRangeFilter, RevenueByDateResponse,
+    ARPRResponse, DashboardKPIs, DateRangeFilter, GranularityEnum, RevenueByDateResponse,
     OutletPerformance, OutletPerformanceResponse, HourlyRevenue, HourlyRevenueResponse,
-    PaymentMethodBreakdown, PaymentMethodResponse, RoomTypePerformance, RoomTypePerformanceResponse
+    PaymentMethodBreakdown, PaymentMethodResponse, RoomTypePerformance, RoomTypePerformanceResponse,
+    MenuClassEnum, MenuEngineeringItem, MenuEngineeringGroup, MenuEngineeringResponse
 )
+from .payment import PaymentResponse, AuditLogResponse
+from .pagination import CursorPage
 
 __all__ = [
     # User schemas
@@ -46,9 +51,11 @@ __all__ = [
     
     # Guest and Reservation schemas
     "GuestBase", "GuestCreate", "GuestUpdate", "GuestResponse",
+    "GuestSearchResult", "GuestSearchResponse", "GuestMergeRequest", "GuestMergeResponse",
     "ReservationBase", "ReservationCreate", "ReservationUpdate",
-    "ReservationCheckin", "ReservationCheckout", "ReservationResponse",
-    "ReservationSummary",
+    "ReservationCheckin", "ReservationCheckout", "ReservationBulkCheckin",
+    "ReservationBulkCheckout", "ReservationBulkResult", "ReservationBulkResponse",
+    "ReservationResponse", "ReservationSummary",
     
     # F&B schemas
     "OutletBase", "OutletCreate", "OutletUpdate", "OutletResponse",
@@ -61,8 +68,15 @@ __all__ = [
     # Analytics schemas
     "RevenueResponse", "OccupancyRateResponse", "TopItemSold", "TopItemsResponse",
     "GuestSpending", "GuestSpendingResponse", "RevenueSplitItem", "RevenueSplitResponse",
-    "ARPRResponse", "DashboardKPIs", "DateRangeFilter", "RevenueByDateResponse",
+    "ARPRResponse", "DashboardKPIs", "DateRangeFilter", "GranularityEnum", "RevenueByDateResponse",
     "OutletPerformance", "OutletPerformanceResponse", "HourlyRevenue", "HourlyRevenueResponse",
-    "PaymentMethodBreakdown", "PaymentMethodResponse", "RoomTypePerformance", "RoomTypePerformanceResponse"
+    "PaymentMethodBreakdown", "PaymentMethodResponse", "RoomTypePerformance", "RoomTypePerformanceResponse",
+    "MenuClassEnum", "MenuEngineeringItem", "MenuEngineeringGroup", "MenuEngineeringResponse",
+    
+    # Payment and audit schemas
+    "PaymentResponse", "AuditLogResponse",
+    
+    # Pagination schemas
+    "CursorPage"
 ]
 
@@ -3,7 +3,7 @@ Hotel Management System - Models Package
 Imports all database models and sets up relationships.
 """
 
-from .base import BaseModel, TimestampMixin
+from .base import BaseModel, TimestampMixin, PartitionedModel
 from .user import User, UserRoleEnum
 from .room import Room, RoomType, RoomStatusEnum
 from .guest import Guest, IDTypeEnum
@@ -11,6 +11,8 @@ from .reservation import Reservation, ReservationStatusEnum
 from .fnb import Outlet, ItemCategory, Item, OutletTypeEnum
 from .order import Order, OrderLine, OrderTypeEnum, OrderStatusEnum, PaymentMethodEnum, PaymentStatusEnum
 from .payment import Payment, AuditLog, PaymentMethodEnum as PaymentMethodEnumPayment, PaymentTypeEnum, PaymentStatusEnum as PaymentStatusEnumPayment, ActionEnum
+from .night_audit_run import NightAuditRun, NightAuditStatusEnum, NightAuditStepEnum
+from .item_sales_daily import ItemSalesDaily
 
 # Import the base for creating tables
 from ..core.database import Base
@@ -19,6 +21,7 @@ from ..core.database import Base
 __all__ = [
     "BaseModel",
     "TimestampMixin",
+    "PartitionedModel",
     "User",
     "UserRoleEnum",
     "Room",
@@ -40,8 +43,14 @@ __all__ = [
     "PaymentStatusEnum",
     "Payment",
     "AuditLog",
+    "PaymentMethodEnumPayment",
+    "PaymentStatusEnumPayment",
     "PaymentTypeEnum",
     "ActionEnum",
+    "NightAuditRun",
+    "NightAuditStatusEnum",
+    "NightAuditStepEnum",
+    "ItemSalesDaily",
     "Base"
 ]
 
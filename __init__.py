@@ -3,7 +3,10 @@ Hotel Management System - Routers Package
 Imports all API routers for the application.
 """
 
-from . import auth, analytics
+from . import auth, analytics, exports, guests, reservations, rooms, kitchen, orders, payments, audit_logs
 
-__all__ = ["auth", "analytics"]
+__all__ = [
+    "auth", "analytics", "exports", "guests", "reservations", "rooms", "kitchen",
+    "orders", "payments", "audit_logs"
+]
 
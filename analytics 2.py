@@ -7,6 +7,20 @@ from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime
 from decimal import Decimal
+import enum
+
+class GranularityEnum(str, enum.Enum):
+    """Time bucket granularity for date range analytics."""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+class MenuClassEnum(str, enum.Enum):
+    """Menu engineering class: popularity x contribution margin."""
+    STAR = "star"            # Popular, high margin
+    PLOWHORSE = "plowhorse"  # Popular, low margin
+    PUZZLE = "puzzle"        # Unpopular, high margin
+    DOG = "dog"              # Unpopular, low margin
 
 class RevenueResponse(BaseModel):
     """Schema for revenue analytics."""
@@ -14,6 +28,7 @@ class RevenueResponse(BaseModel):
     room_revenue: float
     fnb_revenue: float
     date: date
+    as_of: Optional[datetime] = None
 
 class OccupancyRateResponse(BaseModel):
     """Schema for occupancy rate analytics."""
@@ -24,6 +39,7 @@ class OccupancyRateResponse(BaseModel):
     cleaning_rooms: int
     occupancy_rate: float
     date: date
+    as_of: Optional[datetime] = None
 
 class TopItemSold(BaseModel):
     """Schema for top sold item."""
@@ -37,6 +53,9 @@ class TopItemsResponse(BaseModel):
     """Schema for top items sold analytics."""
     items: List[TopItemSold]
     date: date
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    as_of: Optional[datetime] = None
 
 class GuestSpending(BaseModel):
     """Schema for guest spending."""
@@ -51,6 +70,7 @@ class GuestSpendingResponse(BaseModel):
     """Schema for guest spending analytics."""
     guests: List[GuestSpending]
     date: date
+    as_of: Optional[datetime] = None
 
 class RevenueSplitItem(BaseModel):
     """Schema for revenue split item."""
@@ -63,6 +83,7 @@ class RevenueSplitResponse(BaseModel):
     total_revenue: float
     split: List[RevenueSplitItem]
     date: date
+    as_of: Optional[datetime] = None
 
 class ARPRResponse(BaseModel):
     """Schema for Average Revenue Per Room."""
@@ -70,6 +91,7 @@ class ARPRResponse(BaseModel):
     total_revenue: float
     occupied_rooms: int
     date: date
+    as_of: Optional[datetime] = None
 
 class DashboardKPIs(BaseModel):
     """Schema for dashboard KPIs summary."""
@@ -79,6 +101,7 @@ class DashboardKPIs(BaseModel):
     guest_spending: GuestSpendingResponse
     revenue_split: RevenueSplitResponse
     arpr: ARPRResponse
+    as_of: Optional[datetime] = None
 
 class DateRangeFilter(BaseModel):
     """Schema for date range filtering."""
@@ -91,6 +114,7 @@ class RevenueByDateResponse(BaseModel):
     room_revenue: List[float]
     fnb_revenue: List[float]
     total_revenue: List[float]
+    granularity: GranularityEnum = GranularityEnum.DAILY
 
 class OutletPerformance(BaseModel):
     """Schema for outlet performance."""
@@ -105,6 +129,7 @@ class OutletPerformanceResponse(BaseModel):
     """Schema for outlet performance analytics."""
     outlets: List[OutletPerformance]
     date: date
+    as_of: Optional[datetime] = None
 
 class HourlyRevenue(BaseModel):
     """Schema for hourly revenue breakdown."""
@@ -116,6 +141,12 @@ class HourlyRevenueResponse(BaseModel):
     """Schema for hourly revenue analytics."""
     hourly_data: List[HourlyRevenue]
     date: date
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    outlet_id: Optional[str] = None
+    days: List[date] = []
+    revenue_matrix: List[List[float]] = []  # days x 24 hours
+    orders_matrix: List[List[int]] = []  # days x 24 hours
 
 class PaymentMethodBreakdown(BaseModel):
     """Schema for payment method breakdown."""
@@ -129,6 +160,8 @@ class PaymentMethodResponse(BaseModel):
     breakdown: List[PaymentMethodBreakdown]
     total_amount: float
     date: date
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
 
 class RoomTypePerformance(BaseModel):
     """Schema for room type performance."""
@@ -137,10 +170,47 @@ class RoomTypePerformance(BaseModel):
     total_bookings: int
     total_revenue: float
     occupancy_rate: float
-    average_rate: float
+    average_rate: float  # ADR: room revenue per room night sold
+    revpar: float = 0.0  # Room revenue per available room night
+    room_nights_sold: int = 0
+    available_room_nights: int = 0
 
 class RoomTypePerformanceResponse(BaseModel):
     """Schema for room type performance analytics."""
     room_types: List[RoomTypePerformance]
     date: date
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+class MenuEngineeringItem(BaseModel):
+    """Schema for an item in the menu engineering matrix."""
+    item_id: str
+    item_name: str
+    outlet_id: str
+    outlet_name: str
+    category_id: Optional[str] = None
+    category_name: Optional[str] = None
+    quantity_sold: int
+    revenue: float
+    food_cost: float
+    contribution_margin: float  # Per item sold: (revenue - food cost) / quantity
+    total_contribution_margin: float
+    menu_mix: float  # Share of the quantity sold in its outlet and category, in percent
+    classification: MenuClassEnum
+
+class MenuEngineeringGroup(BaseModel):
+    """Schema for the thresholds of one outlet and category."""
+    outlet_id: str
+    category_id: Optional[str] = None
+    item_count: int
+    quantity_sold: int
+    popularity_threshold: float  # Menu mix percent above which an item is popular (70% of an equal share)
+    average_contribution_margin: float  # Weighted by quantity sold
 
+class MenuEngineeringResponse(BaseModel):
+    """Schema for the menu engineering report."""
+    items: List[MenuEngineeringItem]
+    groups: List[MenuEngineeringGroup]
+    date: date
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
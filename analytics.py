@@ -5,45 +5,146 @@ Handles dashboard KPIs and analytics endpoints.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from datetime import date, datetime, timedelta
-from typing import List
-from ..core.database import get_db
-from ..core.security import get_current_user
+from sqlalchemy import func, and_, or_, case, cast, DateTime
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+from ..core.config import settings
+from ..core.database import get_analytics_db, open_analytics_session
+from ..core.partitions import add_months
+from ..core.security import get_current_identity, AuthenticatedUser
+from ..core.single_flight import SingleFlight, coalesce
 from ..models import *
 from ..schemas.analytics import *
+from ..services.kpi_snapshot import serve_snapshot
+from ..services.item_sales import top_items as top_items_sold
+import inspect
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+# Identical concurrent analytics requests share one computation
+analytics_flight = SingleFlight(hold_seconds=settings.analytics_result_hold)
+
+# Largest top-items list served
+MAX_TOP_ITEMS = 50
+
+def day_bounds(day: date):
+    """
+    Get the [start, end) datetimes of a business day.
+    Filtering created_at on a range rather than func.date() keeps the predicate
+    index-friendly and lets Postgres prune monthly partitions.
+    """
+    day_start = datetime.combine(day, datetime.min.time())
+    return day_start, day_start + timedelta(days=1)
+
+def range_bounds(start_date: date, end_date: date):
+    """Get the [start, end) datetimes of a date range, end date inclusive."""
+    return day_bounds(start_date)[0], day_bounds(end_date)[1]
+
+def resolve_date_range(start_date: Optional[date], end_date: Optional[date]) -> DateRangeFilter:
+    """Build a date range from optional bounds, defaulting to today."""
+    today = date.today()
+    date_range = DateRangeFilter(
+        start_date=start_date or end_date or today,
+        end_date=end_date or start_date or today
+    )
+    validate_date_range(date_range)
+    return date_range
+
+def validate_date_range(date_range: DateRangeFilter):
+    """Reject date ranges that end before they start."""
+    if date_range.end_date < date_range.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date"
+        )
+
+def time_bucket(column, granularity: GranularityEnum, dialect_name: str):
+    """Truncate a timestamp column to the start of its day, week or month in SQL."""
+    if dialect_name == "postgresql":
+        unit = {
+            GranularityEnum.DAILY: "day",
+            GranularityEnum.WEEKLY: "week",
+            GranularityEnum.MONTHLY: "month",
+        }[granularity]
+        return func.date_trunc(unit, column)
+    
+    # SQLite equivalents; weeks start on Monday like date_trunc('week')
+    if granularity == GranularityEnum.WEEKLY:
+        return func.date(column, "weekday 0", "-6 days")
+    if granularity == GranularityEnum.MONTHLY:
+        return func.strftime("%Y-%m-01", column)
+    return func.date(column)
+
+def hour_bucket(column, dialect_name: str):
+    """Truncate a timestamp column to the hour, in local time, in SQL."""
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", cast(column, DateTime))
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+def bucket_start(day: date, granularity: GranularityEnum) -> date:
+    """Get the first day of the bucket containing a date."""
+    if granularity == GranularityEnum.WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if granularity == GranularityEnum.MONTHLY:
+        return day.replace(day=1)
+    return day
+
+def bucket_dates(start_date: date, end_date: date, granularity: GranularityEnum) -> List[date]:
+    """Get every bucket start in a date range, including empty ones."""
+    dates = []
+    current = bucket_start(start_date, granularity)
+    while current <= end_date:
+        dates.append(current)
+        if granularity == GranularityEnum.MONTHLY:
+            current = add_months(current, 1)
+        else:
+            current += timedelta(days=7 if granularity == GranularityEnum.WEEKLY else 1)
+    return dates
+
+def as_date(value) -> date:
+    """Convert a bucket value returned by the database to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
 @router.get("/revenue-today", response_model=RevenueResponse)
+@serve_snapshot("revenue-today")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_revenue_today(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     📊 Revenue Today - Get today's total revenue breakdown.
     """
     today = date.today()
+    day_start, day_end = day_bounds(today)
     
     # Get total revenue for today
     total_revenue_query = db.query(func.sum(Payment.amount)).filter(
-        func.date(Payment.created_at) == today,
+        Payment.created_at >= day_start,
+        Payment.created_at < day_end,
         Payment.status == PaymentStatusEnumPayment.COMPLETED
     ).scalar() or 0
     
     # Get room revenue for today
     room_revenue_query = db.query(func.sum(Payment.amount)).filter(
-        func.date(Payment.created_at) == today,
+        Payment.created_at >= day_start,
+        Payment.created_at < day_end,
         Payment.payment_type == PaymentTypeEnum.ROOM_CHARGE,
         Payment.status == PaymentStatusEnumPayment.COMPLETED
     ).scalar() or 0
     
     # Get F&B revenue for today
     fnb_revenue_query = db.query(func.sum(Payment.amount)).filter(
-        func.date(Payment.created_at) == today,
+        Payment.created_at >= day_start,
+        Payment.created_at < day_end,
         Payment.payment_type == PaymentTypeEnum.FNB_CHARGE,
         Payment.status == PaymentStatusEnumPayment.COMPLETED
     ).scalar() or 0
@@ -56,9 +157,11 @@ async def get_revenue_today(
     )
 
 @router.get("/occupancy-rate", response_model=OccupancyRateResponse)
+@serve_snapshot("occupancy-rate")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_occupancy_rate(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     🏨 Occupancy Rate - Get current room occupancy statistics.
@@ -105,59 +208,74 @@ async def get_occupancy_rate(
     )
 
 @router.get("/top-items-sold", response_model=TopItemsResponse)
+@serve_snapshot("top-items-sold")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_top_items_sold(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 5,
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
-    🍔 Top 5 Items Sold - Get most sold items with quantities & revenue.
+    🍔 Top Items Sold - Get most sold items with quantities & revenue.
+    Read from the daily item sales rollup, so a week or a quarter costs about
+    as much as a day. Defaults to the top 5 of today.
     """
-    today = date.today()
+    date_range = resolve_date_range(start_date, end_date)
+    if not 1 <= limit <= MAX_TOP_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {MAX_TOP_ITEMS}"
+        )
     
-    # Query top 5 items sold today
-    top_items = db.query(
-        Item.id,
-        Item.name,
-        Outlet.name.label('outlet_name'),
-        func.sum(OrderLine.quantity).label('quantity_sold'),
-        func.sum(OrderLine.line_total).label('revenue')
-    ).join(
-        OrderLine, Item.id == OrderLine.item_id
-    ).join(
-        Order, OrderLine.order_id == Order.id
-    ).join(
-        Outlet, Item.outlet_id == Outlet.id
-    ).filter(
-        func.date(Order.created_at) == today,
-        Order.status.in_([OrderStatusEnum.SERVED, OrderStatusEnum.PAID])
-    ).group_by(
-        Item.id, Item.name, Outlet.name
-    ).order_by(
-        func.sum(OrderLine.quantity).desc()
-    ).limit(5).all()
+    top_items = top_items_sold(db, date_range.start_date, date_range.end_date, limit)
+    
+    # Names of the few items selected
+    names = {
+        item.id: item
+        for item in db.query(
+            Item.id,
+            Item.name,
+            Outlet.name.label('outlet_name')
+        ).join(
+            Outlet, Item.outlet_id == Outlet.id
+        ).filter(
+            Item.id.in_([item_id for item_id, _, _ in top_items])
+        )
+    } if top_items else {}
     
     items = [
         TopItemSold(
-            item_id=str(item.id),
-            item_name=item.name,
-            outlet_name=item.outlet_name,
-            quantity_sold=int(item.quantity_sold),
-            revenue=float(item.revenue)
+            item_id=str(item_id),
+            item_name=names[item_id].name,
+            outlet_name=names[item_id].outlet_name,
+            quantity_sold=int(quantity),
+            revenue=float(revenue)
         )
-        for item in top_items
+        for item_id, quantity, revenue in top_items
+        if item_id in names
     ]
     
-    return TopItemsResponse(items=items, date=today)
+    return TopItemsResponse(
+        items=items,
+        date=date_range.end_date,
+        start_date=date_range.start_date,
+        end_date=date_range.end_date
+    )
 
 @router.get("/guest-spending", response_model=GuestSpendingResponse)
+@serve_snapshot("guest-spending")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_guest_spending(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     👤 Guest Spending - Get ranking of guests by total spending.
     """
     today = date.today()
+    day_start, day_end = day_bounds(today)
     
     # Query guest spending for today
     guest_spending = db.query(
@@ -167,13 +285,13 @@ async def get_guest_spending(
         Room.room_number,
         func.sum(Payment.amount).label('total_spending'),
         func.sum(
-            func.case(
+            case(
                 (Payment.payment_type == PaymentTypeEnum.ROOM_CHARGE, Payment.amount),
                 else_=0
             )
         ).label('room_charges'),
         func.sum(
-            func.case(
+            case(
                 (Payment.payment_type == PaymentTypeEnum.FNB_CHARGE, Payment.amount),
                 else_=0
             )
@@ -192,7 +310,8 @@ async def get_guest_spending(
             )
         )
     ).filter(
-        func.date(Payment.created_at) == today,
+        Payment.created_at >= day_start,
+        Payment.created_at < day_end,
         Payment.status == PaymentStatusEnumPayment.COMPLETED,
         Reservation.status == ReservationStatusEnum.CHECKED_IN
     ).group_by(
@@ -216,21 +335,25 @@ async def get_guest_spending(
     return GuestSpendingResponse(guests=guests, date=today)
 
 @router.get("/revenue-split", response_model=RevenueSplitResponse)
+@serve_snapshot("revenue-split")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_revenue_split(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     💰 Revenue Split (Rooms vs F&B) - Pie chart comparing revenue sources.
     """
     today = date.today()
+    day_start, day_end = day_bounds(today)
     
     # Get revenue by payment type
     revenue_split = db.query(
         Payment.payment_type,
         func.sum(Payment.amount).label('amount')
     ).filter(
-        func.date(Payment.created_at) == today,
+        Payment.created_at >= day_start,
+        Payment.created_at < day_end,
         Payment.status == PaymentStatusEnumPayment.COMPLETED
     ).group_by(Payment.payment_type).all()
     
@@ -256,18 +379,22 @@ async def get_revenue_split(
     )
 
 @router.get("/arpr", response_model=ARPRResponse)
+@serve_snapshot("arpr")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_average_revenue_per_room(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     📈 Average Revenue per Room (ARPR) - Calculate ARPR for today.
     """
     today = date.today()
+    day_start, day_end = day_bounds(today)
     
     # Get total room revenue for today
     room_revenue = db.query(func.sum(Payment.amount)).filter(
-        func.date(Payment.created_at) == today,
+        Payment.created_at >= day_start,
+        Payment.created_at < day_end,
         Payment.payment_type == PaymentTypeEnum.ROOM_CHARGE,
         Payment.status == PaymentStatusEnumPayment.COMPLETED
     ).scalar() or 0
@@ -288,39 +415,29 @@ async def get_average_revenue_per_room(
     )
 
 @router.get("/dashboard-kpis", response_model=DashboardKPIs)
+@serve_snapshot("dashboard-kpis")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_dashboard_kpis(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     Get all dashboard KPIs in a single request for efficiency.
     """
-    # Get all KPIs
-    revenue_today = await get_revenue_today(db, current_user)
-    occupancy_rate = await get_occupancy_rate(db, current_user)
-    top_items = await get_top_items_sold(db, current_user)
-    guest_spending = await get_guest_spending(db, current_user)
-    revenue_split = await get_revenue_split(db, current_user)
-    arpr = await get_average_revenue_per_room(db, current_user)
-    
-    return DashboardKPIs(
-        revenue_today=revenue_today,
-        occupancy_rate=occupancy_rate,
-        top_items=top_items,
-        guest_spending=guest_spending,
-        revenue_split=revenue_split,
-        arpr=arpr
-    )
+    return (await compute_analytics_snapshot(db, ["dashboard-kpis"]))["dashboard-kpis"]
 
 @router.get("/outlet-performance", response_model=OutletPerformanceResponse)
+@serve_snapshot("outlet-performance")
+@coalesce(analytics_flight, open_analytics_session)
 async def get_outlet_performance(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
 ):
     """
     Get outlet performance analytics.
     """
     today = date.today()
+    day_start, day_end = day_bounds(today)
     
     outlet_performance = db.query(
         Outlet.id,
@@ -335,7 +452,8 @@ async def get_outlet_performance(
         or_(
             Order.id.is_(None),
             and_(
-                func.date(Order.created_at) == today,
+                Order.created_at >= day_start,
+                Order.created_at < day_end,
                 Order.status.in_([OrderStatusEnum.SERVED, OrderStatusEnum.PAID])
             )
         )
@@ -357,3 +475,427 @@ async def get_outlet_performance(
     
     return OutletPerformanceResponse(outlets=outlets, date=today)
 
+@router.get("/revenue-by-date", response_model=RevenueByDateResponse)
+@coalesce(analytics_flight, open_analytics_session)
+async def get_revenue_by_date(
+    date_range: DateRangeFilter = Depends(),
+    granularity: GranularityEnum = GranularityEnum.DAILY,
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
+):
+    """
+    Get room, F&B and total revenue per day, week or month over a date range.
+    Computed with a single grouped query; buckets without revenue are filled with zeros.
+    """
+    validate_date_range(date_range)
+    range_start, range_end = range_bounds(date_range.start_date, date_range.end_date)
+    bucket = time_bucket(Payment.created_at, granularity, db.get_bind().dialect.name)
+    
+    revenue_rows = db.query(
+        bucket.label('bucket'),
+        func.sum(
+            case((Payment.payment_type == PaymentTypeEnum.ROOM_CHARGE, Payment.amount), else_=0)
+        ).label('room_revenue'),
+        func.sum(
+            case((Payment.payment_type == PaymentTypeEnum.FNB_CHARGE, Payment.amount), else_=0)
+        ).label('fnb_revenue'),
+        func.sum(Payment.amount).label('total_revenue')
+    ).filter(
+        Payment.created_at >= range_start,
+        Payment.created_at < range_end,
+        Payment.status == PaymentStatusEnumPayment.COMPLETED
+    ).group_by(bucket).all()
+    
+    revenue_by_bucket = {as_date(row.bucket): row for row in revenue_rows}
+    dates = bucket_dates(date_range.start_date, date_range.end_date, granularity)
+    
+    room_revenue, fnb_revenue, total_revenue = [], [], []
+    for bucket_date in dates:
+        row = revenue_by_bucket.get(bucket_date)
+        room_revenue.append(float(row.room_revenue or 0) if row else 0.0)
+        fnb_revenue.append(float(row.fnb_revenue or 0) if row else 0.0)
+        total_revenue.append(float(row.total_revenue or 0) if row else 0.0)
+    
+    return RevenueByDateResponse(
+        dates=dates,
+        room_revenue=room_revenue,
+        fnb_revenue=fnb_revenue,
+        total_revenue=total_revenue,
+        granularity=granularity
+    )
+
+@router.get("/hourly-revenue", response_model=HourlyRevenueResponse)
+@coalesce(analytics_flight, open_analytics_session)
+async def get_hourly_revenue(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    outlet_id: Optional[UUID] = None,
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
+):
+    """
+    Get F&B revenue and order counts per hour, optionally for one outlet.
+    Returns per-hour totals plus a dense day x hour matrix for heatmaps.
+    Defaults to today when no date range is given.
+    """
+    date_range = resolve_date_range(start_date, end_date)
+    range_start, range_end = range_bounds(date_range.start_date, date_range.end_date)
+    bucket = hour_bucket(Order.created_at, db.get_bind().dialect.name)
+    
+    query = db.query(
+        bucket.label('bucket'),
+        func.sum(Order.total_amount).label('revenue'),
+        func.count(Order.id).label('orders_count')
+    ).filter(
+        Order.created_at >= range_start,
+        Order.created_at < range_end,
+        Order.status.in_([OrderStatusEnum.SERVED, OrderStatusEnum.PAID])
+    )
+    if outlet_id:
+        query = query.filter(Order.outlet_id == outlet_id)
+    hourly_rows = query.group_by(bucket).all()
+    
+    # NumPy is imported on first use to keep it off the startup path
+    import numpy as np
+    
+    # Scatter the sparse (hour bucket, revenue, count) rows into a dense days x 24 matrix
+    day_count = (date_range.end_date - date_range.start_date).days + 1
+    revenue_matrix = np.zeros((day_count, 24), dtype=np.float64)
+    orders_matrix = np.zeros((day_count, 24), dtype=np.int64)
+    if hourly_rows:
+        hours = np.array([row.bucket for row in hourly_rows], dtype='datetime64[h]')
+        days = hours.astype('datetime64[D]')
+        day_index = (days - np.datetime64(date_range.start_date, 'D')).astype(np.int64)
+        hour_index = (hours - days).astype(np.int64)
+        revenue_matrix[day_index, hour_index] = np.array([float(row.revenue or 0) for row in hourly_rows])
+        orders_matrix[day_index, hour_index] = np.array([row.orders_count for row in hourly_rows])
+    
+    revenue_by_hour = revenue_matrix.sum(axis=0)
+    orders_by_hour = orders_matrix.sum(axis=0)
+    hourly_data = [
+        HourlyRevenue(hour=hour, revenue=round(float(revenue_by_hour[hour]), 2), orders_count=int(orders_by_hour[hour]))
+        for hour in range(24)
+    ]
+    
+    return HourlyRevenueResponse(
+        hourly_data=hourly_data,
+        date=date_range.end_date,
+        start_date=date_range.start_date,
+        end_date=date_range.end_date,
+        outlet_id=str(outlet_id) if outlet_id else None,
+        days=[date_range.start_date + timedelta(days=offset) for offset in range(day_count)],
+        revenue_matrix=np.round(revenue_matrix, 2).tolist(),
+        orders_matrix=orders_matrix.tolist()
+    )
+
+@router.get("/payment-methods", response_model=PaymentMethodResponse)
+@coalesce(analytics_flight, open_analytics_session)
+async def get_payment_methods(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
+):
+    """
+    Get completed payment totals and transaction counts per payment method.
+    Defaults to today when no date range is given.
+    """
+    date_range = resolve_date_range(start_date, end_date)
+    range_start, range_end = range_bounds(date_range.start_date, date_range.end_date)
+    
+    method_rows = db.query(
+        Payment.payment_method,
+        func.sum(Payment.amount).label('amount'),
+        func.count(Payment.id).label('transaction_count')
+    ).filter(
+        Payment.created_at >= range_start,
+        Payment.created_at < range_end,
+        Payment.status == PaymentStatusEnumPayment.COMPLETED
+    ).group_by(Payment.payment_method).all()
+    
+    total_amount = sum(float(row.amount or 0) for row in method_rows)
+    breakdown = [
+        PaymentMethodBreakdown(
+            payment_method=row.payment_method.value,
+            amount=float(row.amount or 0),
+            percentage=round(float(row.amount or 0) / total_amount * 100, 2) if total_amount > 0 else 0,
+            transaction_count=int(row.transaction_count)
+        )
+        for row in sorted(method_rows, key=lambda row: row.amount or 0, reverse=True)
+    ]
+    
+    return PaymentMethodResponse(
+        breakdown=breakdown,
+        total_amount=total_amount,
+        date=date_range.end_date,
+        start_date=date_range.start_date,
+        end_date=date_range.end_date
+    )
+
+@router.get("/room-type-performance", response_model=RoomTypePerformanceResponse)
+@coalesce(analytics_flight, open_analytics_session)
+async def get_room_type_performance(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
+):
+    """
+    Get occupancy, ADR, RevPAR and room revenue per room type over a date range.
+    Stays are counted for the nights that fall inside the range; revenue is the
+    completed room charges posted within the range. Defaults to today.
+    """
+    date_range = resolve_date_range(start_date, end_date)
+    range_start, range_end = range_bounds(date_range.start_date, date_range.end_date)
+    range_last_night = date_range.end_date + timedelta(days=1)
+    
+    # Room inventory per type, including types without any bookings
+    room_types = db.query(
+        RoomType.id,
+        RoomType.name,
+        func.count(Room.id).label('room_count')
+    ).outerjoin(
+        Room, Room.room_type_id == RoomType.id
+    ).group_by(RoomType.id, RoomType.name).order_by(RoomType.name).all()
+    type_index = {room_type.id: index for index, room_type in enumerate(room_types)}
+    
+    # One row per stay overlapping the range, with its room charges in the range
+    stays = db.query(
+        Room.room_type_id,
+        Reservation.checkin_date,
+        Reservation.checkout_date,
+        func.coalesce(func.sum(Payment.amount), 0).label('revenue')
+    ).join(
+        Room, Reservation.room_id == Room.id
+    ).outerjoin(
+        Payment, and_(
+            Payment.reservation_id == Reservation.id,
+            Payment.payment_type == PaymentTypeEnum.ROOM_CHARGE,
+            Payment.status == PaymentStatusEnumPayment.COMPLETED,
+            Payment.created_at >= range_start,
+            Payment.created_at < range_end
+        )
+    ).filter(
+        Reservation.status.in_([ReservationStatusEnum.CHECKED_IN, ReservationStatusEnum.CHECKED_OUT]),
+        Reservation.checkin_date < range_last_night,
+        Reservation.checkout_date > date_range.start_date
+    ).group_by(
+        Reservation.id, Room.room_type_id, Reservation.checkin_date, Reservation.checkout_date
+    ).all()
+    
+    import numpy as np
+    
+    type_count = len(room_types)
+    nights_sold = np.zeros(type_count, dtype=np.int64)
+    bookings = np.zeros(type_count, dtype=np.int64)
+    revenue = np.zeros(type_count, dtype=np.float64)
+    if stays:
+        stay_types = np.array([type_index[stay.room_type_id] for stay in stays], dtype=np.int64)
+        checkins = np.array([stay.checkin_date for stay in stays], dtype='datetime64[D]')
+        checkouts = np.array([stay.checkout_date for stay in stays], dtype='datetime64[D]')
+        # Clip each stay to the range and count the nights left
+        first_nights = np.maximum(checkins, np.datetime64(date_range.start_date, 'D'))
+        last_nights = np.minimum(checkouts, np.datetime64(range_last_night, 'D'))
+        stay_nights = np.clip((last_nights - first_nights).astype(np.int64), 0, None)
+        nights_sold = np.bincount(stay_types, weights=stay_nights, minlength=type_count).astype(np.int64)
+        bookings = np.bincount(stay_types, minlength=type_count)
+        revenue = np.bincount(
+            stay_types, weights=np.array([float(stay.revenue) for stay in stays]), minlength=type_count
+        )
+    
+    day_count = (date_range.end_date - date_range.start_date).days + 1
+    available_nights = np.array([room_type.room_count for room_type in room_types], dtype=np.int64) * day_count
+    with np.errstate(divide='ignore', invalid='ignore'):
+        occupancy = np.where(available_nights > 0, nights_sold / available_nights * 100, 0.0)
+        adr = np.where(nights_sold > 0, revenue / nights_sold, 0.0)
+        revpar = np.where(available_nights > 0, revenue / available_nights, 0.0)
+    
+    performance = [
+        RoomTypePerformance(
+            room_type_id=str(room_type.id),
+            room_type_name=room_type.name,
+            total_bookings=int(bookings[index]),
+            total_revenue=round(float(revenue[index]), 2),
+            occupancy_rate=round(float(occupancy[index]), 2),
+            average_rate=round(float(adr[index]), 2),
+            revpar=round(float(revpar[index]), 2),
+            room_nights_sold=int(nights_sold[index]),
+            available_room_nights=int(available_nights[index])
+        )
+        for index, room_type in enumerate(room_types)
+    ]
+    
+    return RoomTypePerformanceResponse(
+        room_types=performance,
+        date=date_range.end_date,
+        start_date=date_range.start_date,
+        end_date=date_range.end_date
+    )
+
+# Menu engineering classes by the code computed with NumPy
+MENU_CLASSES = [MenuClassEnum.STAR, MenuClassEnum.PLOWHORSE, MenuClassEnum.PUZZLE, MenuClassEnum.DOG]
+
+@router.get("/menu-engineering", response_model=MenuEngineeringResponse)
+@coalesce(analytics_flight, open_analytics_session)
+async def get_menu_engineering(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    outlet_id: Optional[UUID] = None,
+    category_id: Optional[UUID] = None,
+    db: Session = Depends(get_analytics_db),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
+):
+    """
+    Classify menu items as stars, plowhorses, puzzles and dogs within their
+    outlet and category. Quantity and revenue per item come from one grouped
+    query over the served and paid orders in the range that were not refunded;
+    food cost uses the item's current cost. Available items without sales are
+    included. Defaults to today.
+    """
+    date_range = resolve_date_range(start_date, end_date)
+    range_start, range_end = range_bounds(date_range.start_date, date_range.end_date)
+    
+    sales = db.query(
+        OrderLine.item_id.label('item_id'),
+        func.sum(OrderLine.quantity).label('quantity_sold'),
+        func.sum(OrderLine.line_total).label('revenue')
+    ).join(
+        Order, OrderLine.order_id == Order.id
+    ).filter(
+        Order.created_at >= range_start,
+        Order.created_at < range_end,
+        # Lines are never older than their order; lets PostgreSQL skip older order line partitions
+        OrderLine.created_at >= range_start,
+        Order.status.in_([OrderStatusEnum.SERVED, OrderStatusEnum.PAID]),
+        Order.payment_status != PaymentStatusEnum.REFUNDED
+    ).group_by(OrderLine.item_id).subquery()
+    
+    query = db.query(
+        Item.id,
+        Item.name,
+        Item.outlet_id,
+        Outlet.name.label('outlet_name'),
+        Item.category_id,
+        ItemCategory.name.label('category_name'),
+        Item.cost,
+        func.coalesce(sales.c.quantity_sold, 0).label('quantity_sold'),
+        func.coalesce(sales.c.revenue, 0).label('revenue')
+    ).join(
+        Outlet, Item.outlet_id == Outlet.id
+    ).outerjoin(
+        ItemCategory, Item.category_id == ItemCategory.id
+    ).outerjoin(
+        sales, sales.c.item_id == Item.id
+    ).filter(
+        or_(Item.is_available == True, sales.c.quantity_sold.isnot(None))
+    )
+    if outlet_id:
+        query = query.filter(Item.outlet_id == outlet_id)
+    if category_id:
+        query = query.filter(Item.category_id == category_id)
+    rows = query.order_by(Outlet.name, ItemCategory.name, Item.name).all()
+    
+    import numpy as np
+    
+    group_index = {}
+    groups = np.array(
+        [group_index.setdefault((row.outlet_id, row.category_id), len(group_index)) for row in rows], dtype=np.int64
+    )
+    group_count = len(group_index)
+    quantity = np.array([int(row.quantity_sold) for row in rows], dtype=np.int64)
+    revenue = np.array([float(row.revenue) for row in rows], dtype=np.float64)
+    food_cost = quantity * np.array([float(row.cost or 0) for row in rows], dtype=np.float64)
+    margin = revenue - food_cost
+    
+    group_items = np.bincount(groups, minlength=group_count)
+    group_quantity = np.bincount(groups, weights=quantity, minlength=group_count)
+    group_margin = np.bincount(groups, weights=margin, minlength=group_count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        menu_mix = np.where(group_quantity[groups] > 0, quantity / group_quantity[groups] * 100, 0.0)
+        unit_margin = np.where(quantity > 0, margin / quantity, 0.0)
+        average_margin = np.where(group_quantity > 0, group_margin / group_quantity, 0.0)
+        # An item is popular above 70% of an equal share of its group's sales
+        popularity_threshold = np.where(group_items > 0, 70.0 / group_items, 0.0)
+    
+    popular = (quantity > 0) & (menu_mix >= popularity_threshold[groups])
+    profitable = (quantity > 0) & (unit_margin >= average_margin[groups])
+    classes = np.select([popular & profitable, popular, profitable], [0, 1, 2], default=3)
+    
+    items = [
+        MenuEngineeringItem(
+            item_id=str(row.id),
+            item_name=row.name,
+            outlet_id=str(row.outlet_id),
+            outlet_name=row.outlet_name,
+            category_id=str(row.category_id) if row.category_id else None,
+            category_name=row.category_name,
+            quantity_sold=int(quantity[index]),
+            revenue=round(float(revenue[index]), 2),
+            food_cost=round(float(food_cost[index]), 2),
+            contribution_margin=round(float(unit_margin[index]), 2),
+            total_contribution_margin=round(float(margin[index]), 2),
+            menu_mix=round(float(menu_mix[index]), 2),
+            classification=MENU_CLASSES[classes[index]]
+        )
+        for index, row in enumerate(rows)
+    ]
+    group_summaries = [
+        MenuEngineeringGroup(
+            outlet_id=str(group_outlet_id),
+            category_id=str(group_category_id) if group_category_id else None,
+            item_count=int(group_items[index]),
+            quantity_sold=int(group_quantity[index]),
+            popularity_threshold=round(float(popularity_threshold[index]), 2),
+            average_contribution_margin=round(float(average_margin[index]), 2)
+        )
+        for (group_outlet_id, group_category_id), index in group_index.items()
+    ]
+    
+    return MenuEngineeringResponse(
+        items=items,
+        groups=group_summaries,
+        date=date_range.end_date,
+        start_date=date_range.start_date,
+        end_date=date_range.end_date
+    )
+
+# Endpoints the analytics snapshot can precompute, by name
+SNAPSHOT_ENDPOINTS = {
+    "revenue-today": get_revenue_today,
+    "occupancy-rate": get_occupancy_rate,
+    "top-items-sold": get_top_items_sold,
+    "guest-spending": get_guest_spending,
+    "revenue-split": get_revenue_split,
+    "arpr": get_average_revenue_per_room,
+    "outlet-performance": get_outlet_performance,
+}
+
+async def compute_analytics_snapshot(db: Session, names: List[str]) -> dict:
+    """
+    Compute analytics responses by endpoint name with one session. The
+    dashboard KPIs reuse the responses computed for the other endpoints.
+    """
+    as_of = datetime.now(timezone.utc)
+    results = {}
+
+    async def compute(name: str):
+        if name not in results:
+            if name == "dashboard-kpis":
+                result = DashboardKPIs(
+                    revenue_today=await compute("revenue-today"),
+                    occupancy_rate=await compute("occupancy-rate"),
+                    top_items=await compute("top-items-sold"),
+                    guest_spending=await compute("guest-spending"),
+                    revenue_split=await compute("revenue-split"),
+                    arpr=await compute("arpr")
+                )
+            else:
+                # The undecorated endpoint: the session is given, so there is nothing to serve or coalesce
+                result = await inspect.unwrap(SNAPSHOT_ENDPOINTS[name])(db=db, current_user=None)
+            result.as_of = as_of
+            results[name] = result
+        return results[name]
+
+    for name in names:
+        await compute(name)
+    return {name: results[name] for name in names}
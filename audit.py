@@ -0,0 +1,310 @@
+"""
+Hotel Management System - Audit Logging
+Captures ORM change diffs and writes them to audit_logs in background batches.
+"""
+
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+from .config import settings
+from .database import engine, SessionLocal
+import enum
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Tables whose changes are recorded in audit_logs
+AUDITED_TABLES = {
+    "users", "room_types", "rooms", "guests", "reservations",
+    "outlets", "item_categories", "items", "orders", "order_lines", "payments",
+}
+
+# Columns that carry no audit value or must never be copied into the log
+IGNORED_COLUMNS = {"updated_at", "password_hash"}
+
+_PENDING_KEY = "audit_pending"
+USER_KEY = "audit_user_id"
+
+def _to_json(value):
+    """Convert a column value to a JSON-serializable value."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    return str(value)
+
+def _column_values(obj) -> dict:
+    """Get the column values of an object, skipping unset columns of pending objects."""
+    state = inspect(obj)
+    values = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in IGNORED_COLUMNS or (state.pending and attr.key in state.unloaded):
+            continue
+        values[attr.key] = _to_json(getattr(obj, attr.key))
+    return values
+
+def _column_diff(obj):
+    """Get (old_values, new_values) containing only the changed columns."""
+    state = inspect(obj)
+    old_values, new_values = {}, {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in IGNORED_COLUMNS:
+            continue
+        history = state.attrs[attr.key].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old == new:
+            continue
+        old_values[attr.key] = _to_json(old)
+        new_values[attr.key] = _to_json(new)
+    return old_values, new_values
+
+def _audit_row(obj, action: str, old_values, new_values, changed_by) -> dict:
+    """Build an audit_logs row for an object change."""
+    return {
+        "id": uuid.uuid4(),
+        "table_name": obj.__tablename__,
+        "record_id": obj.id,
+        "action": action,
+        "old_values": old_values or None,
+        "new_values": new_values or None,
+        "changed_by": changed_by,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+def _is_audited(obj) -> bool:
+    return getattr(obj, "__tablename__", None) in AUDITED_TABLES
+
+def _before_flush(session: Session, flush_context, instances):
+    """Collect diffs of audited objects before they are flushed."""
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    changed_by = session.info.get(USER_KEY)
+
+    for obj in session.new:
+        if not _is_audited(obj):
+            continue
+        # Assign the primary key up front so the audit row can reference it
+        if obj.id is None:
+            obj.id = uuid.uuid4()
+        pending.append(_audit_row(obj, "INSERT", None, _column_values(obj), changed_by))
+
+    for obj in session.dirty:
+        if not _is_audited(obj) or not session.is_modified(obj, include_collections=False):
+            continue
+        old_values, new_values = _column_diff(obj)
+        if new_values:
+            pending.append(_audit_row(obj, "UPDATE", old_values, new_values, changed_by))
+
+    for obj in session.deleted:
+        if not _is_audited(obj):
+            continue
+        pending.append(_audit_row(obj, "DELETE", _column_values(obj), None, changed_by))
+
+def _bulk_rows(table_name: str, action: str, changes: List[tuple], changed_by) -> List[dict]:
+    """Build audit_logs rows from (record_id, old_values, new_values) tuples."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "table_name": table_name,
+            "record_id": record_id,
+            "action": action,
+            "old_values": _to_json(old_values) or None,
+            "new_values": _to_json(new_values) or None,
+            "changed_by": changed_by,
+            "created_at": now,
+        }
+        for record_id, old_values, new_values in changes
+    ]
+
+def record_bulk_update(session: Session, table_name: str, changes: List[tuple]):
+    """
+    Queue audit rows for a set-based UPDATE, which bypasses the flush hooks.
+    `changes` holds (record_id, old_values, new_values) tuples.
+    """
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    pending.extend(_bulk_rows(table_name, "UPDATE", changes, session.info.get(USER_KEY)))
+
+def write_bulk_audit(connection, table_name: str, action: str, changes: List[tuple], changed_by=None):
+    """
+    Insert audit rows for a set-based statement run outside the ORM, in the
+    same transaction, so the log commits or rolls back with the change.
+    `changes` holds (record_id, old_values, new_values) tuples.
+    """
+    if not settings.audit_enabled or not changes:
+        return
+    from ..models.payment import AuditLog
+    connection.execute(insert(AuditLog.__table__), _bulk_rows(table_name, action, changes, changed_by))
+
+def _after_commit(session: Session):
+    """Hand collected audit rows to the background writer once committed."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        audit_writer.submit(pending)
+
+def _after_soft_rollback(session: Session, previous_transaction):
+    """Discard audit rows of rolled back changes."""
+    session.info.pop(_PENDING_KEY, None)
+
+def install_audit_hooks(session_factory=SessionLocal):
+    """Register the audit listeners on a session factory."""
+    if event.contains(session_factory, "before_flush", _before_flush):
+        return
+    event.listen(session_factory, "before_flush", _before_flush)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+
+class AuditWriter:
+    """
+    Background writer that flushes audit rows in multi-row inserts.
+    Rows are batched by size or interval. When the queue is full producers wait
+    briefly and then spill to disk; failed batches are spilled too and replayed
+    once the database is reachable again.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        put_timeout: float = 0.05,
+        spill_path: Optional[str] = None
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.spill_path = spill_path
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._spill_lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background writer thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit writer started")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer, flushing everything still queued."""
+        if not self.is_running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Audit writer stopped")
+
+    def submit(self, rows: List[dict]):
+        """Queue audit rows; spill them to disk if the queue stays full."""
+        for index, row in enumerate(rows):
+            try:
+                self._queue.put(row, timeout=self.put_timeout)
+            except queue.Full:
+                logger.warning("Audit queue full, spilling audit rows to disk")
+                self._spill(rows[index:])
+                return
+
+    def _run(self):
+        self._replay_spill()
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _next_batch(self) -> List[dict]:
+        """Collect up to batch_size rows or whatever arrived within flush_interval."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[dict]):
+        from ..models.payment import AuditLog
+        try:
+            with engine.begin() as connection:
+                connection.execute(insert(AuditLog.__table__).values(batch))
+        except Exception as e:
+            logger.error(f"Audit batch of {len(batch)} rows failed, spilling to disk: {e}")
+            self._spill(batch)
+            return
+        self._replay_spill()
+
+    def _spill(self, rows: List[dict]):
+        """Append rows to the spill file as JSON lines."""
+        if not self.spill_path:
+            logger.error(f"No audit spill file configured, dropping {len(rows)} audit rows")
+            return
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as spill_file:
+                for row in rows:
+                    spill_file.write(json.dumps(_to_json(row)) + "\n")
+                spill_file.flush()
+                os.fsync(spill_file.fileno())
+
+    def _replay_spill(self):
+        """Insert spilled rows once the database accepts writes again."""
+        from ..models.payment import AuditLog
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        with self._spill_lock:
+            with open(self.spill_path, encoding="utf-8") as spill_file:
+                rows = [json.loads(line) for line in spill_file if line.strip()]
+            if not rows:
+                os.remove(self.spill_path)
+                return
+            for row in rows:
+                row["id"] = uuid.UUID(row["id"])
+                row["record_id"] = uuid.UUID(row["record_id"])
+                row["changed_by"] = uuid.UUID(row["changed_by"]) if row["changed_by"] else None
+                row["created_at"] = datetime.fromisoformat(row["created_at"])
+            try:
+                with engine.begin() as connection:
+                    for start in range(0, len(rows), self.batch_size):
+                        connection.execute(
+                            insert(AuditLog.__table__).values(rows[start:start + self.batch_size])
+                        )
+            except Exception as e:
+                logger.warning(f"Audit spill replay deferred, database unavailable: {e}")
+                return
+            os.remove(self.spill_path)
+            logger.info(f"Replayed {len(rows)} spilled audit rows")
+
+# Global audit writer instance
+audit_writer = AuditWriter(
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval,
+    max_queue_size=settings.audit_queue_size,
+    spill_path=settings.audit_spill_path
+)
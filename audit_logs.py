@@ -0,0 +1,46 @@
+"""
+Hotel Management System - Audit Log Router
+Handles audit trail listings for administrators.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from ..core.database import get_db
+from ..core.fieldsets import parse_fields, load_options, fieldset_page
+from ..core.pagination import paginate
+from ..core.security import require_admin
+from ..models.payment import AuditLog, ActionEnum
+from ..models.user import User
+from ..schemas.payment import AuditLogResponse
+from ..schemas.pagination import CursorPage
+
+router = APIRouter(prefix="/audit-logs", tags=["Audit Logs"])
+
+@router.get("", response_model=CursorPage[AuditLogResponse])
+async def list_audit_logs(
+    table_name: Optional[str] = None,
+    record_id: Optional[UUID] = None,
+    action: Optional[ActionEnum] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    List audit log entries, newest first, one page at a time.
+    `fields` limits the response to the listed fields, e.g. `table_name,record_id,action`.
+    """
+    fieldset = parse_fields(fields, AuditLogResponse)
+    statement = select(AuditLog).options(*load_options(AuditLog, AuditLogResponse, fieldset))
+    if table_name:
+        statement = statement.where(AuditLog.table_name == table_name)
+    if record_id:
+        statement = statement.where(AuditLog.record_id == record_id)
+    if action:
+        statement = statement.where(AuditLog.action == action)
+    entries, next_cursor = paginate(db, statement, AuditLog, cursor, limit)
+    return fieldset_page(AuditLogResponse, fieldset, entries, next_cursor, limit)
@@ -45,3 +45,19 @@ class TimestampMixin:
         nullable=False
     )
 
+
+class PartitionedModel(BaseModel):
+    """
+    Base model for append-only tables range-partitioned by month on created_at.
+    Postgres requires the partition key in every unique constraint, so created_at
+    is part of the primary key. Partitions are managed by core.partitions.
+    """
+    __abstract__ = True
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+    
+    created_at = Column(
+        DateTime(timezone=True), 
+        server_default=func.now(),
+        primary_key=True,
+        nullable=False
+    )
@@ -3,30 +3,127 @@ Hotel Management System - Database Configuration
 Handles SQLAlchemy database connection, session management, and base model.
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from .config import SQLALCHEMY_DATABASE_URL
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+from .config import settings, SQLALCHEMY_DATABASE_URL, SQLALCHEMY_ANALYTICS_DATABASE_URL
 import logging
+import os
+import threading
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _create_engine(database_url: str):
+    """
+    Create a SQLAlchemy engine for a database URL.
+    Every session and background thread checks out its own connection, so a
+    pool return (which rolls back) never ends another session's transaction.
+    """
+    if "sqlite" not in database_url:
+        return create_engine(
+            database_url,
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=True,
+            echo=False  # Set to True for SQL query logging
+        )
+    
+    # An in-memory SQLite database only exists on its one connection; a file
+    # database opens a connection per checkout, which SQLite makes cheap
+    in_memory = make_url(database_url).database in (None, "", ":memory:")
+    return create_engine(
+        database_url,
+        poolclass=StaticPool if in_memory else NullPool,
+        connect_args={"check_same_thread": False},
+        echo=False  # Set to True for SQL query logging
+    )
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    poolclass=StaticPool,
-    connect_args={
-        "check_same_thread": False,  # Only needed for SQLite
-    } if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
-    echo=False  # Set to True for SQL query logging
-)
+engine = _create_engine(SQLALCHEMY_DATABASE_URL)
+
+# Optional read replica engine for analytics and reporting
+analytics_engine = _create_engine(SQLALCHEMY_ANALYTICS_DATABASE_URL) if SQLALCHEMY_ANALYTICS_DATABASE_URL else None
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+class RoutingSession(Session):
+    """
+    Session that sends reads to the analytics replica and everything else to the primary.
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary.
+    """
+    
+    def __init__(self, *args, use_replica: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_replica = use_replica
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.use_replica
+            and analytics_engine is not None
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            return analytics_engine
+        return engine
+
+# Create AnalyticsSessionLocal class
+AnalyticsSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+class ReplicaMonitor:
+    """Caches the replica lag check so it runs at most once per interval."""
+    
+    def __init__(self, max_lag_seconds: float, check_interval: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = False
+        self.last_lag_seconds = None
+    
+    def replica_lag_seconds(self) -> float:
+        """Measure replication lag on the replica; 0 for a database that is not a standby."""
+        with analytics_engine.connect() as connection:
+            if analytics_engine.dialect.name != "postgresql":
+                return 0.0
+            lag = connection.execute(text("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+            """)).scalar()
+            return float(lag or 0)
+    
+    def is_healthy(self) -> bool:
+        """Check whether the replica is reachable and within the lag bound."""
+        if analytics_engine is None:
+            return False
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return self._healthy
+            try:
+                self.last_lag_seconds = self.replica_lag_seconds()
+                self._healthy = self.last_lag_seconds <= self.max_lag_seconds
+                if not self._healthy:
+                    logger.warning(f"Replica lag {self.last_lag_seconds:.1f}s exceeds bound, reading from primary")
+            except Exception as e:
+                logger.error(f"Replica lag check failed, reading from primary: {e}")
+                self.last_lag_seconds = None
+                self._healthy = False
+            self._checked_at = time.monotonic()
+            return self._healthy
+
+replica_monitor = ReplicaMonitor(settings.replica_max_lag_seconds, settings.replica_lag_check_interval)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -48,15 +145,65 @@ def get_db():
     finally:
         db.close()
 
+def open_analytics_session() -> Session:
+    """
+    Open a read-routing database session.
+    Reads go to the analytics replica when one is configured and within the
+    lag bound; otherwise the session falls back to the primary.
+    """
+    return AnalyticsSessionLocal(use_replica=replica_monitor.is_healthy())
+
+def get_analytics_db():
+    """Dependency function to get a read-routing database session."""
+    db = open_analytics_session()
+    try:
+        yield db
+    except Exception as e:
+        logger.error(f"Database session error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
 def create_tables():
-    """Create all database tables."""
+    """Create all database tables, and indexes added to existing tables since."""
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all only creates indexes together with new tables
+        with engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
 
+def verify_schema_revision(config_path: str = settings.alembic_config):
+    """
+    Check that the database is migrated to the Alembic head revision.
+    A single read of alembic_version instead of inspecting every table.
+    """
+    # Alembic is only needed in this check, so it is not imported with the module
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    
+    if not os.path.exists(config_path):
+        raise RuntimeError(
+            f"SCHEMA_MODE=verify needs an Alembic environment, but {config_path} does not exist; "
+            f"use SCHEMA_MODE=create"
+        )
+    heads = set(ScriptDirectory.from_config(Config(config_path)).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    if current != heads:
+        raise RuntimeError(
+            f"Database schema is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"expected {', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
+    logger.info(f"Database schema at revision {', '.join(sorted(heads))}")
+
 def drop_tables():
     """Drop all database tables (use with caution)."""
     try:
@@ -71,7 +218,7 @@ def test_connection():
     """Test database connection."""
     try:
         with engine.connect() as connection:
-            result = connection.execute("SELECT 1")
+            result = connection.execute(text("SELECT 1"))
             logger.info("Database connection successful")
             return True
     except Exception as e:
@@ -0,0 +1,110 @@
+"""
+Hotel Management System - Live Events
+In-process fan-out of committed changes to Server-Sent Event streams.
+"""
+
+from typing import Optional, Set, Union
+from .config import settings
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Queue markers
+RESYNC = object()
+CLOSED = object()
+
+def format_sse(event: str, data, event_id: Optional[Union[int, str]] = None) -> str:
+    """Format one Server-Sent Event message."""
+    message = ""
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    message += f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+    return message
+
+def format_heartbeat() -> str:
+    """SSE comment line that keeps idle connections and proxies alive."""
+    return ": keep-alive\n\n"
+
+class Subscriber:
+    """
+    One connected client with a bounded queue.
+    A client that falls behind has its backlog dropped and is told to resync,
+    so a slow screen never holds up the others.
+    """
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.resyncs = 0
+
+    def offer(self, item):
+        """Queue an item without blocking; on overflow replace the backlog with a resync marker."""
+        if item is CLOSED:
+            self._drain()
+            self.queue.put_nowait(CLOSED)
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._drain()
+            self.queue.put_nowait(RESYNC)
+            self.resyncs += 1
+
+    def _drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def next(self, timeout: float):
+        """Wait for the next item; None when the heartbeat interval elapses first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class Broadcaster:
+    """
+    Fans published items out to subscribers on the event loop.
+    publish() is thread-safe, so it can be called from commit hooks running in
+    the threadpool as well as from the loop itself.
+    """
+
+    def __init__(self, name: str, queue_size: Optional[int] = None):
+        self.name = name
+        self.queue_size = queue_size or settings.event_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[Subscriber] = set()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach to the application event loop."""
+        self._loop = loop
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Register a new client (call from the event loop)."""
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Remove a client (call from the event loop)."""
+        self._subscribers.discard(subscriber)
+        if subscriber.resyncs:
+            logger.info(f"{self.name} client disconnected after {subscriber.resyncs} resyncs")
+
+    def publish(self, item):
+        """Hand an item to every subscriber; a no-op until bound to a loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._fan_out, item)
+
+    def close(self):
+        """Tell every connected client to end its stream."""
+        self.publish(CLOSED)
+
+    def _fan_out(self, item):
+        for subscriber in list(self._subscribers):
+            subscriber.offer(item)
@@ -0,0 +1,192 @@
+"""
+Hotel Management System - Exports Router
+Streams payments, orders and reservations as CSV or NDJSON for reconciliation.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from ..core.database import open_analytics_session
+from ..core.pagination import encode_cursor, after_cursor
+from ..core.security import require_admin
+from ..models import *
+import csv
+import enum
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+# Rows fetched from the server-side cursor per chunk
+EXPORT_CHUNK_SIZE = 2000
+
+class ExportFormatEnum(str, enum.Enum):
+    """Export file format enumeration."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+MEDIA_TYPES = {
+    ExportFormatEnum.CSV: "text/csv",
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+}
+
+def _serialize(value):
+    """Convert a column value to a plain CSV/JSON value."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+def _parse_status(status_enum, value: Optional[str]):
+    """Parse a status filter into the model's status enum."""
+    if value is None:
+        return None
+    try:
+        return status_enum(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status '{value}'. Expected one of: {', '.join(e.value for e in status_enum)}"
+        )
+
+def _stream_rows(model, filters: list, export_format: ExportFormatEnum, chunk_size: int):
+    """
+    Yield the export body chunk by chunk from a server-side cursor.
+    Only one chunk of rows is held in memory at a time. Every row carries a
+    cursor token; pass the last one received as `after` to resume a download.
+    """
+    columns = list(model.__table__.columns)
+    column_names = [column.name for column in columns]
+    statement = select(*columns).where(*filters).order_by(
+        model.created_at, model.id
+    ).execution_options(yield_per=chunk_size)
+
+    # The session is owned by the generator so it stays open while the response streams
+    db = open_analytics_session()
+    try:
+        if export_format == ExportFormatEnum.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(column_names + ["cursor"])
+            yield buffer.getvalue()
+
+        for rows in db.execute(statement).partitions():
+            buffer = io.StringIO()
+            if export_format == ExportFormatEnum.CSV:
+                writer = csv.writer(buffer)
+                for row in rows:
+                    writer.writerow(
+                        [_serialize(value) for value in row]
+                        + [encode_cursor(row.created_at, row.id)]
+                    )
+            else:
+                for row in rows:
+                    record = {name: _serialize(value) for name, value in zip(column_names, row)}
+                    record["cursor"] = encode_cursor(row.created_at, row.id)
+                    buffer.write(json.dumps(record) + "\n")
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+def _export_response(model, filters: list, export_format: ExportFormatEnum, filename: str):
+    """Build a streaming attachment response for an export."""
+    extension = "csv" if export_format == ExportFormatEnum.CSV else "ndjson"
+    return StreamingResponse(
+        _stream_rows(model, filters, export_format, EXPORT_CHUNK_SIZE),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+def _common_filters(model, start_date: Optional[date], end_date: Optional[date], after: Optional[str]) -> list:
+    """Build the created_at range and resume cursor filters shared by all exports."""
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date"
+        )
+    filters = []
+    if start_date:
+        filters.append(model.created_at >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        filters.append(model.created_at < datetime.combine(end_date, datetime.min.time()) + timedelta(days=1))
+    if after:
+        filters.append(after_cursor(model.created_at, model.id, after))
+    return filters
+
+@router.get("/payments")
+async def export_payments(
+    format: ExportFormatEnum = ExportFormatEnum.CSV,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    outlet_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Stream payments as CSV or NDJSON, ordered by (created_at, id).
+    """
+    filters = _common_filters(Payment, start_date, end_date, after)
+    payment_status = _parse_status(PaymentStatusEnumPayment, status)
+    if payment_status:
+        filters.append(Payment.status == payment_status)
+    if outlet_id:
+        filters.append(Payment.order_id.in_(select(Order.id).where(Order.outlet_id == outlet_id)))
+
+    logger.info(f"Payments export started by {current_user.username}")
+    return _export_response(Payment, filters, format, "payments")
+
+@router.get("/orders")
+async def export_orders(
+    format: ExportFormatEnum = ExportFormatEnum.CSV,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    outlet_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Stream F&B orders as CSV or NDJSON, ordered by (created_at, id).
+    """
+    filters = _common_filters(Order, start_date, end_date, after)
+    order_status = _parse_status(OrderStatusEnum, status)
+    if order_status:
+        filters.append(Order.status == order_status)
+    if outlet_id:
+        filters.append(Order.outlet_id == outlet_id)
+
+    logger.info(f"Orders export started by {current_user.username}")
+    return _export_response(Order, filters, format, "orders")
+
+@router.get("/reservations")
+async def export_reservations(
+    format: ExportFormatEnum = ExportFormatEnum.CSV,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Stream reservations as CSV or NDJSON, ordered by (created_at, id).
+    """
+    filters = _common_filters(Reservation, start_date, end_date, after)
+    reservation_status = _parse_status(ReservationStatusEnum, status)
+    if reservation_status:
+        filters.append(Reservation.status == reservation_status)
+
+    logger.info(f"Reservations export started by {current_user.username}")
+    return _export_response(Reservation, filters, format, "reservations")
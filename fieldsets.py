@@ -0,0 +1,154 @@
+"""
+Hotel Management System - Sparse Fieldsets
+Maps `fields=` query parameters to column-level loading and trimmed response models.
+"""
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type, Union, get_args, get_origin
+
+# A fieldset is a sorted tuple of (field name, nested fieldset or None), hashable for caching
+Fieldset = Tuple[Tuple[str, Optional[tuple]], ...]
+
+def _nested_schema(annotation) -> Optional[Type[BaseModel]]:
+    """Get the response model inside a field annotation (X, Optional[X] or List[X])."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for argument in get_args(annotation):
+        nested = _nested_schema(argument)
+        if nested is not None:
+            return nested
+    return None
+
+@lru_cache(maxsize=None)
+def full_fieldset(schema: Type[BaseModel]) -> Fieldset:
+    """Get the fieldset selecting every field of a response model, nested models included."""
+    fields = []
+    for name, field in schema.model_fields.items():
+        nested = _nested_schema(field.annotation)
+        fields.append((name, full_fieldset(nested) if nested else None))
+    return tuple(sorted(fields))
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Fieldset]:
+    """
+    Parse a comma-separated field list such as `id,status,guest.last_name,room`
+    against a response model. A nested model named on its own selects all its
+    fields. `id` is always included. Returns None when no fields were requested.
+    """
+    if not fields:
+        return None
+    tree = {"id": None}
+    for path in filter(None, (part.strip() for part in fields.split(","))):
+        node, current = tree, schema
+        names = path.split(".")
+        for depth, name in enumerate(names):
+            field = current.model_fields.get(name)
+            if field is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown field: {path}"
+                )
+            nested = _nested_schema(field.annotation)
+            last = depth == len(names) - 1
+            if nested is None:
+                if not last:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Unknown field: {path}"
+                    )
+                node[name] = None
+            elif last:
+                node[name] = full_fieldset(nested)
+            else:
+                child = node.get(name)
+                if not isinstance(child, dict):
+                    # A whole nested model already requested stays whole
+                    if child is not None:
+                        break
+                    child = node[name] = {"id": None} if "id" in nested.model_fields else {}
+                node, current = child, nested
+    return _freeze(tree)
+
+def _freeze(tree) -> Fieldset:
+    if not isinstance(tree, dict):
+        return tree
+    return tuple(sorted((name, _freeze(child)) for name, child in tree.items()))
+
+def _options(model, fieldset: Fieldset, trim: bool, required=()) -> List:
+    """Build loader options for a fieldset: load_only for columns, selectinload for relationships."""
+    mapper = inspect(model)
+    columns = set(required)
+    options = []
+    for name, child in fieldset:
+        if name in mapper.relationships:
+            relationship = mapper.relationships[name]
+            target = relationship.mapper.class_
+            # Keys the selectin loader matches parents and children on
+            columns.update(column.key for column in relationship.local_columns)
+            remote = [column.key for column in relationship.remote_side if column.table is target.__table__]
+            options.append(
+                selectinload(getattr(model, name)).options(*_options(target, child, trim, remote))
+            )
+        elif name in mapper.column_attrs:
+            columns.add(name)
+    if trim:
+        options.insert(0, load_only(*(getattr(model, name) for name in sorted(columns) if name in mapper.column_attrs)))
+    return options
+
+def load_options(model, schema: Type[BaseModel], fieldset: Optional[Fieldset]) -> List:
+    """
+    Loader options for a list query. With a fieldset, unrequested columns and
+    relationships are never fetched; without one, every nested relationship
+    of the response model is eager loaded.
+    """
+    if fieldset is None:
+        return _options(model, full_fieldset(schema), trim=False)
+    # created_at is needed for the pagination cursor even when not requested
+    return _options(model, fieldset, trim=True, required=("id", "created_at"))
+
+def _trimmed_annotation(annotation, nested: Type[BaseModel], trimmed: Type[BaseModel]):
+    """Swap the response model inside a field annotation for its trimmed version."""
+    if annotation is nested:
+        return trimmed
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        return List[_trimmed_annotation(get_args(annotation)[0], nested, trimmed)]
+    if origin is Union:
+        return Union[tuple(_trimmed_annotation(argument, nested, trimmed) for argument in get_args(annotation))]
+    return annotation
+
+@lru_cache(maxsize=256)
+def trimmed_model(schema: Type[BaseModel], fieldset: Fieldset) -> Type[BaseModel]:
+    """Create a response model with only the fields of a fieldset."""
+    fields = {}
+    for name, child in fieldset:
+        field = schema.model_fields[name]
+        annotation = field.annotation
+        nested = _nested_schema(annotation)
+        if nested is not None:
+            annotation = _trimmed_annotation(annotation, nested, trimmed_model(nested, child))
+        fields[name] = (annotation, ... if field.is_required() else field.default)
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **fields
+    )
+
+def fieldset_page(schema: Type[BaseModel], fieldset: Optional[Fieldset], items: list,
+                  next_cursor: Optional[str], limit: int):
+    """
+    Build a cursor page. Full pages are validated by the endpoint's response
+    model; sparse pages are serialized with the trimmed model and returned directly.
+    """
+    if fieldset is None:
+        return {"items": items, "next_cursor": next_cursor, "limit": limit}
+    model = trimmed_model(schema, fieldset)
+    return JSONResponse(content={
+        "items": [model.model_validate(item).model_dump(mode="json") for item in items],
+        "next_cursor": next_cursor,
+        "limit": limit
+    })
@@ -7,6 +7,7 @@ from pydantic import BaseModel, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 from ..models.fnb import OutletTypeEnum
 from ..models.order import OrderTypeEnum, OrderStatusEnum, PaymentMethodEnum, PaymentStatusEnum
 
@@ -34,7 +35,7 @@ class OutletUpdate(BaseModel):
 
 class OutletResponse(OutletBase):
     """Schema for outlet response."""
-    id: str
+    id: UUID
     created_at: datetime
     
     class Config:
@@ -57,8 +58,8 @@ class ItemCategoryUpdate(BaseModel):
 
 class ItemCategoryResponse(ItemCategoryBase):
     """Schema for item category response."""
-    id: str
-    outlet_id: Optional[str] = None
+    id: UUID
+    outlet_id: Optional[UUID] = None
     created_at: datetime
     
     class Config:
@@ -102,9 +103,9 @@ class ItemUpdate(BaseModel):
 
 class ItemResponse(ItemBase):
     """Schema for item response."""
-    id: str
-    category_id: Optional[str] = None
-    outlet_id: str
+    id: UUID
+    category_id: Optional[UUID] = None
+    outlet_id: UUID
     created_at: datetime
     updated_at: datetime
     
@@ -132,8 +133,8 @@ class OrderLineCreate(OrderLineBase):
 
 class OrderLineResponse(BaseModel):
     """Schema for order line response."""
-    id: str
-    item_id: str
+    id: UUID
+    item_id: UUID
     quantity: int
     unit_price: Decimal
     line_total: Decimal
@@ -177,11 +178,11 @@ class OrderPayment(BaseModel):
 
 class OrderResponse(OrderBase):
     """Schema for order response."""
-    id: str
+    id: UUID
     order_number: str
-    outlet_id: str
-    guest_id: Optional[str] = None
-    reservation_id: Optional[str] = None
+    outlet_id: UUID
+    guest_id: Optional[UUID] = None
+    reservation_id: Optional[UUID] = None
     status: OrderStatusEnum
     subtotal: Decimal
     tax_amount: Decimal
@@ -190,7 +191,7 @@ class OrderResponse(OrderBase):
     total_amount: Decimal
     payment_method: Optional[PaymentMethodEnum] = None
     payment_status: PaymentStatusEnum
-    created_by: Optional[str] = None
+    created_by: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
     
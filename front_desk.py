@@ -0,0 +1,134 @@
+"""
+Hotel Management System - Front Desk Service
+Set-based group check-in and check-out for tour groups and events.
+"""
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from ..core.audit import record_bulk_update
+from ..core.invalidation import mark_changed
+from ..models import Reservation, ReservationStatusEnum, Room, RoomStatusEnum
+from .room_board import queue_room_changes
+
+def _load_group(db: Session, reservation_ids: List[UUID]) -> Dict[UUID, dict]:
+    """Load and lock the eligibility columns of a group of reservations in one query."""
+    rows = db.execute(
+        select(
+            Reservation.id, Reservation.room_id, Reservation.status, Reservation.checkin_date,
+            Reservation.actual_checkin, Reservation.actual_checkout
+        ).where(Reservation.id.in_(reservation_ids)).with_for_update()
+    ).mappings().all()
+    return {row["id"]: row for row in rows}
+
+def _checkin_error(row: Optional[dict], today: date) -> Optional[str]:
+    """Get why a reservation cannot check in (mirrors Reservation.can_checkin)."""
+    if row is None:
+        return "Reservation not found"
+    if row["status"] != ReservationStatusEnum.CONFIRMED:
+        return f"Reservation is {row['status'].value}"
+    if row["checkin_date"] > today:
+        return f"Check-in date is {row['checkin_date'].isoformat()}"
+    if row["actual_checkin"] is not None:
+        return "Guest already checked in"
+    return None
+
+def _checkout_error(row: Optional[dict], today: date) -> Optional[str]:
+    """Get why a reservation cannot check out (mirrors Reservation.can_checkout)."""
+    if row is None:
+        return "Reservation not found"
+    if row["status"] != ReservationStatusEnum.CHECKED_IN:
+        return f"Reservation is {row['status'].value}"
+    if row["actual_checkout"] is not None:
+        return "Guest already checked out"
+    return None
+
+def _room_occupants(db: Session, group: Dict[UUID, dict]) -> Dict[UUID, UUID]:
+    """Get the checked-in reservation of each room of a group, by room id."""
+    room_ids = {row["room_id"] for row in group.values()}
+    return dict(db.execute(
+        select(Reservation.room_id, Reservation.id).where(
+            Reservation.room_id.in_(room_ids),
+            Reservation.status == ReservationStatusEnum.CHECKED_IN
+        )
+    ).all())
+
+def _apply(
+    db: Session,
+    reservation_ids: List[UUID],
+    validate,
+    reservation_values: dict,
+    room_status: RoomStatusEnum,
+    exclusive_rooms: bool = False
+) -> List[dict]:
+    """
+    Validate a group, then move every eligible reservation and its room with
+    one UPDATE each. Ineligible reservations are reported and left untouched.
+    With exclusive_rooms, a reservation whose room is already checked in, or
+    taken by an earlier reservation of the group, is ineligible.
+    """
+    unique_ids = list(dict.fromkeys(reservation_ids))
+    group = _load_group(db, unique_ids)
+    today = date.today()
+    occupants = _room_occupants(db, group) if exclusive_rooms and group else {}
+
+    results, eligible = [], []
+    for reservation_id in unique_ids:
+        error = validate(group.get(reservation_id), today)
+        if error is None and exclusive_rooms:
+            room_id = group[reservation_id]["room_id"]
+            occupant = occupants.setdefault(room_id, reservation_id)
+            if occupant != reservation_id:
+                error = f"Room is already checked in for reservation {occupant}"
+        results.append({"reservation_id": reservation_id, "success": error is None, "detail": error})
+        if error is None:
+            eligible.append(group[reservation_id])
+
+    if eligible:
+        eligible_ids = [row["id"] for row in eligible]
+        room_ids = list({row["room_id"] for row in eligible})
+        old_statuses = dict(db.execute(
+            select(Room.id, Room.status).where(Room.id.in_(room_ids))
+        ).all())
+
+        db.execute(
+            update(Reservation).where(Reservation.id.in_(eligible_ids)).values(**reservation_values),
+            execution_options={"synchronize_session": False}
+        )
+        db.execute(
+            update(Room).where(Room.id.in_(room_ids)).values(status=room_status),
+            execution_options={"synchronize_session": False}
+        )
+
+        record_bulk_update(db, Reservation.__tablename__, [
+            (row["id"], {key: row[key] for key in reservation_values}, reservation_values)
+            for row in eligible
+        ])
+        record_bulk_update(db, Room.__tablename__, [
+            (room_id, {"status": old_statuses.get(room_id)}, {"status": room_status})
+            for room_id in room_ids
+        ])
+        queue_room_changes(db, [{"id": str(room_id), "status": room_status.value} for room_id in room_ids])
+        mark_changed(db, [Reservation.__tablename__, Room.__tablename__])
+
+    db.commit()
+    return results
+
+def bulk_checkin(db: Session, reservation_ids: List[UUID], checkin_time: Optional[datetime] = None) -> List[dict]:
+    """Check in a group of reservations and mark their rooms occupied, one reservation per room."""
+    return _apply(
+        db, reservation_ids, _checkin_error,
+        {"status": ReservationStatusEnum.CHECKED_IN, "actual_checkin": checkin_time or datetime.now()},
+        RoomStatusEnum.OCCUPIED,
+        exclusive_rooms=True
+    )
+
+def bulk_checkout(db: Session, reservation_ids: List[UUID], checkout_time: Optional[datetime] = None) -> List[dict]:
+    """Check out a group of reservations and send their rooms to cleaning."""
+    return _apply(
+        db, reservation_ids, _checkout_error,
+        {"status": ReservationStatusEnum.CHECKED_OUT, "actual_checkout": checkout_time or datetime.now()},
+        RoomStatusEnum.CLEANING
+    )
@@ -3,7 +3,7 @@ Hotel Management System - Guest Model
 Handles guest information and customer management.
 """
 
-from sqlalchemy import Column, String, Date, Text, Enum
+from sqlalchemy import Column, String, Date, Text, Enum, Index, DDL, event, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 import enum
@@ -17,6 +17,27 @@ class IDTypeEnum(str, enum.Enum):
 class Guest(BaseModel):
     """Guest model for customer information."""
     __tablename__ = "guests"
+    __table_args__ = (
+        Index("ix_guests_id_type_id_number", "id_type", "id_number"),
+        # ID number lookups without an ID type, e.g. the exact-match branch of guest search
+        Index("ix_guests_id_number", "id_number"),
+        # Keyset pagination order
+        Index("ix_guests_created_at_id", "created_at", "id"),
+        # Trigram indexes for partial-match search (pg_trgm); the search service
+        # must filter on exactly these expressions for the planner to use them
+        Index(
+            "ix_guests_full_name_trgm", text("lower(first_name || ' ' || last_name) gin_trgm_ops"),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_guests_email_trgm", text("lower(email) gin_trgm_ops"),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_guests_phone_digits_trgm", text("regexp_replace(phone, '[^0-9]', '', 'g') gin_trgm_ops"),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
     
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
@@ -63,3 +84,8 @@ class Guest(BaseModel):
             "date_of_birth": self.date_of_birth
         }
 
+# The trigram indexes need the pg_trgm extension, also when they are added to an existing table
+event.listen(
+    Guest.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -4,9 +4,10 @@ Pydantic models for guest and reservation-related API requests and responses.
 """
 
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
+from uuid import UUID
 from ..models.guest import IDTypeEnum
 from ..models.reservation import ReservationStatusEnum
 
@@ -45,13 +46,50 @@ class GuestUpdate(BaseModel):
 
 class GuestResponse(GuestBase):
     """Schema for guest response."""
-    id: str
+    id: UUID
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
 
+class GuestSearchResult(BaseModel):
+    """Schema for a ranked guest search match."""
+    id: str
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: str
+    id_type: Optional[IDTypeEnum] = None
+    id_number: Optional[str] = None
+    score: float
+
+class GuestSearchResponse(BaseModel):
+    """Schema for guest search response."""
+    query: str
+    total: int
+    results: List[GuestSearchResult]
+
+class GuestMergeRequest(BaseModel):
+    """Schema for merging duplicate guest profiles into one."""
+    survivor_id: str
+    duplicate_ids: List[str]
+    
+    @validator('duplicate_ids')
+    def validate_duplicate_ids(cls, v, values):
+        if not v:
+            raise ValueError('At least one duplicate guest is required')
+        if values.get('survivor_id') in v:
+            raise ValueError('The surviving guest cannot be listed as a duplicate')
+        return v
+
+class GuestMergeResponse(BaseModel):
+    """Schema for guest merge response."""
+    survivor_id: str
+    guests_merged: int
+    reservations_moved: int
+    orders_moved: int
+
 class ReservationBase(BaseModel):
     """Base reservation schema."""
     checkin_date: date
@@ -100,16 +138,51 @@ class ReservationCheckout(BaseModel):
     """Schema for guest check-out."""
     checkout_time: Optional[datetime] = None
 
+class ReservationBulkCheckin(BaseModel):
+    """Schema for checking in a group of reservations."""
+    reservation_ids: List[str]
+    checkin_time: Optional[datetime] = None
+    
+    @validator('reservation_ids')
+    def validate_reservation_ids(cls, v):
+        if not v:
+            raise ValueError('At least one reservation is required')
+        return v
+
+class ReservationBulkCheckout(BaseModel):
+    """Schema for checking out a group of reservations."""
+    reservation_ids: List[str]
+    checkout_time: Optional[datetime] = None
+    
+    @validator('reservation_ids')
+    def validate_reservation_ids(cls, v):
+        if not v:
+            raise ValueError('At least one reservation is required')
+        return v
+
+class ReservationBulkResult(BaseModel):
+    """Outcome of one reservation in a group operation."""
+    reservation_id: str
+    success: bool
+    detail: Optional[str] = None
+
+class ReservationBulkResponse(BaseModel):
+    """Schema for group check-in/check-out response."""
+    processed: int
+    succeeded: int
+    failed: int
+    results: List[ReservationBulkResult]
+
 class ReservationResponse(ReservationBase):
     """Schema for reservation response."""
-    id: str
-    guest_id: str
-    room_id: str
+    id: UUID
+    guest_id: UUID
+    room_id: UUID
     actual_checkin: Optional[datetime] = None
     actual_checkout: Optional[datetime] = None
     total_amount: Decimal
     status: ReservationStatusEnum
-    created_by: Optional[str] = None
+    created_by: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
     
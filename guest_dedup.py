@@ -0,0 +1,309 @@
+"""
+Hotel Management System - Duplicate Guest Detection
+Finds repeat guests entered as new profiles and merges them into one.
+"""
+
+from sqlalchemy import select, update, case
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from ..core.audit import record_bulk_update
+from ..core.invalidation import mark_changed
+from ..core.database import SessionLocal
+from ..models import Guest, Reservation, Order
+import numpy as np
+import argparse
+import json
+import logging
+import re
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Blocks larger than this (e.g. a travel agency phone shared by many guests) are skipped
+MAX_BLOCK_SIZE = 50
+
+# Candidate pairs scored per vectorized batch
+SCORE_BATCH_SIZE = 1_000_000
+
+# Pairs scoring at least this are proposed for merging
+DEFAULT_THRESHOLD = 0.6
+
+# Evidence weights; a conflicting date of birth or ID number counts against a match
+WEIGHTS = {
+    "email": 0.35,
+    "phone": 0.30,
+    "id_number": 0.40,
+    "date_of_birth": 0.25,
+    "last_name": 0.20,
+    "first_name": 0.15,
+    "first_initial": 0.05,
+}
+CONFLICT_PENALTY = 0.30
+
+# Profile fields copied onto the surviving guest when it has none
+FILLABLE_FIELDS = ("email", "address", "nationality", "id_type", "id_number", "date_of_birth")
+
+class GuestNotFoundError(LookupError):
+    """Raised when a guest to merge does not exist."""
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lower-case a name and strip accents, punctuation and spaces."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    return re.sub(r"[^a-z]", "", decomposed.encode("ascii", "ignore").decode().lower())
+
+def normalize_email(email: Optional[str]) -> str:
+    """Lower-case and trim an email address."""
+    return (email or "").strip().lower()
+
+def normalize_phone_key(phone: Optional[str]) -> str:
+    """Last nine digits of a phone number, so country prefixes and formatting don't matter."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-9:] if len(digits) >= 7 else ""
+
+def _codes(values: List[str]) -> np.ndarray:
+    """Encode strings as integer codes; empty values get -1 and never match."""
+    uniques, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+    codes = codes.astype(np.int64)
+    if len(uniques) and uniques[0] == "":
+        codes[codes == 0] = -1
+    return codes
+
+class GuestFrame:
+    """Normalized guest attributes as parallel NumPy code arrays."""
+
+    def __init__(self, rows: List[tuple]):
+        self.ids = [row.id for row in rows]
+        self.created_at = [row.created_at for row in rows]
+        first_names = [normalize_name(row.first_name) for row in rows]
+        last_names = [normalize_name(row.last_name) for row in rows]
+        dates_of_birth = [row.date_of_birth.isoformat() if row.date_of_birth else "" for row in rows]
+
+        self.codes = {
+            "email": _codes([normalize_email(row.email) for row in rows]),
+            "phone": _codes([normalize_phone_key(row.phone) for row in rows]),
+            "id_number": _codes([
+                f"{row.id_type.value if row.id_type else ''}:{row.id_number.strip().upper()}" if row.id_number else ""
+                for row in rows
+            ]),
+            "date_of_birth": _codes(dates_of_birth),
+            "first_name": _codes(first_names),
+            "last_name": _codes(last_names),
+            "first_initial": _codes([name[:1] for name in first_names]),
+            "name_dob": _codes([
+                f"{first}|{last}|{dob}" if dob and first and last else ""
+                for first, last, dob in zip(first_names, last_names, dates_of_birth)
+            ]),
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+def load_guests(db: Session, chunk_size: int = 50000) -> GuestFrame:
+    """Load the attributes used for matching from a server-side cursor."""
+    statement = select(
+        Guest.id, Guest.first_name, Guest.last_name, Guest.email, Guest.phone,
+        Guest.id_type, Guest.id_number, Guest.date_of_birth, Guest.created_at
+    ).execution_options(yield_per=chunk_size)
+    rows = []
+    for partition in db.execute(statement).partitions():
+        rows.extend(partition)
+    return GuestFrame(rows)
+
+# Attributes that put two guests in the same block
+BLOCKING_KEYS = ("phone", "email", "name_dob", "id_number")
+
+def candidate_pairs(frame: GuestFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the unique (left, right) index pairs sharing at least one blocking key."""
+    left, right = [], []
+    for key in BLOCKING_KEYS:
+        codes = frame.codes[key]
+        present = np.flatnonzero(codes >= 0)
+        order = present[np.argsort(codes[present], kind="stable")]
+        block_codes, starts, sizes = np.unique(codes[order], return_index=True, return_counts=True)
+        skipped = 0
+        for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+            if size > MAX_BLOCK_SIZE:
+                skipped += 1
+                continue
+            for i, j in combinations(order[start:start + size], 2):
+                left.append(min(i, j))
+                right.append(max(i, j))
+        if skipped:
+            logger.info(f"Skipped {skipped} oversized '{key}' blocks")
+
+    if not left:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # The same pair can share several keys; keep it once
+    pairs = np.unique(np.array(left, dtype=np.int64) * len(frame) + np.array(right, dtype=np.int64))
+    return pairs // len(frame), pairs % len(frame)
+
+def score_pairs(frame: GuestFrame, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Score candidate pairs in [0, 1] with vectorized feature comparisons."""
+    scores = np.zeros(len(left), dtype=np.float64)
+    for key, weight in WEIGHTS.items():
+        codes = frame.codes[key]
+        a, b = codes[left], codes[right]
+        same = (a == b) & (a >= 0)
+        if key == "first_initial":
+            # Only counts when the full first names differ ("J." vs "John")
+            same &= frame.codes["first_name"][left] != frame.codes["first_name"][right]
+        scores += weight * same
+    for key in ("date_of_birth", "id_number"):
+        codes = frame.codes[key]
+        a, b = codes[left], codes[right]
+        scores -= CONFLICT_PENALTY * ((a != b) & (a >= 0) & (b >= 0))
+    return np.clip(scores, 0.0, 1.0)
+
+def _clusters(pairs: Iterator[Tuple[int, int, float]]) -> Dict[int, Tuple[List[int], float]]:
+    """Group matched pairs into clusters (union-find); each cluster keeps its weakest link score."""
+    parent: Dict[int, int] = {}
+
+    def find(node: int) -> int:
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    links = []
+    for i, j, score in pairs:
+        parent[find(i)] = find(j)
+        links.append((i, score))
+
+    members, scores = defaultdict(list), {}
+    for node in parent:
+        members[find(node)].append(node)
+    for i, score in links:
+        root = find(i)
+        scores[root] = min(scores.get(root, 1.0), score)
+    return {root: (nodes, scores[root]) for root, nodes in members.items()}
+
+def find_duplicates(db: Session, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """Build merge proposals: each keeps the oldest profile and lists its duplicates."""
+    frame = load_guests(db)
+    left, right = candidate_pairs(frame)
+    logger.info(f"Scoring {len(left)} candidate pairs across {len(frame)} guests")
+
+    matched = []
+    for offset in range(0, len(left), SCORE_BATCH_SIZE):
+        batch_left = left[offset:offset + SCORE_BATCH_SIZE]
+        batch_right = right[offset:offset + SCORE_BATCH_SIZE]
+        scores = score_pairs(frame, batch_left, batch_right)
+        keep = scores >= threshold
+        matched.extend(zip(batch_left[keep].tolist(), batch_right[keep].tolist(), scores[keep].tolist()))
+
+    proposals = []
+    for nodes, score in _clusters(iter(matched)).values():
+        nodes.sort(key=lambda node: (frame.created_at[node], str(frame.ids[node])))
+        proposals.append({
+            "survivor_id": str(frame.ids[nodes[0]]),
+            "duplicate_ids": [str(frame.ids[node]) for node in nodes[1:]],
+            "score": round(score, 4),
+        })
+    proposals.sort(key=lambda proposal: -proposal["score"])
+    logger.info(f"Found {len(proposals)} duplicate groups covering {sum(len(p['duplicate_ids']) for p in proposals)} profiles")
+    return proposals
+
+def merge_guests(db: Session, mapping: Dict[UUID, UUID]) -> dict:
+    """
+    Merge duplicate guests into their survivors in one transaction.
+    `mapping` maps each duplicate id to its survivor id. Reservations and
+    orders are repointed with one UPDATE per table, missing profile fields
+    are filled from the duplicates, then the duplicates are deleted. Raises
+    GuestNotFoundError for unknown guests and ValueError for an invalid mapping.
+    """
+    mapping = {UUID(str(duplicate)): UUID(str(survivor)) for duplicate, survivor in mapping.items() if duplicate != survivor}
+    if not mapping:
+        return {"guests_merged": 0, "reservations_moved": 0, "orders_moved": 0}
+    if set(mapping) & set(mapping.values()):
+        raise ValueError("A guest cannot be both a survivor and a duplicate")
+
+    guests = {
+        guest.id: guest for guest in db.execute(
+            select(Guest).where(Guest.id.in_(set(mapping) | set(mapping.values()))).with_for_update()
+        ).scalars()
+    }
+    missing = (set(mapping) | set(mapping.values())) - set(guests)
+    if missing:
+        raise GuestNotFoundError(f"Guests not found: {', '.join(sorted(str(guest_id) for guest_id in missing))}")
+
+    # Oldest duplicates first, so their details win over later re-entries
+    for duplicate_id in sorted(mapping, key=lambda guest_id: guests[guest_id].created_at):
+        survivor, duplicate = guests[mapping[duplicate_id]], guests[duplicate_id]
+        for field in FILLABLE_FIELDS:
+            if getattr(survivor, field) is None and getattr(duplicate, field) is not None:
+                setattr(survivor, field, getattr(duplicate, field))
+
+    moved = {}
+    for model in (Reservation, Order):
+        rows = db.execute(select(model.id, model.guest_id).where(model.guest_id.in_(mapping))).all()
+        if rows:
+            db.execute(
+                update(model).where(model.guest_id.in_(mapping))
+                .values(guest_id=case(mapping, value=model.guest_id)),
+                execution_options={"synchronize_session": False}
+            )
+            record_bulk_update(db, model.__tablename__, [
+                (record_id, {"guest_id": guest_id}, {"guest_id": mapping[guest_id]}) for record_id, guest_id in rows
+            ])
+            mark_changed(db, [model.__tablename__])
+        moved[model.__tablename__] = len(rows)
+
+    for duplicate_id in mapping:
+        db.delete(guests[duplicate_id])
+    db.commit()
+
+    logger.info(
+        f"Merged {len(mapping)} guest profiles, moved {moved['reservations']} reservations and {moved['orders']} orders"
+    )
+    return {"guests_merged": len(mapping), "reservations_moved": moved["reservations"], "orders_moved": moved["orders"]}
+
+def apply_proposals(db: Session, proposals: List[dict], min_score: float = DEFAULT_THRESHOLD,
+                    batch_size: int = 500) -> dict:
+    """Merge proposals scoring at least min_score, batch_size groups per transaction."""
+    totals = {"guests_merged": 0, "reservations_moved": 0, "orders_moved": 0}
+    selected = [proposal for proposal in proposals if proposal["score"] >= min_score]
+    for offset in range(0, len(selected), batch_size):
+        mapping = {
+            duplicate_id: proposal["survivor_id"]
+            for proposal in selected[offset:offset + batch_size]
+            for duplicate_id in proposal["duplicate_ids"]
+        }
+        result = merge_guests(db, mapping)
+        for key in totals:
+            totals[key] += result[key]
+    return totals
+
+if __name__ == "__main__":
+    from ..core.audit import audit_writer, install_audit_hooks
+    from ..core.config import settings
+
+    parser = argparse.ArgumentParser(description="Detect and merge duplicate guest profiles")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    detect_parser = subparsers.add_parser("detect", help="Write merge proposals as JSON lines")
+    detect_parser.add_argument("--output", default="guest_merge_proposals.jsonl")
+    detect_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    merge_parser = subparsers.add_parser("merge", help="Apply merge proposals from a JSON lines file")
+    merge_parser.add_argument("--input", default="guest_merge_proposals.jsonl")
+    merge_parser.add_argument("--min-score", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "detect":
+            with open(args.output, "w", encoding="utf-8") as output_file:
+                for proposal in find_duplicates(db, args.threshold):
+                    output_file.write(json.dumps(proposal) + "\n")
+        else:
+            if settings.audit_enabled:
+                install_audit_hooks()
+                audit_writer.start()
+            with open(args.input, encoding="utf-8") as input_file:
+                proposals = [json.loads(line) for line in input_file if line.strip()]
+            print(apply_proposals(db, proposals, args.min_score))
+    finally:
+        db.close()
+        audit_writer.stop()
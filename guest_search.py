@@ -0,0 +1,238 @@
+"""
+Hotel Management System - Guest Search Service
+Ranked partial-match guest lookup by name, email, phone fragment or ID number.
+"""
+
+from sqlalchemy import event, select, func, or_, case, literal_column
+from sqlalchemy.orm import Session
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from ..core.database import SessionLocal, engine
+from ..core.invalidation import invalidation_bus
+from ..models import Guest, IDTypeEnum
+import logging
+import re
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "guest_search_pending"
+
+# Shortest fragment worth matching; shorter ones match almost everything
+MIN_QUERY_LENGTH = 2
+MIN_PHONE_DIGITS = 3
+
+# Guests sharing the most trigrams with the query that are scored in memory
+MAX_CANDIDATES = 1000
+
+# Same expressions as the trigram indexes on Guest, so the planner can use them
+NAME_EXPRESSION = func.lower(Guest.first_name + literal_column("' '") + Guest.last_name)
+EMAIL_EXPRESSION = func.lower(Guest.email)
+PHONE_EXPRESSION = func.regexp_replace(
+    Guest.phone, literal_column("'[^0-9]'"), literal_column("''"), literal_column("'g'")
+)
+
+SEARCH_COLUMNS = (
+    Guest.id, Guest.first_name, Guest.last_name, Guest.email, Guest.phone, Guest.id_type, Guest.id_number
+)
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Keep only the digits of a phone number."""
+    return re.sub(r"\D", "", phone or "")
+
+def _contains_pattern(value: str) -> str:
+    """Build a LIKE pattern matching a literal fragment anywhere (escape character '/')."""
+    escaped = value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"%{escaped}%"
+
+def trigrams(value: str) -> Set[str]:
+    """Get the trigrams of a string, padded like pg_trgm so short words still match."""
+    grams = set()
+    for word in re.findall(r"\w+", value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def _search_postgres(db: Session, query: str, id_type: Optional[IDTypeEnum], limit: int) -> List[dict]:
+    """Search with pg_trgm; LIKE and similarity predicates are served by the GIN indexes."""
+    term = query.lower()
+    pattern = _contains_pattern(term)
+    digits = normalize_phone(query)
+
+    conditions = [
+        NAME_EXPRESSION.like(pattern, escape="/"),
+        NAME_EXPRESSION.op("%")(term),
+        EMAIL_EXPRESSION.like(pattern, escape="/"),
+        Guest.id_number == query,
+    ]
+    phone_match = None
+    if len(digits) >= MIN_PHONE_DIGITS:
+        phone_match = PHONE_EXPRESSION.like(f"%{digits}%")
+        conditions.append(phone_match)
+
+    score = func.greatest(
+        func.similarity(NAME_EXPRESSION, term),
+        func.coalesce(func.similarity(EMAIL_EXPRESSION, term), 0),
+        case((Guest.id_number == query, 1.0), else_=0.0),
+        case((phone_match, 0.9), else_=0.0) if phone_match is not None else literal_column("0.0"),
+    ).label("score")
+
+    statement = select(*SEARCH_COLUMNS, score).where(or_(*conditions))
+    if id_type:
+        statement = statement.where(Guest.id_type == id_type)
+    rows = db.execute(statement.order_by(score.desc(), Guest.last_name).limit(limit)).mappings().all()
+    return [dict(row) for row in rows]
+
+class GuestSearchIndex:
+    """
+    In-memory trigram index over guest names, emails, phone digits and ID
+    numbers, for SQLite deployments without pg_trgm.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, dict] = {}
+        self.loaded = False
+
+    def _document_grams(self, document: dict) -> Set[str]:
+        grams = trigrams(f"{document['first_name']} {document['last_name']}")
+        grams |= trigrams(document["email"] or "")
+        grams |= trigrams(normalize_phone(document["phone"]))
+        grams |= trigrams(document["id_number"] or "")
+        return grams
+
+    def _remove(self, guest_id: str):
+        document = self._documents.pop(guest_id, None)
+        if document is None:
+            return
+        for gram in self._document_grams(document):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(guest_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def _add(self, document: dict):
+        guest_id = str(document["id"])
+        self._documents[guest_id] = document
+        for gram in self._document_grams(document):
+            self._postings.setdefault(gram, set()).add(guest_id)
+
+    def load(self, db: Session):
+        """Build the index from the guests table."""
+        rows = db.execute(select(*SEARCH_COLUMNS)).mappings().all()
+        with self._lock:
+            self._postings, self._documents = {}, {}
+            for row in rows:
+                self._add(dict(row))
+            self.loaded = True
+        logger.info(f"Guest search index built with {len(rows)} guests")
+
+    def apply(self, upserts: List[dict], deletes: List[str]):
+        """Apply committed guest changes."""
+        with self._lock:
+            for guest_id in deletes:
+                self._remove(guest_id)
+            for document in upserts:
+                self._remove(str(document["id"]))
+                self._add(document)
+
+    def search(self, query: str, id_type: Optional[IDTypeEnum], limit: int) -> List[dict]:
+        """Rank guests by the share of query trigrams they contain."""
+        digits = normalize_phone(query)
+        query_grams = trigrams(query)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            query_grams |= trigrams(digits)
+        if not query_grams:
+            return []
+
+        term = query.lower()
+        with self._lock:
+            hits = Counter()
+            for gram in query_grams:
+                hits.update(self._postings.get(gram, ()))
+            candidates = [(guest_id, self._documents[guest_id]) for guest_id, _ in hits.most_common(MAX_CANDIDATES)]
+
+        results = []
+        for guest_id, document in candidates:
+            if id_type and document["id_type"] != id_type:
+                continue
+            name = f"{document['first_name']} {document['last_name']}".lower()
+            if document["id_number"] and document["id_number"] == query:
+                score = 1.0
+            elif len(digits) >= MIN_PHONE_DIGITS and digits in normalize_phone(document["phone"]):
+                score = 0.9
+            else:
+                score = hits[guest_id] / len(query_grams)
+                if term in name or term in (document["email"] or "").lower():
+                    score = max(score, 0.5)
+            if score >= 0.3:
+                results.append({**document, "score": round(score, 4)})
+        results.sort(key=lambda result: (-result["score"], result["last_name"]))
+        return results[:limit]
+
+guest_search_index = GuestSearchIndex()
+
+def search_guests(db: Session, query: str, id_type: Optional[IDTypeEnum] = None, limit: int = 20) -> List[dict]:
+    """Search guests, best matches first."""
+    query = query.strip()
+    if len(query) < MIN_QUERY_LENGTH:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, query, id_type, limit)
+    if not guest_search_index.loaded:
+        guest_search_index.load(db)
+    return guest_search_index.search(query, id_type, limit)
+
+def _document(guest: Guest) -> dict:
+    return {column.key: getattr(guest, column.key) for column in SEARCH_COLUMNS}
+
+def _before_flush(session: Session, flush_context, instances):
+    """Collect guest inserts, updates and deletes for the in-memory index."""
+    pending = session.info.setdefault(_PENDING_KEY, {"upserts": {}, "deletes": set()})
+    for guest in list(session.new) + list(session.dirty):
+        if isinstance(guest, Guest):
+            # Assign the primary key up front so the document can reference it
+            if guest.id is None:
+                guest.id = uuid.uuid4()
+            pending["upserts"][str(guest.id)] = guest
+    for guest in session.deleted:
+        if isinstance(guest, Guest):
+            pending["upserts"].pop(str(guest.id), None)
+            pending["deletes"].add(str(guest.id))
+
+def _after_flush_postexec(session: Session, flush_context):
+    """Snapshot the documents before commit expires their attributes."""
+    pending = session.info.get(_PENDING_KEY)
+    if pending:
+        pending["documents"] = [_document(guest) for guest in pending["upserts"].values()]
+
+def _after_commit(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and (pending.get("documents") or pending["deletes"]):
+        guest_search_index.apply(pending.get("documents", []), list(pending["deletes"]))
+
+def _after_soft_rollback(session: Session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+def _reload(session_factory):
+    db = session_factory()
+    try:
+        guest_search_index.load(db)
+    finally:
+        db.close()
+
+def start_guest_search(session_factory=SessionLocal):
+    """Build the in-memory index where Postgres trigram indexes are not available."""
+    if engine.dialect.name == "postgresql":
+        return
+    _reload(session_factory)
+    if not event.contains(session_factory, "before_flush", _before_flush):
+        event.listen(session_factory, "before_flush", _before_flush)
+        event.listen(session_factory, "after_flush_postexec", _after_flush_postexec)
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+        # Guests changed by other workers
+        invalidation_bus.register(Guest.__tablename__, lambda table_name: _reload(session_factory), local=False)
@@ -0,0 +1,102 @@
+"""
+Hotel Management System - Guests Router
+Handles guest lookup and profile merges.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from ..core.database import get_db
+from ..core.fieldsets import parse_fields, load_options, fieldset_page
+from ..core.pagination import paginate
+from ..core.security import require_admin, require_receptionist
+from ..models.guest import Guest, IDTypeEnum
+from ..models.user import User
+from ..schemas.guest import (
+    GuestResponse, GuestSearchResult, GuestSearchResponse, GuestMergeRequest, GuestMergeResponse
+)
+from ..schemas.pagination import CursorPage
+from ..services.guest_search import search_guests
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/guests", tags=["Guests"])
+
+@router.get("", response_model=CursorPage[GuestResponse])
+async def list_guests(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_receptionist)
+):
+    """
+    List guests, newest first, one page at a time.
+    `fields` limits the response to the listed fields, e.g. `first_name,last_name,phone`.
+    """
+    fieldset = parse_fields(fields, GuestResponse)
+    statement = select(Guest).options(*load_options(Guest, GuestResponse, fieldset))
+    guests, next_cursor = paginate(db, statement, Guest, cursor, limit)
+    return fieldset_page(GuestResponse, fieldset, guests, next_cursor, limit)
+
+@router.get("/search", response_model=GuestSearchResponse)
+async def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    id_type: Optional[IDTypeEnum] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_receptionist)
+):
+    """
+    Search guests by partial name, email, phone fragment or ID number.
+    Results are ranked by match quality, best first.
+    """
+    matches = search_guests(db, q, id_type, limit)
+    return GuestSearchResponse(
+        query=q,
+        total=len(matches),
+        results=[GuestSearchResult(**{**match, "id": str(match["id"])}) for match in matches]
+    )
+
+@router.post("/merge", response_model=GuestMergeResponse)
+async def merge(
+    request: GuestMergeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Merge duplicate guest profiles into a surviving profile.
+    Reservations and orders are moved to the survivor and the duplicates are deleted.
+    """
+    try:
+        survivor_id = UUID(request.survivor_id)
+        mapping = {UUID(duplicate_id): survivor_id for duplicate_id in request.duplicate_ids}
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid guest id"
+        )
+
+    # Deferred: the dedup service pulls in NumPy, which only merges need
+    from ..services.guest_dedup import merge_guests, GuestNotFoundError
+    
+    try:
+        result = merge_guests(db, mapping)
+    except GuestNotFoundError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    logger.info(f"Guest {survivor_id} merged with {len(mapping)} duplicates by {current_user.username}")
+    return GuestMergeResponse(survivor_id=str(survivor_id), **result)
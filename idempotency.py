@@ -0,0 +1,301 @@
+"""
+Hotel Management System - Idempotency Keys
+Replays the stored response of a write retried with the same Idempotency-Key header.
+"""
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Table, Column, String, Integer, DateTime, LargeBinary, Text, Index, and_, delete, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from .config import settings
+from .database import Base, engine
+from .rate_limit import token_subject
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Writes under this prefix honour the header; authentication issues its own tokens
+PATH_PREFIX = "/api/v1/"
+EXCLUDED_PREFIXES = ("/api/v1/auth",)
+
+# Expired keys are deleted this often
+PURGE_INTERVAL = 3600.0
+
+# Response headers that belong to the connection rather than the response, and are not replayed
+UNSTORED_HEADERS = {
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization", b"te",
+    b"trailer", b"transfer-encoding", b"upgrade", b"content-length"
+}
+
+# Keys are scoped to the user (the JWT subject); status_code is NULL while the first request is running
+idempotency_keys = Table(
+    "idempotency_keys", Base.metadata,
+    Column("subject", String(100), primary_key=True),
+    Column("key", String(MAX_KEY_LENGTH), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("status_code", Integer),
+    Column("headers", Text),  # JSON list of [name, value] pairs
+    Column("body", LargeBinary),
+    Column("created_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Index("ix_idempotency_keys_expires_at", "expires_at")
+)
+
+# (status code, headers, body) of a completed request
+StoredResponse = Tuple[int, List[Tuple[str, str]], bytes]
+
+class IdempotencyStore:
+    """
+    Completed responses by (user, key): a database table shared by all workers,
+    fronted by a bounded in-memory cache. A key is claimed with an in-progress
+    row before the request runs, so duplicates on other workers wait for it.
+    """
+
+    def __init__(self):
+        self._cache: "OrderedDict[tuple, Tuple[float, str, StoredResponse]]" = OrderedDict()
+        self._purged = 0.0
+        self.replayed = 0
+
+    def cached(self, cache_key: tuple) -> Optional[Tuple[str, StoredResponse]]:
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+        expires, fingerprint, response = entry
+        if expires < time.monotonic():
+            del self._cache[cache_key]
+            return None
+        self._cache.move_to_end(cache_key)
+        return fingerprint, response
+
+    def remember(self, cache_key: tuple, fingerprint: str, response: StoredResponse):
+        self._cache[cache_key] = (time.monotonic() + settings.idempotency_ttl_hours * 3600, fingerprint, response)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > settings.idempotency_cache_size:
+            self._cache.popitem(last=False)
+
+    def claim(self, user: str, key: str, fingerprint: str) -> Optional[tuple]:
+        """
+        Claim the key for a new request. Returns None if claimed, else the
+        existing (fingerprint, status code, headers, body) row.
+        """
+        now = datetime.utcnow()
+        insert = postgresql_insert if engine.dialect.name == "postgresql" else sqlite_insert
+        with engine.begin() as connection:
+            if time.monotonic() - self._purged > PURGE_INTERVAL:
+                connection.execute(delete(idempotency_keys).where(idempotency_keys.c.expires_at < now))
+                self._purged = time.monotonic()
+            else:
+                # Expired keys, including claims of requests that never finished
+                connection.execute(delete(idempotency_keys).where(and_(
+                    idempotency_keys.c.subject == user,
+                    idempotency_keys.c.key == key,
+                    idempotency_keys.c.expires_at < now
+                )))
+            claimed = connection.execute(
+                insert(idempotency_keys).values(
+                    subject=user, key=key, fingerprint=fingerprint, created_at=now,
+                    expires_at=now + timedelta(seconds=settings.idempotency_claim_timeout)
+                ).on_conflict_do_nothing().returning(idempotency_keys.c.key)
+            ).first()
+            if claimed is not None:
+                return None
+            return connection.execute(
+                select(
+                    idempotency_keys.c.fingerprint, idempotency_keys.c.status_code,
+                    idempotency_keys.c.headers, idempotency_keys.c.body
+                ).where(and_(idempotency_keys.c.subject == user, idempotency_keys.c.key == key))
+            ).first()
+
+    def extend(self, user: str, key: str):
+        """Keep the claim of a request that is still running from expiring."""
+        with engine.begin() as connection:
+            connection.execute(update(idempotency_keys).where(and_(
+                idempotency_keys.c.subject == user,
+                idempotency_keys.c.key == key,
+                idempotency_keys.c.status_code.is_(None)
+            )).values(expires_at=datetime.utcnow() + timedelta(seconds=settings.idempotency_claim_timeout)))
+
+    def complete(self, user: str, key: str, response: Optional[StoredResponse]):
+        """Store the response of a claimed key, or release the claim so the request can be retried."""
+        condition = and_(idempotency_keys.c.subject == user, idempotency_keys.c.key == key)
+        with engine.begin() as connection:
+            if response is None:
+                connection.execute(delete(idempotency_keys).where(condition))
+            else:
+                status_code, headers, body = response
+                connection.execute(update(idempotency_keys).where(condition).values(
+                    status_code=status_code, headers=json.dumps(headers), body=body,
+                    expires_at=datetime.utcnow() + timedelta(hours=settings.idempotency_ttl_hours)
+                ))
+
+idempotency_store = IdempotencyStore()
+
+def _fingerprint(scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+async def _send_json(send, status_code: int, detail: str):
+    await _replay(send, (status_code, [("content-type", "application/json")], json.dumps({"detail": detail}).encode()), replayed=False)
+
+async def _replay(send, response: StoredResponse, replayed: bool = True):
+    status_code, stored_headers, body = response
+    headers = [(b"content-length", str(len(body)).encode())]
+    headers.extend((name.encode("latin-1"), value.encode("latin-1")) for name, value in stored_headers)
+    if replayed:
+        headers.append((b"idempotent-replayed", b"true"))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware for authenticated writes carrying an Idempotency-Key
+    header. The first request runs and its response (other than 3xx and 5xx)
+    is stored with its headers; retries get the stored response without running the endpoint,
+    and concurrent duplicates wait for the first to finish. Reusing a key for
+    a different request is rejected with 422.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not scope["path"].startswith(PATH_PREFIX) \
+                or scope["path"].startswith(EXCLUDED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", ()))
+        key = headers.get(HEADER, b"").decode("latin-1").strip()
+        scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+        user = token_subject(token) if key and scheme.lower() == "bearer" and token else None
+        if user is None:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+            return
+
+        # The body is part of the fingerprint, so read it up front and hand it to the app afterwards
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        fingerprint = _fingerprint(scope, body)
+        cache_key = (user, key)
+
+        deadline = time.monotonic() + settings.idempotency_lock_timeout
+        while True:
+            cached = idempotency_store.cached(cache_key)
+            if cached is not None:
+                stored_fingerprint, response = cached
+                if stored_fingerprint != fingerprint:
+                    await _send_json(send, 422, "Idempotency-Key was already used for a different request")
+                else:
+                    idempotency_store.replayed += 1
+                    await _replay(send, response)
+                return
+
+            # A duplicate in this worker waits for the first request, then looks again
+            waiting = self._in_flight.get(cache_key)
+            if waiting is not None:
+                await asyncio.shield(waiting)
+                continue
+
+            # Claimed locally first, so duplicates in this worker wait instead of querying
+            finished = asyncio.get_running_loop().create_future()
+            self._in_flight[cache_key] = finished
+            try:
+                existing = await run_in_threadpool(idempotency_store.claim, user, key, fingerprint)
+            except BaseException:
+                self._in_flight.pop(cache_key, None)
+                finished.set_result(None)
+                raise
+            if existing is None:
+                break
+            self._in_flight.pop(cache_key, None)
+            finished.set_result(None)
+
+            stored_fingerprint, status_code, stored_headers, stored_body = existing
+            if stored_fingerprint != fingerprint:
+                await _send_json(send, 422, "Idempotency-Key was already used for a different request")
+                return
+            if status_code is not None:
+                response = (status_code, json.loads(stored_headers or "[]"), stored_body)
+                idempotency_store.remember(cache_key, fingerprint, response)
+                idempotency_store.replayed += 1
+                await _replay(send, response)
+                return
+            # Another worker is running the first request
+            if time.monotonic() > deadline:
+                await _send_json(send, 409, "A request with this Idempotency-Key is still in progress")
+                return
+            await asyncio.sleep(settings.idempotency_poll_interval)
+
+        captured = {"status": 500, "headers": [], "body": []}
+
+        async def replay_body():
+            nonlocal body
+            if body is not None:
+                message, body = {"type": "http.request", "body": body, "more_body": False}, None
+                return message
+            return await receive()
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [
+                    (name.decode("latin-1").lower(), value.decode("latin-1"))
+                    for name, value in message.get("headers", ())
+                    if name.lower() not in UNSTORED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        async def keep_claim():
+            while True:
+                await asyncio.sleep(settings.idempotency_claim_timeout / 3)
+                try:
+                    await run_in_threadpool(idempotency_store.extend, user, key)
+                except Exception as e:
+                    logger.error(f"Could not extend the claim of Idempotency-Key {key}: {e}")
+
+        response = None
+        # The claim only expires if this worker dies, however long the request runs
+        heartbeat = asyncio.ensure_future(keep_claim())
+        try:
+            await self.app(scope, replay_body, capture)
+            # Redirects and server errors release the key, so the retry runs the request
+            if captured["status"] < 300 or 400 <= captured["status"] < 500:
+                response = (captured["status"], captured["headers"], b"".join(captured["body"]))
+        finally:
+            heartbeat.cancel()
+            try:
+                await run_in_threadpool(idempotency_store.complete, user, key, response)
+                if response is not None:
+                    idempotency_store.remember(cache_key, fingerprint, response)
+            except Exception as e:
+                logger.error(f"Could not store the response for Idempotency-Key {key}: {e}")
+            self._in_flight.pop(cache_key, None)
+            finished.set_result(None)
@@ -0,0 +1,228 @@
+"""
+Hotel Management System - Cache Invalidation
+Table-level change notifications across workers for in-process caches.
+"""
+
+from sqlalchemy import Table, Column, String, BigInteger, create_engine, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from .config import settings
+from .database import Base, SessionLocal, engine
+import logging
+import os
+import select as select_module
+import socket
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "hms_invalidate"
+
+_PENDING_KEY = "invalidation_pending"
+_VERSIONS_KEY = "invalidation_versions"
+
+# Change counter per table, for databases without LISTEN/NOTIFY (SQLite)
+cache_versions = Table(
+    "cache_versions", Base.metadata,
+    Column("table_name", String(50), primary_key=True),
+    Column("version", BigInteger, nullable=False)
+)
+
+def _is_postgres(connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+class InvalidationBus:
+    """
+    Delivers table-level change notifications to registered cache callbacks.
+    Changes are published inside the writing transaction, so other workers
+    only hear about committed data: with pg_notify on Postgres, and by bumping
+    a per-table version that every worker polls on SQLite.
+    """
+
+    def __init__(self):
+        # Identifies this worker, so it can skip its own notifications
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._callbacks: Dict[str, List[tuple]] = defaultdict(list)
+        self._versions: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.received = 0
+
+    def register(self, table_name: str, callback: Callable[[str], None], local: bool = True):
+        """
+        Call callback(table_name) when the table changes. With local=False it
+        only runs for changes committed by other workers, for caches that
+        already apply this worker's own changes themselves.
+        """
+        with self._lock:
+            self._callbacks[table_name].append((callback, local))
+
+    def dispatch(self, tables: Iterable[str], remote: bool):
+        """Run the callbacks registered for the changed tables."""
+        for table_name in tables:
+            with self._lock:
+                callbacks = [callback for callback, local in self._callbacks.get(table_name, ()) if remote or local]
+            for callback in callbacks:
+                try:
+                    callback(table_name)
+                except Exception as e:
+                    logger.error(f"Cache invalidation for {table_name} failed: {e}")
+
+    def publish(self, connection, tables: Iterable[str]) -> Dict[str, int]:
+        """
+        Record table changes in the connection's current transaction.
+        Returns the new version of each table on SQLite.
+        """
+        versions = {}
+        for table_name in sorted(set(tables)):
+            if _is_postgres(connection):
+                connection.execute(select(func.pg_notify(CHANNEL, f"{table_name} {self.origin}")))
+            else:
+                statement = sqlite_insert(cache_versions).values(table_name=table_name, version=1)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[cache_versions.c.table_name],
+                    set_={"version": cache_versions.c.version + 1}
+                ).returning(cache_versions.c.version)
+                versions[table_name] = connection.execute(statement).scalar()
+        return versions
+
+    def committed(self, tables: Set[str], versions: Dict[str, int]):
+        """Apply this worker's own committed changes to its caches."""
+        with self._lock:
+            for table_name, version in versions.items():
+                # Only skip the version if no other worker's change is still unseen
+                if self._versions.get(table_name, 0) == version - 1:
+                    self._versions[table_name] = version
+        self.dispatch(tables, remote=False)
+
+    def start(self):
+        """Start listening for changes committed by other workers."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        if engine.dialect.name == "postgresql":
+            target = self._listen
+        else:
+            with engine.connect() as connection:
+                self._versions = dict(connection.execute(select(cache_versions)).all())
+            target = self._poll
+        self._thread = threading.Thread(target=target, name="cache-invalidation", daemon=True)
+        self._thread.start()
+        logger.info("Cache invalidation listener started")
+
+    def stop(self):
+        """Stop the listener."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        logger.info("Cache invalidation listener stopped")
+
+    def _listen(self):
+        """LISTEN on a dedicated connection; reconnect and invalidate everything after errors."""
+        listen_engine = create_engine(engine.url, poolclass=NullPool)
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                connection = listen_engine.raw_connection()
+            except Exception as e:
+                logger.error(f"Cache invalidation listener cannot connect: {e}")
+                self._stop.wait(settings.cache_poll_interval * 5)
+                continue
+            try:
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                dbapi_connection.cursor().execute(f"LISTEN {CHANNEL}")
+                if connected_before:
+                    # Notifications sent while disconnected are lost
+                    with self._lock:
+                        tables = list(self._callbacks)
+                    self.dispatch(tables, remote=True)
+                connected_before = True
+                while not self._stop.is_set():
+                    readable, _, _ = select_module.select([dbapi_connection], [], [], settings.cache_poll_interval)
+                    if not readable:
+                        continue
+                    dbapi_connection.poll()
+                    tables = set()
+                    while dbapi_connection.notifies:
+                        table_name, _, origin = dbapi_connection.notifies.pop(0).payload.partition(" ")
+                        if origin != self.origin:
+                            tables.add(table_name)
+                    if tables:
+                        self.received += len(tables)
+                        self.dispatch(tables, remote=True)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed, reconnecting: {e}")
+                self._stop.wait(settings.cache_poll_interval)
+            finally:
+                connection.close()
+        listen_engine.dispose()
+
+    def _poll(self):
+        """Poll the version table and invalidate tables whose version moved."""
+        while not self._stop.wait(settings.cache_poll_interval):
+            try:
+                with engine.connect() as connection:
+                    rows = connection.execute(select(cache_versions)).all()
+            except Exception as e:
+                logger.error(f"Cache version poll failed: {e}")
+                continue
+            changed = []
+            with self._lock:
+                for table_name, version in rows:
+                    if version > self._versions.get(table_name, 0):
+                        self._versions[table_name] = version
+                        changed.append(table_name)
+            if changed:
+                self.received += len(changed)
+                self.dispatch(changed, remote=True)
+
+invalidation_bus = InvalidationBus()
+
+def mark_changed(session: Session, tables: Iterable[str]):
+    """
+    Record tables changed with set-based statements, which bypass the flush
+    hooks; other workers are notified once the session commits.
+    """
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    new_tables = set(tables) - pending
+    if new_tables:
+        versions = invalidation_bus.publish(session.connection(), new_tables)
+        session.info.setdefault(_VERSIONS_KEY, {}).update(versions)
+        pending |= new_tables
+
+def _after_flush(session: Session, flush_context):
+    """Publish the tables written by this flush, once per transaction."""
+    tables = set()
+    for obj in list(session.new) + list(session.deleted):
+        tables.add(inspect(obj).mapper.local_table.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tables.add(inspect(obj).mapper.local_table.name)
+    if tables:
+        mark_changed(session, tables)
+
+def _after_commit(session: Session):
+    tables = session.info.pop(_PENDING_KEY, None)
+    versions = session.info.pop(_VERSIONS_KEY, {})
+    if tables:
+        invalidation_bus.committed(tables, versions)
+
+def _after_soft_rollback(session: Session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_VERSIONS_KEY, None)
+
+def start_invalidation(session_factory=SessionLocal):
+    """Publish committed changes from the session factory and start the listener."""
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+    invalidation_bus.start()
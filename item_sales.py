@@ -0,0 +1,259 @@
+"""
+Hotel Management System - Item Sales Rollup
+Keeps daily item sales current as orders are served, paid, cancelled or refunded.
+"""
+
+from sqlalchemy import event, inspect, select, delete, func, and_, text
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from ..core.database import SessionLocal, engine
+from ..models import Order, OrderLine, Item, ItemSalesDaily, OrderStatusEnum, PaymentStatusEnum
+import argparse
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "item_sales_pending"
+
+# Orders whose lines count as sold, unless refunded
+COUNTED_STATUSES = {OrderStatusEnum.SERVED, OrderStatusEnum.PAID}
+
+# (business date, outlet id, item id) -> [quantity, revenue, cost]
+SalesDeltas = Dict[Tuple[date, object, object], list]
+
+def is_counted(order_status, payment_status) -> bool:
+    """Whether an order in this state counts towards item sales."""
+    return order_status in COUNTED_STATUSES and payment_status != PaymentStatusEnum.REFUNDED
+
+def apply_item_sales(connection, deltas: SalesDeltas):
+    """Add quantity, revenue and cost deltas to the rollup rows, creating missing rows."""
+    if not deltas:
+        return
+    table = ItemSalesDaily.__table__
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.business_date, table.c.outlet_id, table.c.item_id],
+        set_={
+            "quantity": table.c.quantity + statement.excluded.quantity,
+            "revenue": table.c.revenue + statement.excluded.revenue,
+            "cost": table.c.cost + statement.excluded.cost,
+            "updated_at": func.now()
+        }
+    )
+    connection.execute(statement, [
+        {
+            "business_date": business_date, "outlet_id": outlet_id, "item_id": item_id,
+            "quantity": quantity, "revenue": revenue, "cost": cost
+        }
+        for (business_date, outlet_id, item_id), (quantity, revenue, cost) in deltas.items()
+    ])
+
+# Order line columns that change what a line adds to the rollup
+_LINE_COLUMNS = ("order_id", "item_id", "quantity", "line_total")
+
+def _before_flush(session: Session, flush_context, instances):
+    """
+    Record whether each order changing state was counted before this flush,
+    and the previous values of order lines being edited or deleted.
+    """
+    pending = session.info[_PENDING_KEY] = {"orders": [], "old_lines": [], "lines": []}
+    changed = {}
+    for instance in session.new:
+        if isinstance(instance, Order):
+            pending["orders"].append((instance, False))
+        elif isinstance(instance, OrderLine):
+            pending["lines"].append(instance)
+    edited_lines = set()
+    for instance in session.dirty:
+        if isinstance(instance, Order):
+            state = inspect(instance)
+            if state.attrs.status.history.has_changes() or state.attrs.payment_status.history.has_changes():
+                changed[instance.id] = instance
+            # Lines removed from the collection are only deleted as orphans during the flush
+            edited_lines.update(line.id for line in state.attrs.order_lines.history.deleted if line.id is not None)
+        elif isinstance(instance, OrderLine):
+            state = inspect(instance)
+            if any(state.attrs[column].history.has_changes() for column in _LINE_COLUMNS):
+                edited_lines.add(instance.id)
+                pending["lines"].append(instance)
+    for instance in session.deleted:
+        if isinstance(instance, OrderLine):
+            edited_lines.add(instance.id)
+    # Attributes expired by a commit are replaced without loading the old value, so read it
+    with session.no_autoflush:
+        if changed:
+            previous = session.execute(
+                select(Order.id, Order.status, Order.payment_status).where(Order.id.in_(changed))
+            ).all()
+            for order_id, previous_status, previous_payment in previous:
+                pending["orders"].append((changed[order_id], is_counted(previous_status, previous_payment)))
+        if edited_lines:
+            pending["old_lines"] = session.execute(
+                select(OrderLine.order_id, OrderLine.item_id, OrderLine.quantity, OrderLine.line_total)
+                .where(OrderLine.id.in_(edited_lines))
+            ).all()
+
+def _after_flush_postexec(session: Session, flush_context):
+    """
+    Add the lines of orders that became counted and subtract those of orders
+    that stopped counting. Lines added, edited or deleted on an order that
+    was already counted are applied as their own difference. All of it goes
+    in the flushing transaction, so the rollup commits or rolls back with
+    the orders.
+    """
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    deltas: SalesDeltas = defaultdict(lambda: [0, Decimal("0"), Decimal("0")])
+    with session.no_autoflush:
+        # (order id, item id, quantity, line total, sign)
+        line_changes = [(*old_line, -1) for old_line in pending["old_lines"]] + [
+            (line.order_id, line.item_id, line.quantity, line.line_total, 1) for line in pending["lines"]
+        ]
+        was_counted = {order.id: counted for order, counted in pending["orders"]}
+        # Orders of edited lines that did not change state in this flush
+        unknown = {order_id for order_id, *_ in line_changes if order_id is not None} - set(was_counted)
+        orders = {}
+        if unknown:
+            for order_id, status, payment_status, created_at, outlet_id in session.execute(
+                select(Order.id, Order.status, Order.payment_status, Order.created_at, Order.outlet_id)
+                .where(Order.id.in_(unknown))
+            ):
+                was_counted[order_id] = is_counted(status, payment_status)
+                orders[order_id] = (created_at, outlet_id)
+        for order, _ in pending["orders"]:
+            orders[order.id] = (order.created_at, order.outlet_id)
+
+        # A transition applies the order's lines as they are after this flush, so the edits of
+        # an order counted before it are applied too; edits of uncounted orders do not count
+        changes = [change for change in line_changes if was_counted.get(change[0])]
+        for order, counted_before in pending["orders"]:
+            counted = is_counted(order.status, order.payment_status)
+            if counted != counted_before:
+                sign = 1 if counted else -1
+                changes.extend(
+                    (order.id, line.item_id, line.quantity, line.line_total, sign) for line in order.order_lines
+                )
+        if not changes:
+            return
+        item_ids = {item_id for _, item_id, *_ in changes}
+        costs = dict(session.execute(select(Item.id, Item.cost).where(Item.id.in_(item_ids))).all())
+        for order_id, item_id, quantity, line_total, sign in changes:
+            created_at, outlet_id = orders[order_id]
+            delta = deltas[(created_at.date(), outlet_id, item_id)]
+            delta[0] += sign * quantity
+            delta[1] += sign * Decimal(line_total)
+            delta[2] += sign * quantity * (costs.get(item_id) or Decimal("0"))
+    apply_item_sales(session.connection(), deltas)
+
+def _after_soft_rollback(session: Session, previous_transaction):
+    """Discard order states recorded for a flush that failed."""
+    session.info.pop(_PENDING_KEY, None)
+
+def start_item_sales(session_factory=SessionLocal):
+    """Start maintaining the item sales rollup on order transitions."""
+    if not event.contains(session_factory, "before_flush", _before_flush):
+        event.listen(session_factory, "before_flush", _before_flush)
+        event.listen(session_factory, "after_flush_postexec", _after_flush_postexec)
+        event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+
+def rebuild_item_sales(start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    """
+    Recompute the rollup from the order lines, for a date range or for all
+    orders. Also reconciles item costs changed since the lines were counted
+    and changes made without the ORM. Returns the number of rollup rows written.
+    """
+    table = ItemSalesDaily.__table__
+    business_date = func.date(Order.created_at)
+    counted = and_(
+        Order.status.in_(COUNTED_STATUSES),
+        Order.payment_status != PaymentStatusEnum.REFUNDED
+    )
+    sales = select(
+        business_date,
+        Order.outlet_id,
+        OrderLine.item_id,
+        func.sum(OrderLine.quantity),
+        func.sum(OrderLine.line_total),
+        func.sum(OrderLine.quantity * func.coalesce(Item.cost, 0))
+    ).join(
+        Order, OrderLine.order_id == Order.id
+    ).join(
+        Item, OrderLine.item_id == Item.id
+    ).where(counted)
+    stale = delete(table)
+
+    if start_date is not None:
+        sales = sales.where(Order.created_at >= datetime.combine(start_date, datetime.min.time()))
+        stale = stale.where(table.c.business_date >= start_date)
+    if end_date is not None:
+        sales = sales.where(Order.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+        stale = stale.where(table.c.business_date <= end_date)
+    sales = sales.group_by(business_date, Order.outlet_id, OrderLine.item_id)
+
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            # Order transitions wait for the rebuild, so none is both counted here and applied as a delta
+            connection.execute(text(f"LOCK TABLE {table.name} IN EXCLUSIVE MODE"))
+        connection.execute(stale)
+        written = connection.execute(table.insert().from_select(
+            ["business_date", "outlet_id", "item_id", "quantity", "revenue", "cost"], sales
+        )).rowcount
+    logger.info(f"Item sales rollup rebuilt: {written} rows")
+    return written
+
+def top_items(db: Session, start_date: date, end_date: date, limit: int) -> List[tuple]:
+    """
+    Get the (item id, quantity, revenue) of the best selling items over a date
+    range, by quantity. One day is read in index order; longer ranges merge
+    the daily rows per item and keep the largest totals with a heap.
+    """
+    if start_date == end_date:
+        return [tuple(row) for row in db.query(
+            ItemSalesDaily.item_id,
+            ItemSalesDaily.quantity,
+            ItemSalesDaily.revenue
+        ).filter(
+            ItemSalesDaily.business_date == start_date,
+            ItemSalesDaily.quantity > 0
+        ).order_by(
+            ItemSalesDaily.quantity.desc()
+        ).limit(limit).all()]
+
+    totals: Dict[object, list] = defaultdict(lambda: [0, Decimal("0")])
+    for item_id, quantity, revenue in db.query(
+        ItemSalesDaily.item_id,
+        ItemSalesDaily.quantity,
+        ItemSalesDaily.revenue
+    ).filter(
+        ItemSalesDaily.business_date >= start_date,
+        ItemSalesDaily.business_date <= end_date,
+        ItemSalesDaily.quantity != 0
+    ):
+        total = totals[item_id]
+        total[0] += quantity
+        total[1] += revenue
+    best = heapq.nlargest(
+        limit,
+        ((quantity, revenue, item_id) for item_id, (quantity, revenue) in totals.items() if quantity > 0),
+        key=lambda entry: (entry[0], entry[1])
+    )
+    return [(item_id, quantity, revenue) for quantity, revenue, item_id in best]
+
+def main():
+    """Rebuild the item sales rollup from the command line."""
+    parser = argparse.ArgumentParser(description="Rebuild the daily item sales rollup from orders")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="First business date to rebuild (default: all)")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Last business date to rebuild (default: all)")
+    args = parser.parse_args()
+    print(f"{rebuild_item_sales(args.start_date, args.end_date)} rows written")
+
+if __name__ == "__main__":
+    main()
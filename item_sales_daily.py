@@ -0,0 +1,32 @@
+"""
+Hotel Management System - Item Sales Rollup Model
+Daily quantity, revenue and food cost sold per outlet and item.
+"""
+
+from sqlalchemy import Column, Date, DateTime, Integer, ForeignKey, Index, DECIMAL
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class ItemSalesDaily(Base):
+    """
+    Sales of one item at one outlet on one business day, counting served and
+    paid orders that were not refunded. Maintained on order transitions; rows
+    of reversed sales stay with a zero quantity until the next rebuild.
+    """
+    __tablename__ = "item_sales_daily"
+    __table_args__ = (
+        # Top sellers of a day are read in index order
+        Index("ix_item_sales_daily_date_quantity", "business_date", "quantity"),
+    )
+
+    business_date = Column(Date, primary_key=True)
+    outlet_id = Column(UUID(as_uuid=True), ForeignKey("outlets.id"), primary_key=True)
+    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(12, 2), nullable=False, default=0)
+    cost = Column(DECIMAL(12, 2), nullable=False, default=0)  # Quantity times the item cost when counted
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ItemSalesDaily(business_date='{self.business_date}', item_id='{self.item_id}', quantity={self.quantity})>"
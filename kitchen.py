@@ -0,0 +1,42 @@
+"""
+Hotel Management System - Kitchen Display Router
+Live order tickets for kitchen and service screens.
+"""
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from uuid import UUID
+from ..core.security import get_current_identity, AuthenticatedUser
+from ..services.kitchen_display import kitchen_display
+
+router = APIRouter(prefix="/kitchen", tags=["Kitchen Display"])
+
+@router.get("/{outlet_id}/tickets")
+async def get_open_tickets(outlet_id: UUID, current_user: AuthenticatedUser = Depends(get_current_identity)):
+    """
+    Get the open tickets (confirmed, preparing, ready) of an outlet, served from memory.
+    """
+    return kitchen_display.snapshot(str(outlet_id))
+
+@router.get("/{outlet_id}/stream")
+async def stream_orders(
+    outlet_id: UUID,
+    request: Request,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: AuthenticatedUser = Depends(get_current_identity)
+):
+    """
+    Stream order transitions of an outlet as Server-Sent Events.
+    A reconnecting screen receives only the `order` events it missed (from the
+    Last-Event-ID header or `last_event_id`) from the worker that issued the
+    id; otherwise it starts with a `snapshot` of the open tickets.
+    """
+    if last_event_id is None and last_event_id_header:
+        last_event_id = last_event_id_header.strip()
+    return StreamingResponse(
+        kitchen_display.stream(request, str(outlet_id), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,293 @@
+"""
+Hotel Management System - Kitchen Display Service
+Per-outlet stream of committed order transitions for kitchen and service screens.
+"""
+
+from fastapi import Request
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, selectinload
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.events import Broadcaster, RESYNC, CLOSED, format_sse, format_heartbeat
+from ..core.invalidation import invalidation_bus
+from ..models import Order, OrderLine, OrderStatusEnum
+import asyncio
+import itertools
+import logging
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "kitchen_display_pending"
+
+# Orders shown on kitchen screens; the others leave the board
+ACTIVE_STATUSES = {OrderStatusEnum.CONFIRMED, OrderStatusEnum.PREPARING, OrderStatusEnum.READY}
+
+def order_ticket(order: Order) -> dict:
+    """Build the kitchen ticket of an order: what to make, where and for whom."""
+    return {
+        "order_id": str(order.id),
+        "order_number": order.order_number,
+        "outlet_id": str(order.outlet_id),
+        "table_number": order.table_number,
+        "order_type": order.order_type.value if order.order_type else None,
+        "status": order.status.value if order.status else OrderStatusEnum.PENDING.value,
+        "notes": order.notes,
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+        "lines": [
+            {
+                "item_name": line.item.name if line.item else None,
+                "quantity": line.quantity,
+                "special_instructions": line.special_instructions
+            }
+            for line in order.order_lines
+        ]
+    }
+
+class OutletChannel(Broadcaster):
+    """Event log, open tickets and subscribers of one outlet."""
+
+    def __init__(self, outlet_id: str):
+        super().__init__(f"Kitchen display {outlet_id}")
+        self.events: deque = deque(maxlen=settings.kitchen_replay_size)
+        self.tickets: Dict[str, dict] = {}
+
+class KitchenDisplay:
+    """
+    Single in-process publisher for order transitions.
+    Every event gets an increasing id, tagged with this worker's epoch, and is
+    kept in a per-outlet replay buffer, so a screen reconnecting with
+    Last-Event-ID only receives what it missed. Open tickets are kept in
+    memory for screens that need a full board.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: Dict[str, OutletChannel] = {}
+        # Ids of other workers, or of this worker before a restart, carry another epoch
+        self.epoch = uuid.uuid4().hex[:12]
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach to the application event loop."""
+        self._loop = loop
+        with self._lock:
+            for channel in self._channels.values():
+                channel.bind(loop)
+
+    def channel(self, outlet_id: str) -> OutletChannel:
+        """Get (or create) the channel of an outlet."""
+        with self._lock:
+            channel = self._channels.get(outlet_id)
+            if channel is None:
+                channel = self._channels[outlet_id] = OutletChannel(outlet_id)
+                if self._loop is not None:
+                    channel.bind(self._loop)
+            return channel
+
+    def event_id(self, sequence: int) -> str:
+        """Format the SSE id of an event, e.g. 3f2a9c01b7d4-42."""
+        return f"{self.epoch}-{sequence}"
+
+    def sequence(self, event_id: str) -> Optional[int]:
+        """Get the sequence of an event id issued by this worker, or None."""
+        epoch, _, sequence = event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def _open_tickets(self, db: Session) -> List[dict]:
+        """Get the tickets of open orders created in the last day."""
+        orders = db.execute(
+            select(Order)
+            .where(Order.status.in_(ACTIVE_STATUSES), Order.created_at >= datetime.now() - timedelta(days=1))
+            .options(selectinload(Order.order_lines).selectinload(OrderLine.item))
+        ).scalars().all()
+        return [order_ticket(order) for order in orders]
+
+    def load(self, db: Session):
+        """Load open tickets of orders created in the last day."""
+        tickets = self._open_tickets(db)
+        for ticket in tickets:
+            self.channel(ticket["outlet_id"]).tickets[ticket["order_id"]] = ticket
+        logger.info(f"Kitchen display loaded with {len(tickets)} open tickets")
+
+    def refresh(self, session_factory=SessionLocal):
+        """
+        Reload the open tickets after another worker changed orders. Its
+        transitions have no event ids here, so connected screens resync.
+        """
+        db = session_factory()
+        try:
+            tickets = self._open_tickets(db)
+        finally:
+            db.close()
+        by_outlet: Dict[str, Dict[str, dict]] = {}
+        for ticket in tickets:
+            by_outlet.setdefault(ticket["outlet_id"], {})[ticket["order_id"]] = ticket
+        with self._lock:
+            outlet_ids = set(by_outlet) | set(self._channels)
+        for outlet_id in outlet_ids:
+            channel = self.channel(outlet_id)
+            with self._lock:
+                changed = channel.tickets != by_outlet.get(outlet_id, {})
+                channel.tickets = by_outlet.get(outlet_id, {})
+            if changed:
+                channel.publish(RESYNC)
+
+    def publish(self, ticket: dict, previous_status: Optional[str]):
+        """Record a committed order transition and fan it out to the outlet's screens."""
+        channel = self.channel(ticket["outlet_id"])
+        with self._lock:
+            sequence = next(self._ids)
+            payload = {**ticket, "previous_status": previous_status}
+            channel.events.append((sequence, payload))
+            if OrderStatusEnum(ticket["status"]) in ACTIVE_STATUSES:
+                channel.tickets[ticket["order_id"]] = ticket
+            else:
+                channel.tickets.pop(ticket["order_id"], None)
+        channel.publish((sequence, payload))
+
+    def snapshot(self, outlet_id: str) -> dict:
+        """Get the open tickets of an outlet with the id of the latest event."""
+        channel = self.channel(outlet_id)
+        with self._lock:
+            last_event_id = self.event_id(channel.events[-1][0]) if channel.events else None
+            tickets = sorted(channel.tickets.values(), key=lambda ticket: ticket["created_at"] or "")
+            return {"last_event_id": last_event_id, "tickets": [dict(ticket) for ticket in tickets]}
+
+    def replay(self, outlet_id: str, last_event_id: str) -> Optional[List[tuple]]:
+        """
+        Get the (sequence, payload) events after last_event_id, or None if it
+        was issued by another worker or its events are no longer buffered.
+        """
+        last_sequence = self.sequence(last_event_id)
+        if last_sequence is None:
+            return None
+        channel = self.channel(outlet_id)
+        with self._lock:
+            events = list(channel.events)
+        if not events or not events[0][0] - 1 <= last_sequence <= events[-1][0]:
+            return None
+        return [(sequence, payload) for sequence, payload in events if sequence > last_sequence]
+
+    async def stream(self, request: Request, outlet_id: str, last_event_id: Optional[str]):
+        """SSE body: missed events (or the open tickets), then live order events."""
+        channel = self.channel(outlet_id)
+        subscriber = channel.subscribe()
+        try:
+            missed = self.replay(outlet_id, last_event_id) if last_event_id is not None else None
+            if missed is None:
+                snapshot = self.snapshot(outlet_id)
+                position = self.sequence(snapshot["last_event_id"] or "") or 0
+                yield format_sse("snapshot", snapshot, snapshot["last_event_id"])
+            else:
+                position = self.sequence(last_event_id)
+                for sequence, payload in missed:
+                    position = sequence
+                    yield format_sse("order", payload, self.event_id(sequence))
+
+            while True:
+                item = await subscriber.next(settings.sse_heartbeat_interval)
+                if item is None:
+                    if await request.is_disconnected():
+                        break
+                    yield format_heartbeat()
+                elif item is CLOSED:
+                    break
+                elif item is RESYNC:
+                    snapshot = self.snapshot(outlet_id)
+                    position = self.sequence(snapshot["last_event_id"] or "") or 0
+                    yield format_sse("snapshot", snapshot, snapshot["last_event_id"])
+                elif item[0] > position:
+                    position = item[0]
+                    yield format_sse("order", item[1], self.event_id(item[0]))
+        finally:
+            channel.unsubscribe(subscriber)
+
+    def close(self):
+        """Tell every connected screen to end its stream."""
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            channel.close()
+
+kitchen_display = KitchenDisplay()
+
+def _before_flush(session: Session, flush_context, instances):
+    """Capture new orders and order status transitions before they are flushed."""
+    pending: Dict[uuid.UUID, list] = session.info.setdefault(_PENDING_KEY, {})
+    for order in session.new:
+        if isinstance(order, Order):
+            # Assign the primary key up front so the ticket can be loaded after commit
+            if order.id is None:
+                order.id = uuid.uuid4()
+            status = order.status or OrderStatusEnum.PENDING
+            pending.setdefault(order.id, [None, None])[1] = status.value
+    for order in session.dirty:
+        if not isinstance(order, Order):
+            continue
+        history = inspect(order).attrs.status.history
+        if history.deleted and history.has_changes():
+            # Keep the status from before the transaction across several flushes
+            previous = history.deleted[0]
+            transition = pending.setdefault(order.id, [previous.value if previous else None, None])
+            transition[1] = history.added[0].value if history.added and history.added[0] else None
+
+def _load_tickets(bind, order_ids: List[uuid.UUID]) -> List[Tuple[uuid.UUID, dict]]:
+    """Build the tickets of orders with their lines and items in one round trip each."""
+    with Session(bind=bind) as db:
+        orders = db.execute(
+            select(Order)
+            .where(Order.id.in_(order_ids))
+            .options(selectinload(Order.order_lines).selectinload(OrderLine.item))
+        ).scalars().all()
+        return [(order.id, order_ticket(order)) for order in orders]
+
+def _after_commit(session: Session):
+    """
+    Publish committed order transitions. The committed session cannot emit
+    SQL here, so the tickets are loaded with a separate session, once per
+    commit rather than on every flush.
+    """
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    changed = {
+        order_id: previous_status
+        for order_id, (previous_status, status) in pending.items()
+        if status != previous_status
+    }
+    if not changed:
+        return
+    try:
+        tickets = _load_tickets(session.get_bind(), list(changed))
+    except Exception as e:
+        logger.error(f"Could not load kitchen tickets of committed orders: {e}")
+        return
+    for order_id, ticket in tickets:
+        kitchen_display.publish(ticket, changed[order_id])
+
+def _after_soft_rollback(session: Session, previous_transaction):
+    """Discard order transitions of rolled back transactions."""
+    session.info.pop(_PENDING_KEY, None)
+
+def start_kitchen_display(loop: asyncio.AbstractEventLoop, session_factory=SessionLocal):
+    """Load open tickets, bind to the event loop and start listening to commits."""
+    db = session_factory()
+    try:
+        kitchen_display.load(db)
+    finally:
+        db.close()
+    kitchen_display.bind(loop)
+    if not event.contains(session_factory, "before_flush", _before_flush):
+        event.listen(session_factory, "before_flush", _before_flush)
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+        # Orders changed by other workers
+        invalidation_bus.register(Order.__tablename__, lambda table_name: kitchen_display.refresh(session_factory), local=False)
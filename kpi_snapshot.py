@@ -0,0 +1,104 @@
+"""
+Hotel Management System - Analytics Snapshot
+Analytics precomputed by one worker per host and served to all workers from shared memory.
+"""
+
+from fastapi import Response
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from ..core.config import settings
+from ..core.database import open_analytics_session
+from ..core.invalidation import invalidation_bus
+from ..core.shared_snapshot import SharedSnapshot, SnapshotRefresher
+from ..models import Payment, Order, OrderLine, Item, Outlet, Room, Reservation, Guest
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Tables read by the precomputed analytics; a committed change to any of them triggers a refresh
+KPI_TABLES = [
+    model.__tablename__ for model in (Payment, Order, OrderLine, Item, Outlet, Room, Reservation, Guest)
+]
+
+kpi_snapshot = SharedSnapshot(settings.kpi_snapshot_path, settings.kpi_snapshot_size)
+
+# (payload, endpoint name -> response body) of the last snapshot read by this worker
+_sections: Tuple[Optional[bytes], Dict[str, bytes]] = (None, {})
+
+def compute_kpi_payload() -> bytes:
+    """Compute the configured analytics as one JSON document of response bodies by endpoint name."""
+    # Imported here: the analytics queries live with the endpoints, which import this module
+    from ..routers.analytics import compute_analytics_snapshot
+    db = open_analytics_session()
+    try:
+        sections = asyncio.run(compute_analytics_snapshot(db, settings.kpi_snapshot_endpoints))
+    finally:
+        db.close()
+    return json.dumps({name: result.model_dump(mode="json") for name, result in sections.items()}).encode()
+
+kpi_refresher = SnapshotRefresher(
+    kpi_snapshot, compute_kpi_payload, "Analytics",
+    interval=settings.kpi_refresh_interval,
+    min_interval=settings.kpi_min_refresh_interval
+)
+
+def read_snapshot_section(name: str) -> Optional[bytes]:
+    """
+    Get the precomputed response body of an endpoint, or None if it is not
+    precomputed or the snapshot is older than the staleness bound.
+    """
+    global _sections
+    payload, written_at = kpi_snapshot.read()
+    if payload is None or time.time() - written_at > settings.kpi_snapshot_max_age:
+        return None
+    # The snapshot returns the same bytes object until it changes, so each change is decoded once
+    read_payload, sections = _sections
+    if payload is not read_payload:
+        sections = {key: json.dumps(value).encode() for key, value in json.loads(payload).items()}
+        _sections = (payload, sections)
+    return sections.get(name)
+
+def serve_snapshot(name: str):
+    """
+    Decorate an analytics endpoint to answer from the snapshot while it is
+    fresh; otherwise the endpoint computes the response, stamped with as_of.
+    The snapshot holds the default response, so requests with other
+    parameters are always computed.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            defaults = all(
+                value == signature.parameters[parameter].default
+                for parameter, value in bound.arguments.items() if parameter not in ("db", "current_user")
+            )
+            body = read_snapshot_section(name) if defaults else None
+            if body is not None:
+                return Response(content=body, media_type="application/json")
+            result = await endpoint(*args, **kwargs)
+            # Coalesced callers share the result, so only the first one stamps it
+            if result.as_of is None:
+                result.as_of = datetime.now(timezone.utc)
+            return result
+        return wrapper
+    return decorator
+
+# Only wakes the refresher thread, which does nothing in workers that are not the refresher
+for _table_name in KPI_TABLES:
+    invalidation_bus.register(_table_name, lambda table_name: kpi_refresher.trigger())
+
+def start_kpi_snapshot():
+    """Compete for the refresher role; the refresher publishes a first snapshot right away."""
+    kpi_refresher.start()
+
+def stop_kpi_snapshot():
+    """Give up the refresher role, so another worker can take over."""
+    kpi_refresher.stop()
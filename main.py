@@ -3,19 +3,33 @@ Hotel Management System - Main FastAPI Application
 Entry point for the hotel management system backend API.
 """
 
+# Imported first so the startup timer covers the whole import chain
+from .core.startup import startup_timer
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 
 # Import core modules
 from .core.config import settings
-from .core.database import create_tables, test_connection
+from .core.database import create_tables, test_connection, verify_schema_revision, SessionLocal, AnalyticsSessionLocal
+from .core.audit import audit_writer, install_audit_hooks
+from .core.partitions import maintain_partitions
+from .core.invalidation import invalidation_bus, start_invalidation
+from .core.rate_limit import RateLimitMiddleware, rate_limiter, pool_wait_monitor
+from .core.idempotency import IdempotencyMiddleware
+from .services.room_board import room_board, start_room_board
+from .services.kitchen_display import kitchen_display, start_kitchen_display
+from .services.guest_search import start_guest_search
+from .services.item_sales import start_item_sales
+from .services.kpi_snapshot import start_kpi_snapshot, stop_kpi_snapshot
 
 # Import routers
-from .routers import auth, analytics
+from .routers import auth, analytics, exports, guests, reservations, rooms, kitchen, orders, payments, audit_logs
 
 # Configure logging
 logging.basicConfig(
@@ -33,27 +47,76 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Hotel Management System API...")
     
-    # Test database connection
-    if test_connection():
-        logger.info("Database connection successful")
+    if settings.schema_mode == "verify":
+        # Migrations run before deploying; checking the revision also proves the database is reachable
+        with startup_timer.phase("schema"):
+            verify_schema_revision()
     else:
-        logger.error("Database connection failed")
-        raise Exception("Cannot connect to database")
+        # Test database connection
+        with startup_timer.phase("connection"):
+            if test_connection():
+                logger.info("Database connection successful")
+            else:
+                logger.error("Database connection failed")
+                raise Exception("Cannot connect to database")
+        
+        # Create database tables
+        with startup_timer.phase("schema"):
+            try:
+                create_tables()
+                logger.info("Database tables created/verified")
+            except Exception as e:
+                logger.error(f"Error creating database tables: {e}")
+                raise
+        
+        # Make sure partitions exist for incoming rows; in production cron pre-creates them
+        with startup_timer.phase("partitions"):
+            maintain_partitions(archive=False)
+    
+    # Connection waits feed load shedding in the rate limiter
+    pool_wait_monitor.install(SessionLocal)
+    pool_wait_monitor.install(AnalyticsSessionLocal)
+    
+    # In-memory guest search index where pg_trgm is not available
+    with startup_timer.phase("guest_search"):
+        start_guest_search()
+    
+    # Start audit logging
+    if settings.audit_enabled:
+        with startup_timer.phase("audit"):
+            install_audit_hooks()
+            audit_writer.start()
+    
+    # Live room status board for front desk screens and order tickets for kitchen screens
+    with startup_timer.phase("live_streams"):
+        start_room_board(asyncio.get_running_loop())
+        start_kitchen_display(asyncio.get_running_loop())
     
-    # Create database tables
-    try:
-        create_tables()
-        logger.info("Database tables created/verified")
-    except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
-        raise
+    # Daily item sales rollup, updated with the order transitions
+    with startup_timer.phase("item_sales"):
+        start_item_sales()
     
+    # Keep in-process caches current with changes committed by other workers
+    with startup_timer.phase("invalidation"):
+        start_invalidation()
+    
+    # One worker per host refreshes the dashboard KPI snapshot the others serve
+    with startup_timer.phase("kpi_snapshot"):
+        start_kpi_snapshot()
+    
+    startup_timer.finish()
     logger.info("Hotel Management System API started successfully")
+    logger.info(startup_timer.summary())
     
     yield
     
     # Shutdown
     logger.info("Shutting down Hotel Management System API...")
+    stop_kpi_snapshot()
+    invalidation_bus.stop()
+    room_board.close()
+    kitchen_display.close()
+    audit_writer.stop()
 
 # Create FastAPI application
 app = FastAPI(
@@ -65,6 +128,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Replay responses of retried writes; inside the rate limiter, so shed requests are never stored
+app.add_middleware(IdempotencyMiddleware)
+
+# Per-user rate limits and load shedding; added before CORS so CORS headers wrap its responses
+app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -105,7 +174,10 @@ async def health_check():
         "status": "healthy",
         "app_name": settings.app_name,
         "version": settings.app_version,
-        "timestamp": time.time()
+        "timestamp": time.time(),
+        "startup": startup_timer.report(),
+        "admission": rate_limiter.stats(),
+        "analytics_coalescing": analytics.analytics_flight.stats()
     }
 
 # Root endpoint
@@ -123,6 +195,17 @@ async def root():
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(exports.router, prefix="/api/v1")
+app.include_router(guests.router, prefix="/api/v1")
+app.include_router(reservations.router, prefix="/api/v1")
+app.include_router(rooms.router, prefix="/api/v1")
+app.include_router(kitchen.router, prefix="/api/v1")
+app.include_router(orders.router, prefix="/api/v1")
+app.include_router(payments.router, prefix="/api/v1")
+app.include_router(audit_logs.router, prefix="/api/v1")
+
+# Module imports and application setup
+startup_timer.mark("imports")
 
 # API information
 @app.get("/api/v1/info")
@@ -134,6 +217,14 @@ async def api_info():
         "endpoints": {
             "authentication": "/api/v1/auth",
             "analytics": "/api/v1/analytics",
+            "exports": "/api/v1/exports",
+            "guests": "/api/v1/guests",
+            "reservations": "/api/v1/reservations",
+            "rooms": "/api/v1/rooms",
+            "kitchen": "/api/v1/kitchen",
+            "orders": "/api/v1/orders",
+            "payments": "/api/v1/payments",
+            "audit_logs": "/api/v1/audit-logs",
             "health": "/health",
             "docs": "/docs"
         },
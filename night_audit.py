@@ -0,0 +1,255 @@
+"""
+Hotel Management System - Night Audit Service
+End-of-day process: posts nightly room charges, marks no-shows and rolls the business date.
+"""
+
+from sqlalchemy import select, insert, update, exists, func, literal, cast, text, and_, Numeric
+from sqlalchemy.engine import Connection
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+from ..core.audit import write_bulk_audit
+from ..core.database import engine
+from ..core.invalidation import invalidation_bus
+from ..models import (
+    Reservation, ReservationStatusEnum, Payment, PaymentTypeEnum,
+    PaymentMethodEnumPayment, PaymentStatusEnumPayment,
+    NightAuditRun, NightAuditStatusEnum, NightAuditStepEnum
+)
+import argparse
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Reservations handled per transaction
+CHUNK_SIZE = 1000
+
+# Advisory lock key so only one night audit runs at a time (Postgres)
+NIGHT_AUDIT_LOCK_KEY = 7041
+
+reservations = Reservation.__table__
+payments = Payment.__table__
+runs = NightAuditRun.__table__
+
+def room_charge_reference(business_date: date) -> str:
+    """Transaction reference of the nightly room charges of a business date."""
+    return f"NIGHT-AUDIT-{business_date.isoformat()}"
+
+def _new_uuid(dialect_name: str):
+    """SQL expression generating a new UUID per row."""
+    if dialect_name == "postgresql":
+        return func.gen_random_uuid()
+    return func.lower(func.hex(func.randomblob(16)))
+
+def _nights(dialect_name: str):
+    """SQL expression for the number of nights of a reservation."""
+    if dialect_name == "postgresql":
+        return reservations.c.checkout_date - reservations.c.checkin_date
+    return func.julianday(reservations.c.checkout_date) - func.julianday(reservations.c.checkin_date)
+
+def _ensure_enum_values():
+    """Add enum labels introduced for the night audit to existing Postgres enum types."""
+    if engine.dialect.name != "postgresql":
+        return
+    # ALTER TYPE ... ADD VALUE must run outside a transaction block. Both PaymentMethodEnum
+    # classes (orders and payments) map to the one paymentmethodenum type, which has every label
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ALTER TYPE reservationstatusenum ADD VALUE IF NOT EXISTS 'NO_SHOW'"))
+        connection.execute(text("ALTER TYPE paymentmethodenum ADD VALUE IF NOT EXISTS 'ROOM_CHARGE'"))
+
+def current_business_date(connection: Connection) -> date:
+    """Get the open business date: the day after the last completed audit, or yesterday."""
+    last_completed = connection.execute(
+        select(func.max(runs.c.business_date)).where(runs.c.status == NightAuditStatusEnum.COMPLETED)
+    ).scalar()
+    if last_completed is None:
+        return date.today() - timedelta(days=1)
+    if isinstance(last_completed, str):
+        last_completed = date.fromisoformat(last_completed)
+    return last_completed + timedelta(days=1)
+
+def _start_run(business_date: date) -> dict:
+    """Get the run log row of a business date, creating it if needed."""
+    with engine.begin() as connection:
+        run = connection.execute(select(runs).where(runs.c.business_date == business_date)).mappings().first()
+        if run is None:
+            connection.execute(insert(runs).values(
+                id=uuid.uuid4(),
+                business_date=business_date,
+                status=NightAuditStatusEnum.RUNNING,
+                step=NightAuditStepEnum.ROOM_CHARGES,
+                room_charges_posted=0,
+                no_shows_marked=0
+            ))
+            run = connection.execute(select(runs).where(runs.c.business_date == business_date)).mappings().first()
+        elif run["status"] == NightAuditStatusEnum.RUNNING:
+            logger.info(f"Resuming night audit for {business_date} at step {run['step'].value}")
+        return dict(run)
+
+def _next_chunk(connection: Connection, condition, last_id) -> list:
+    """Get the next chunk of reservation ids matching a condition, in id order."""
+    statement = select(reservations.c.id).where(condition)
+    if last_id is not None:
+        statement = statement.where(reservations.c.id > last_id)
+    return connection.execute(statement.order_by(reservations.c.id).limit(CHUNK_SIZE)).scalars().all()
+
+def _post_room_charges(run: dict, business_date: date):
+    """Post one nightly room charge per in-house reservation, chunk by chunk."""
+    dialect_name = engine.dialect.name
+    reference = room_charge_reference(business_date)
+    charge_time = datetime.combine(business_date, time(23, 59, 59))
+    day_start = datetime.combine(business_date, time.min)
+    in_house = and_(
+        reservations.c.status == ReservationStatusEnum.CHECKED_IN,
+        reservations.c.checkin_date <= business_date,
+        reservations.c.checkout_date > business_date
+    )
+    nightly_rate = func.round(cast(reservations.c.total_amount, Numeric(10, 2)) / _nights(dialect_name), 2)
+    already_posted = exists().where(
+        payments.c.reservation_id == reservations.c.id,
+        payments.c.transaction_id == reference,
+        payments.c.created_at >= day_start,
+        payments.c.created_at <= charge_time
+    )
+
+    last_id = run["last_processed_id"]
+    while True:
+        # One bounded transaction per chunk; the run log advances with the data
+        with engine.begin() as connection:
+            chunk = _next_chunk(connection, in_house, last_id)
+            if not chunk:
+                connection.execute(update(runs).where(runs.c.id == run["id"]).values(
+                    step=NightAuditStepEnum.NO_SHOWS, last_processed_id=None
+                ))
+                return
+            posted = connection.execute(insert(payments).from_select(
+                ["id", "reservation_id", "amount", "payment_method", "payment_type",
+                 "transaction_id", "status", "created_at"],
+                select(
+                    _new_uuid(dialect_name),
+                    reservations.c.id,
+                    nightly_rate,
+                    literal(PaymentMethodEnumPayment.ROOM_CHARGE, payments.c.payment_method.type),
+                    literal(PaymentTypeEnum.ROOM_CHARGE, payments.c.payment_type.type),
+                    literal(reference),
+                    literal(PaymentStatusEnumPayment.COMPLETED, payments.c.status.type),
+                    literal(charge_time, payments.c.created_at.type)
+                ).where(reservations.c.id.in_(chunk), in_house, ~already_posted)
+            ).returning(payments.c.id, payments.c.reservation_id, payments.c.amount)).all()
+            if posted:
+                invalidation_bus.publish(connection, [payments.name])
+                write_bulk_audit(connection, payments.name, "INSERT", [
+                    (payment_id, None, {
+                        "reservation_id": reservation_id,
+                        "amount": amount,
+                        "payment_method": PaymentMethodEnumPayment.ROOM_CHARGE,
+                        "payment_type": PaymentTypeEnum.ROOM_CHARGE,
+                        "transaction_id": reference,
+                        "status": PaymentStatusEnumPayment.COMPLETED
+                    })
+                    for payment_id, reservation_id, amount in posted
+                ])
+            last_id = chunk[-1]
+            connection.execute(update(runs).where(runs.c.id == run["id"]).values(
+                last_processed_id=last_id,
+                room_charges_posted=runs.c.room_charges_posted + len(posted)
+            ))
+
+def _mark_no_shows(run: dict, business_date: date):
+    """Mark confirmed reservations due on or before the business date as no-shows."""
+    overdue = and_(
+        reservations.c.status == ReservationStatusEnum.CONFIRMED,
+        reservations.c.checkin_date <= business_date,
+        reservations.c.actual_checkin.is_(None)
+    )
+
+    last_id = run["last_processed_id"]
+    while True:
+        with engine.begin() as connection:
+            chunk = _next_chunk(connection, overdue, last_id)
+            if not chunk:
+                connection.execute(update(runs).where(runs.c.id == run["id"]).values(
+                    step=NightAuditStepEnum.DONE, last_processed_id=None
+                ))
+                return
+            marked = connection.execute(
+                update(reservations)
+                .where(reservations.c.id.in_(chunk), overdue)
+                .values(status=ReservationStatusEnum.NO_SHOW, updated_at=func.now())
+                .returning(reservations.c.id)
+            ).scalars().all()
+            if marked:
+                invalidation_bus.publish(connection, [reservations.name])
+                write_bulk_audit(connection, reservations.name, "UPDATE", [
+                    (reservation_id, {"status": ReservationStatusEnum.CONFIRMED}, {"status": ReservationStatusEnum.NO_SHOW})
+                    for reservation_id in marked
+                ])
+            last_id = chunk[-1]
+            connection.execute(update(runs).where(runs.c.id == run["id"]).values(
+                last_processed_id=last_id,
+                no_shows_marked=runs.c.no_shows_marked + len(marked)
+            ))
+
+def _complete_run(run: dict):
+    """Close the business date, which rolls the open business date forward."""
+    with engine.begin() as connection:
+        connection.execute(update(runs).where(runs.c.id == run["id"]).values(
+            status=NightAuditStatusEnum.COMPLETED,
+            step=NightAuditStepEnum.DONE,
+            completed_at=datetime.now(timezone.utc)
+        ))
+
+def run_business_date(business_date: date) -> dict:
+    """Run (or resume) the night audit of one business date. Safe to re-run."""
+    run = _start_run(business_date)
+    if run["status"] == NightAuditStatusEnum.COMPLETED:
+        logger.info(f"Night audit for {business_date} already completed")
+        return run
+
+    if run["step"] == NightAuditStepEnum.ROOM_CHARGES:
+        _post_room_charges(run, business_date)
+        run["step"], run["last_processed_id"] = NightAuditStepEnum.NO_SHOWS, None
+    if run["step"] == NightAuditStepEnum.NO_SHOWS:
+        _mark_no_shows(run, business_date)
+    _complete_run(run)
+
+    with engine.connect() as connection:
+        run = dict(connection.execute(select(runs).where(runs.c.id == run["id"])).mappings().first())
+    logger.info(
+        f"Night audit for {business_date} completed: {run['room_charges_posted']} room charges posted, "
+        f"{run['no_shows_marked']} no-shows marked"
+    )
+    return run
+
+def run_night_audit(until: Optional[date] = None) -> List[dict]:
+    """Close every open business date up to and including `until` (default: yesterday)."""
+    until = until or date.today() - timedelta(days=1)
+    _ensure_enum_values()
+
+    # Session-level lock on an autocommit connection, so no transaction stays open for the whole run
+    lock_connection = (
+        engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        if engine.dialect.name == "postgresql" else None
+    )
+    try:
+        if lock_connection is not None:
+            if not lock_connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": NIGHT_AUDIT_LOCK_KEY}).scalar():
+                raise RuntimeError("Another night audit is already running")
+
+        completed = []
+        with engine.connect() as connection:
+            business_date = current_business_date(connection)
+        while business_date <= until:
+            completed.append(run_business_date(business_date))
+            business_date += timedelta(days=1)
+        return completed
+    finally:
+        if lock_connection is not None:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": NIGHT_AUDIT_LOCK_KEY})
+            lock_connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the night audit for all open business dates")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last business date to close (default: yesterday)")
+    args = parser.parse_args()
+    run_night_audit(args.until)
@@ -0,0 +1,40 @@
+"""
+Hotel Management System - Night Audit Run Model
+Run log of the end-of-day process; the latest completed run defines the business date.
+"""
+
+from sqlalchemy import Column, Date, DateTime, Integer, Enum
+from sqlalchemy.dialects.postgresql import UUID
+from .base import BaseModel
+import enum
+
+class NightAuditStatusEnum(str, enum.Enum):
+    """Night audit run status enumeration."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+class NightAuditStepEnum(str, enum.Enum):
+    """Night audit step enumeration, in execution order."""
+    ROOM_CHARGES = "room_charges"
+    NO_SHOWS = "no_shows"
+    DONE = "done"
+
+class NightAuditRun(BaseModel):
+    """Night audit run log for one business date."""
+    __tablename__ = "night_audit_runs"
+    
+    business_date = Column(Date, unique=True, nullable=False, index=True)
+    status = Column(Enum(NightAuditStatusEnum), default=NightAuditStatusEnum.RUNNING, nullable=False)
+    step = Column(Enum(NightAuditStepEnum), default=NightAuditStepEnum.ROOM_CHARGES, nullable=False)
+    last_processed_id = Column(UUID(as_uuid=True))  # Keyset position within the current step
+    room_charges_posted = Column(Integer, default=0, nullable=False)
+    no_shows_marked = Column(Integer, default=0, nullable=False)
+    completed_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<NightAuditRun(business_date='{self.business_date}', status='{self.status}', step='{self.step}')>"
+    
+    @property
+    def is_completed(self) -> bool:
+        """Check if the night audit for this business date is completed."""
+        return self.status == NightAuditStatusEnum.COMPLETED
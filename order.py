@@ -3,10 +3,11 @@ Hotel Management System - Order Models
 Handles F&B orders, order lines, and transaction processing.
 """
 
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, Enum, DECIMAL
+from sqlalchemy import Table, Column, String, Integer, Text, ForeignKey, Enum, DECIMAL, Index, event, inspect, update
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from .base import BaseModel
+from .base import PartitionedModel
+from ..core.database import Base
 import enum
 from datetime import datetime
 
@@ -40,11 +41,16 @@ class PaymentStatusEnum(str, enum.Enum):
     PAID = "paid"
     REFUNDED = "refunded"
 
-class Order(BaseModel):
+class Order(PartitionedModel):
     """Order model for F&B transactions."""
     __tablename__ = "orders"
+    __table_args__ = (
+        # Keyset pagination order; the primary key leads with id so it cannot serve it
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
-    order_number = Column(String(20), unique=True, nullable=False, index=True)
+    order_number = Column(String(20), nullable=False, index=True)
     outlet_id = Column(UUID(as_uuid=True), ForeignKey("outlets.id"), nullable=False)
     guest_id = Column(UUID(as_uuid=True), ForeignKey("guests.id"))  # NULL if walk-in customer
     reservation_id = Column(UUID(as_uuid=True), ForeignKey("reservations.id"))  # Link to guest stay if applicable
@@ -66,8 +72,11 @@ class Order(BaseModel):
     guest = relationship("Guest", back_populates="orders")
     reservation = relationship("Reservation", back_populates="orders")
     created_by_user = relationship("User", back_populates="created_orders")
-    order_lines = relationship("OrderLine", back_populates="order", cascade="all, delete-orphan")
-    payments = relationship("Payment", back_populates="order")
+    order_lines = relationship(
+        "OrderLine", back_populates="order", cascade="all, delete-orphan",
+        primaryjoin="Order.id == foreign(OrderLine.order_id)"
+    )
+    payments = relationship("Payment", back_populates="order", primaryjoin="Order.id == foreign(Payment.order_id)")
     
     def __repr__(self):
         return f"<Order(order_number='{self.order_number}', total={self.total_amount}, status='{self.status}')>"
@@ -197,11 +206,32 @@ class Order(BaseModel):
             "created_at": self.created_at.isoformat()
         }
 
-class OrderLine(BaseModel):
+# A unique key on the partitioned orders table would have to include created_at, so
+# order numbers are made unique in this plain table, written in the same flush
+order_numbers = Table(
+    "order_numbers", Base.metadata,
+    Column("order_number", String(20), primary_key=True),
+    Column("order_id", UUID(as_uuid=True), nullable=False, index=True)
+)
+
+@event.listens_for(Order, "after_insert")
+def register_order_number(mapper, connection, order):
+    """Reserve the number of a new order; a duplicate fails the flush with an IntegrityError."""
+    connection.execute(order_numbers.insert().values(order_number=order.order_number, order_id=order.id))
+
+@event.listens_for(Order, "after_update")
+def rename_order_number(mapper, connection, order):
+    """Move the reservation when an order is renumbered."""
+    if inspect(order).attrs.order_number.history.has_changes():
+        connection.execute(
+            update(order_numbers).where(order_numbers.c.order_id == order.id).values(order_number=order.order_number)
+        )
+
+class OrderLine(PartitionedModel):
     """Order line model for individual items in an order."""
     __tablename__ = "order_lines"
     
-    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    order_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # No FK: orders is partitioned
     item_id = Column(UUID(as_uuid=True), ForeignKey("items.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(DECIMAL(8, 2), nullable=False)
@@ -209,7 +239,7 @@ class OrderLine(BaseModel):
     special_instructions = Column(Text)
     
     # Relationships
-    order = relationship("Order", back_populates="order_lines")
+    order = relationship("Order", back_populates="order_lines", primaryjoin="foreign(OrderLine.order_id) == Order.id")
     item = relationship("Item", back_populates="order_lines")
     
     def __repr__(self):
@@ -0,0 +1,44 @@
+"""
+Hotel Management System - Orders Router
+Handles F&B order listings.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from ..core.database import get_db
+from ..core.fieldsets import parse_fields, load_options, fieldset_page
+from ..core.pagination import paginate
+from ..core.security import get_current_user
+from ..models.order import Order, OrderStatusEnum
+from ..models.user import User
+from ..schemas.fnb import OrderResponse
+from ..schemas.pagination import CursorPage
+
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+@router.get("", response_model=CursorPage[OrderResponse])
+async def list_orders(
+    outlet_id: Optional[UUID] = None,
+    status: Optional[OrderStatusEnum] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List orders with their lines, newest first, one page at a time.
+    `fields` limits the response to the listed fields; nested fields use dots,
+    e.g. `order_number,status,total_amount,order_lines.quantity,order_lines.item.name`.
+    """
+    fieldset = parse_fields(fields, OrderResponse)
+    statement = select(Order).options(*load_options(Order, OrderResponse, fieldset))
+    if outlet_id:
+        statement = statement.where(Order.outlet_id == outlet_id)
+    if status:
+        statement = statement.where(Order.status == status)
+    orders, next_cursor = paginate(db, statement, Order, cursor, limit)
+    return fieldset_page(OrderResponse, fieldset, orders, next_cursor, limit)
@@ -0,0 +1,18 @@
+"""
+Hotel Management System - Pagination Schemas
+Pydantic models for cursor-paginated list responses.
+"""
+
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    One page of a list endpoint. Pass `next_cursor` back as `cursor` to get
+    the following page; it is null on the last page.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
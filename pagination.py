@@ -0,0 +1,68 @@
+"""
+Hotel Management System - Keyset Pagination
+Opaque (created_at, id) cursors for stable, constant-cost paging through large tables.
+"""
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_, literal, and_
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional, Tuple
+import base64
+import json
+import uuid
+
+def encode_cursor(created_at: datetime, record_id) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe token."""
+    payload = json.dumps([created_at.isoformat(), str(record_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor token back into a (created_at, id) position."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), uuid.UUID(record_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def after_cursor(created_at_column, id_column, token: str, descending: bool = False):
+    """Filter expression selecting rows strictly after a cursor in (created_at, id) order."""
+    created_at, record_id = decode_cursor(token)
+    position = tuple_(
+        literal(created_at, created_at_column.type),
+        literal(record_id, id_column.type)
+    )
+    if descending:
+        # The plain created_at bound is redundant but lets Postgres prune partitions
+        return and_(
+            created_at_column <= literal(created_at, created_at_column.type),
+            tuple_(created_at_column, id_column) < position
+        )
+    return and_(
+        created_at_column >= literal(created_at, created_at_column.type),
+        tuple_(created_at_column, id_column) > position
+    )
+
+def paginate(db: Session, statement, model, cursor: Optional[str], limit: int,
+             descending: bool = True) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of a select on a model with a created_at/id keyset, newest
+    first by default. Returns the rows and the cursor of the next page, or
+    None on the last page.
+    """
+    if cursor:
+        statement = statement.where(after_cursor(model.created_at, model.id, cursor, descending))
+    if descending:
+        statement = statement.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        statement = statement.order_by(model.created_at, model.id)
+    # One extra row tells whether another page follows without a COUNT
+    rows = db.execute(statement.limit(limit + 1)).scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
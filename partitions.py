@@ -0,0 +1,228 @@
+"""
+Hotel Management System - Partition Management
+Maintains monthly range partitions for append-only tables and archives expired ones.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from datetime import date
+from typing import List, Optional
+from .config import settings
+from .database import Base, engine
+import gzip
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+_ARCHIVE_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})\.csv\.gz$")
+
+def month_start(day: date) -> date:
+    """Get the first day of the month containing a date."""
+    return day.replace(day=1)
+
+def add_months(month: date, months: int) -> date:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table_name: str, month: date) -> str:
+    """Get the partition name of a table for a month, e.g. payments_p2024_01."""
+    return f"{table_name}_p{month.year:04d}_{month.month:02d}"
+
+def partitioned_tables() -> list:
+    """Get the tables declared with postgresql_partition_by, parents before children."""
+    from .. import models  # noqa: F401 - registers all tables on Base.metadata
+    return [
+        table for table in Base.metadata.sorted_tables
+        if table.dialect_options["postgresql"].get("partition_by")
+    ]
+
+def list_partitions(connection: Connection, table_name: str) -> List[tuple]:
+    """List (partition_name, month) pairs attached to a partitioned table."""
+    rows = connection.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table_name
+    """), {"table_name": table_name}).scalars()
+    partitions = []
+    for name in rows:
+        match = _PARTITION_SUFFIX.search(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+def create_partition(connection: Connection, table_name: str, month: date):
+    """Create the partition of a table for a month if it does not exist."""
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, month)} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+
+def ensure_partitions(connection: Connection, months_ahead: int, first_month: Optional[date] = None):
+    """Create partitions from first_month (default: this month) through months_ahead."""
+    current = month_start(date.today())
+    start = month_start(first_month) if first_month else current
+    end = add_months(current, months_ahead)
+    for table in partitioned_tables():
+        month = start
+        while month <= end:
+            create_partition(connection, table.name, month)
+            month = add_months(month, 1)
+
+def _archive_partition(table_name: str, name: str, archive_dir: str) -> str:
+    """
+    Copy a partition to a gzipped CSV file, then detach and drop it, in one
+    transaction: if the copy or the file write fails, the partition stays
+    attached and is archived on the next run. Archived orders also release
+    their order numbers.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    archive_path = os.path.join(archive_dir, f"{name}.csv.gz")
+
+    # COPY through the raw DBAPI cursor so rows stream straight into the file
+    raw_connection = engine.raw_connection()
+    try:
+        with raw_connection.cursor() as cursor:
+            # No writes may land in the partition between the copy and the drop
+            cursor.execute(f"LOCK TABLE {name} IN SHARE MODE")
+            with open(archive_path, "wb") as archive_file:
+                with gzip.GzipFile(fileobj=archive_file, mode="wb") as gzip_file:
+                    cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", gzip_file)
+                archive_file.flush()
+                os.fsync(archive_file.fileno())
+            if table_name == "orders":
+                cursor.execute(f"DELETE FROM order_numbers WHERE order_id IN (SELECT id FROM {name})")
+                logger.info(f"Released {cursor.rowcount} order numbers of partition {name}")
+            cursor.execute(f"ALTER TABLE {table_name} DETACH PARTITION {name}")
+            cursor.execute(f"DROP TABLE {name}")
+        raw_connection.commit()
+    except Exception:
+        raw_connection.rollback()
+        raise
+    finally:
+        raw_connection.close()
+
+    return archive_path
+
+def archive_partitions(retention_months: int, archive_dir: str) -> List[str]:
+    """Archive and drop partitions older than the retention window."""
+    cutoff = add_months(month_start(date.today()), -retention_months)
+    archived = []
+    for table in partitioned_tables():
+        with engine.connect() as connection:
+            expired = [name for name, month in list_partitions(connection, table.name) if month < cutoff]
+        for name in expired:
+            archive_path = _archive_partition(table.name, name, archive_dir)
+            logger.info(f"Archived partition {name} to {archive_path}")
+            archived.append(archive_path)
+    return archived
+
+def prune_archives(archive_dir: str, retention_months: Optional[int]) -> List[str]:
+    """
+    Delete archive files of partitions older than the archive retention
+    window; without one, archives are kept and only their total is logged.
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+    cutoff = add_months(month_start(date.today()), -retention_months) if retention_months is not None else None
+    deleted, kept, kept_bytes = [], 0, 0
+    for file_name in sorted(os.listdir(archive_dir)):
+        match = _ARCHIVE_SUFFIX.search(file_name)
+        if not match:
+            continue
+        archive_path = os.path.join(archive_dir, file_name)
+        if cutoff is not None and date(int(match.group(1)), int(match.group(2)), 1) < cutoff:
+            os.remove(archive_path)
+            logger.info(f"Deleted partition archive {archive_path}")
+            deleted.append(archive_path)
+        else:
+            kept += 1
+            kept_bytes += os.path.getsize(archive_path)
+    logger.info(f"Keeping {kept} partition archives ({kept_bytes / 1024 / 1024:.1f} MB) in {archive_dir}")
+    return deleted
+
+def _legacy_tables(connection: Connection) -> list:
+    """Get partitioned tables that still exist as plain (unpartitioned) tables."""
+    relkinds = dict(connection.execute(text(
+        "SELECT relname, relkind FROM pg_class WHERE relname = ANY(:names) AND relkind IN ('r', 'p')"
+    ), {"names": [table.name for table in partitioned_tables()]}).all())
+    return [table for table in partitioned_tables() if relkinds.get(table.name) == "r"]
+
+def convert_to_partitioned(months_ahead: int):
+    """
+    Migrate existing plain tables to the partitioned layout in one transaction.
+    Each table is renamed to <name>_legacy, recreated as a partitioned table,
+    partitions covering its history are created and the rows are copied over.
+    """
+    with engine.begin() as connection:
+        tables = _legacy_tables(connection)
+        if not tables:
+            return
+
+        for table in tables:
+            indexes = connection.execute(text(
+                "SELECT indexname FROM pg_indexes WHERE tablename = :table_name"
+            ), {"table_name": table.name}).scalars().all()
+            connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {table.name}_legacy"))
+            for index_name in indexes:
+                connection.execute(text(f"ALTER INDEX {index_name} RENAME TO {index_name}_legacy"))
+        # Through metadata so existing enum types are reused rather than recreated
+        Base.metadata.create_all(connection, tables=tables)
+
+        first_month = min(
+            connection.execute(text(f"SELECT min(created_at)::date FROM {table.name}_legacy")).scalar()
+            or date.today()
+            for table in tables
+        )
+        ensure_partitions(connection, months_ahead, first_month=first_month)
+
+        for table in tables:
+            columns = ", ".join(column.name for column in table.columns)
+            connection.execute(text(
+                f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {table.name}_legacy"
+            ))
+        for table in reversed(tables):
+            connection.execute(text(f"DROP TABLE {table.name}_legacy CASCADE"))
+
+        logger.info(f"Converted {', '.join(table.name for table in tables)} to partitioned tables")
+
+def register_order_numbers(connection: Connection):
+    """
+    Fill an empty order_numbers table from existing orders, for databases
+    partitioned before order numbers were registered. The oldest order keeps
+    a number that was used twice.
+    """
+    if connection.execute(text("SELECT 1 FROM order_numbers LIMIT 1")).first() is not None:
+        return
+    registered = connection.execute(text("""
+        INSERT INTO order_numbers (order_number, order_id)
+        SELECT DISTINCT ON (order_number) order_number, id FROM orders ORDER BY order_number, created_at
+    """)).rowcount
+    if registered:
+        logger.info(f"Registered {registered} existing order numbers")
+
+def maintain_partitions(archive: bool = True):
+    """Pre-create upcoming partitions and archive expired ones (Postgres only)."""
+    if engine.dialect.name != "postgresql":
+        logger.info("Partition maintenance skipped: database is not PostgreSQL")
+        return
+
+    convert_to_partitioned(settings.partition_premake_months)
+    with engine.begin() as connection:
+        ensure_partitions(connection, settings.partition_premake_months)
+        register_order_numbers(connection)
+    logger.info(f"Partitions ensured {settings.partition_premake_months} months ahead")
+
+    if archive:
+        archived = archive_partitions(settings.partition_retention_months, settings.partition_archive_dir)
+        logger.info(f"Archived {len(archived)} expired partitions")
+        prune_archives(settings.partition_archive_dir, settings.partition_archive_retention_months)
+
+if __name__ == "__main__":
+    maintain_partitions()
@@ -0,0 +1,41 @@
+"""
+Hotel Management System - Payment and Audit Schemas
+Pydantic models for payment and audit log API responses.
+"""
+
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+from ..models.payment import PaymentMethodEnum, PaymentTypeEnum, PaymentStatusEnum, ActionEnum
+
+class PaymentResponse(BaseModel):
+    """Schema for payment response."""
+    id: UUID
+    order_id: Optional[UUID] = None
+    reservation_id: Optional[UUID] = None
+    amount: Decimal
+    payment_method: PaymentMethodEnum
+    payment_type: PaymentTypeEnum
+    transaction_id: Optional[str] = None
+    status: PaymentStatusEnum
+    processed_by: Optional[UUID] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class AuditLogResponse(BaseModel):
+    """Schema for audit log response."""
+    id: UUID
+    table_name: str
+    record_id: UUID
+    action: ActionEnum
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
+    changed_by: Optional[UUID] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
@@ -3,10 +3,10 @@ Hotel Management System - Payment and Audit Models
 Handles financial transactions and audit logging.
 """
 
-from sqlalchemy import Column, String, Text, ForeignKey, Enum, DECIMAL
+from sqlalchemy import Column, String, Text, ForeignKey, Enum, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from .base import BaseModel
+from .base import PartitionedModel
 import enum
 
 class PaymentMethodEnum(str, enum.Enum):
@@ -15,6 +15,7 @@ class PaymentMethodEnum(str, enum.Enum):
     CARD = "card"
     MOBILE_PAYMENT = "mobile_payment"
     BANK_TRANSFER = "bank_transfer"
+    ROOM_CHARGE = "room_charge"  # Posted to the guest folio, e.g. by the night audit
 
 class PaymentTypeEnum(str, enum.Enum):
     """Payment type enumeration."""
@@ -30,11 +31,16 @@ class PaymentStatusEnum(str, enum.Enum):
     FAILED = "failed"
     REFUNDED = "refunded"
 
-class Payment(BaseModel):
+class Payment(PartitionedModel):
     """Payment model for financial transactions."""
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination order; the primary key leads with id so it cannot serve it
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
-    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"))
+    order_id = Column(UUID(as_uuid=True), index=True)  # No FK: orders is partitioned
     reservation_id = Column(UUID(as_uuid=True), ForeignKey("reservations.id"))
     amount = Column(DECIMAL(10, 2), nullable=False)
     payment_method = Column(Enum(PaymentMethodEnum), nullable=False)
@@ -44,7 +50,7 @@ class Payment(BaseModel):
     processed_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     
     # Relationships
-    order = relationship("Order", back_populates="payments")
+    order = relationship("Order", back_populates="payments", primaryjoin="foreign(Payment.order_id) == Order.id")
     reservation = relationship("Reservation", back_populates="payments")
     processed_by_user = relationship("User", back_populates="processed_payments")
     
@@ -87,9 +93,14 @@ class ActionEnum(str, enum.Enum):
     UPDATE = "UPDATE"
     DELETE = "DELETE"
 
-class AuditLog(BaseModel):
+class AuditLog(PartitionedModel):
     """Audit log model for tracking changes."""
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Keyset pagination order; the primary key leads with id so it cannot serve it
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
     table_name = Column(String(50), nullable=False)
     record_id = Column(UUID(as_uuid=True), nullable=False)
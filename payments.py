@@ -0,0 +1,47 @@
+"""
+Hotel Management System - Payments Router
+Handles payment listings for the cashier and finance.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from ..core.database import get_db
+from ..core.fieldsets import parse_fields, load_options, fieldset_page
+from ..core.pagination import paginate
+from ..core.security import require_cashier
+from ..models.payment import Payment, PaymentTypeEnum, PaymentStatusEnum
+from ..models.user import User
+from ..schemas.payment import PaymentResponse
+from ..schemas.pagination import CursorPage
+
+router = APIRouter(prefix="/payments", tags=["Payments"])
+
+@router.get("", response_model=CursorPage[PaymentResponse])
+async def list_payments(
+    payment_type: Optional[PaymentTypeEnum] = None,
+    status: Optional[PaymentStatusEnum] = None,
+    reservation_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_cashier)
+):
+    """
+    List payments, newest first, one page at a time.
+    Deep pages cost the same as the first one.
+    `fields` limits the response to the listed fields, e.g. `amount,payment_type,status`.
+    """
+    fieldset = parse_fields(fields, PaymentResponse)
+    statement = select(Payment).options(*load_options(Payment, PaymentResponse, fieldset))
+    if payment_type:
+        statement = statement.where(Payment.payment_type == payment_type)
+    if status:
+        statement = statement.where(Payment.status == status)
+    if reservation_id:
+        statement = statement.where(Payment.reservation_id == reservation_id)
+    payments, next_cursor = paginate(db, statement, Payment, cursor, limit)
+    return fieldset_page(PaymentResponse, fieldset, payments, next_cursor, limit)
@@ -0,0 +1,244 @@
+"""
+Hotel Management System - Rate Limiting
+Per-user token buckets and load shedding that keep operational routes responsive.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from .config import settings, SECRET_KEY, ALGORITHM
+import json
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+OPERATIONAL = "operational"
+DEFAULT = "default"
+ANALYTICS = "analytics"
+
+# Path prefix -> route class; unlisted paths are DEFAULT
+ROUTE_CLASSES = [
+    ("/api/v1/analytics", ANALYTICS),
+    ("/api/v1/exports", ANALYTICS),
+    ("/api/v1/audit-logs", ANALYTICS),
+    ("/api/v1/reservations", OPERATIONAL),
+    ("/api/v1/orders", OPERATIONAL),
+    ("/api/v1/payments", OPERATIONAL),
+    ("/api/v1/kitchen", OPERATIONAL),
+    ("/api/v1/rooms", OPERATIONAL),
+    ("/api/v1/guests", OPERATIONAL),
+    ("/api/v1/auth", OPERATIONAL),
+]
+
+# Share of the in-flight and pool wait limits at which each class is shed,
+# so analytics is turned away first and operational routes last
+SHED_AT = {ANALYTICS: 0.5, DEFAULT: 0.8, OPERATIONAL: 1.0}
+
+# Never limited, so load balancers keep seeing the worker as alive
+EXEMPT_PATHS = {"/health"}
+
+# Long-lived event streams; rate limited on connect but not counted as in flight
+STREAM_SUFFIXES = ("/stream", "/status-stream")
+
+_WAIT_KEY = "pool_wait_started"
+
+# Pool wait samples older than this no longer count as current load
+POOL_WAIT_WINDOW = 5.0
+
+# Idle buckets are dropped this often
+PRUNE_INTERVAL = 60.0
+
+def route_class(path: str) -> str:
+    """Get the route class of a request path."""
+    for prefix, name in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return name
+    return DEFAULT
+
+@lru_cache(maxsize=4096)
+def token_subject(token: str) -> Optional[str]:
+    """Get the verified `sub` claim of a JWT; decoded once per token."""
+    from jose import JWTError, jwt
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`; each request takes one."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token; returns 0 if one was available, else the seconds until the next one."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+class PoolWaitMonitor:
+    """
+    Moving average of how long sessions wait for a database connection,
+    measured from a transaction's first statement to its begin. Waits come
+    from the PostgreSQL QueuePool; SQLite connections are opened per checkout.
+    """
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.average = 0.0
+        self.sampled_at = 0.0
+
+    def current(self) -> float:
+        """Recent average wait in seconds; 0 if no connection was taken lately."""
+        if time.monotonic() - self.sampled_at > POOL_WAIT_WINDOW:
+            return 0.0
+        return self.average
+
+    def record(self, seconds: float):
+        self.average += self.alpha * (seconds - self.average)
+        self.sampled_at = time.monotonic()
+
+    def _before_execute(self, orm_execute_state):
+        session = orm_execute_state.session
+        if not session.in_transaction():
+            session.info[_WAIT_KEY] = time.perf_counter()
+
+    def _after_begin(self, session: Session, transaction, connection):
+        started = session.info.pop(_WAIT_KEY, None)
+        if started is not None:
+            self.record(time.perf_counter() - started)
+
+    def install(self, session_factory):
+        """Measure connection waits of sessions from the factory."""
+        if not event.contains(session_factory, "after_begin", self._after_begin):
+            event.listen(session_factory, "do_orm_execute", self._before_execute)
+            event.listen(session_factory, "after_begin", self._after_begin)
+
+pool_wait_monitor = PoolWaitMonitor()
+
+class RateLimiter:
+    """Token buckets per user and route class, plus in-flight request accounting."""
+
+    def __init__(self):
+        self.limits = {
+            OPERATIONAL: (settings.rate_limit_operational_per_minute, settings.rate_limit_operational_burst),
+            DEFAULT: (settings.rate_limit_default_per_minute, settings.rate_limit_default_burst),
+            ANALYTICS: (settings.rate_limit_analytics_per_minute, settings.rate_limit_analytics_burst),
+        }
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._pruned = time.monotonic()
+        self.in_flight = 0
+        self.limited = 0
+        self.shed = 0
+
+    def retry_after(self, client: str, name: str) -> float:
+        """Take a token from the client's bucket for the class; 0 if admitted."""
+        now = time.monotonic()
+        if now - self._pruned > PRUNE_INTERVAL:
+            self._buckets = {key: bucket for key, bucket in self._buckets.items() if not bucket.is_full(now)}
+            self._pruned = now
+        bucket = self._buckets.get((client, name))
+        if bucket is None:
+            per_minute, burst = self.limits[name]
+            bucket = self._buckets[(client, name)] = TokenBucket(per_minute / 60, burst, now)
+        return bucket.take(now)
+
+    def overloaded(self, name: str) -> bool:
+        """Whether requests of the class should be shed at the current load."""
+        share = SHED_AT[name]
+        return (
+            self.in_flight >= settings.admission_max_in_flight * share
+            or pool_wait_monitor.current() >= settings.admission_max_pool_wait * share
+        )
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "pool_wait_ms": round(pool_wait_monitor.current() * 1000, 1),
+            "rate_limited": self.limited,
+            "shed": self.shed,
+        }
+
+rate_limiter = RateLimiter()
+
+def _client_key(scope) -> str:
+    """The JWT subject of the request, or the client address for anonymous requests."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                subject = token_subject(token)
+                if subject is not None:
+                    return f"user:{subject}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+async def _reject(send, status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware answering 429 when a user's bucket for the route class is
+    empty and 503 when the worker is too busy for the route class, both with
+    Retry-After.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.rate_limit_enabled
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        name = route_class(path)
+        if rate_limiter.overloaded(name):
+            rate_limiter.shed += 1
+            await _reject(send, 503, "Server busy, please retry", settings.admission_retry_after)
+            return
+
+        retry_after = rate_limiter.retry_after(_client_key(scope), name)
+        if retry_after:
+            rate_limiter.limited += 1
+            await _reject(send, 429, "Too many requests", retry_after)
+            return
+
+        if path.endswith(STREAM_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+        rate_limiter.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            rate_limiter.in_flight -= 1
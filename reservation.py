@@ -3,7 +3,7 @@ Hotel Management System - Reservation Model
 Handles room reservations, check-in/check-out processes.
 """
 
-from sqlalchemy import Column, Date, DateTime, Integer, Text, ForeignKey, Enum, DECIMAL
+from sqlalchemy import Column, Date, DateTime, Integer, Text, ForeignKey, Enum, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from .base import BaseModel
@@ -16,10 +16,15 @@ class ReservationStatusEnum(str, enum.Enum):
     CHECKED_IN = "checked_in"
     CHECKED_OUT = "checked_out"
     CANCELLED = "cancelled"
+    NO_SHOW = "no_show"
 
 class Reservation(BaseModel):
     """Reservation model for room bookings."""
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_reservations_created_at_id", "created_at", "id"),
+    )
     
     guest_id = Column(UUID(as_uuid=True), ForeignKey("guests.id"), nullable=False)
     room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False)
@@ -0,0 +1,124 @@
+"""
+Hotel Management System - Reservations Router
+Handles reception operations on reservations.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from ..core.database import get_db
+from ..core.fieldsets import parse_fields, load_options, fieldset_page
+from ..core.pagination import paginate
+from ..core.security import require_receptionist
+from ..models.reservation import Reservation, ReservationStatusEnum
+from ..models.user import User
+from ..schemas.guest import (
+    ReservationBulkCheckin, ReservationBulkCheckout, ReservationBulkResult, ReservationBulkResponse,
+    ReservationResponse
+)
+from ..schemas.pagination import CursorPage
+from ..services.front_desk import bulk_checkin, bulk_checkout
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/reservations", tags=["Reservations"])
+
+def _parse_ids(reservation_ids: List[str]):
+    """Split requested ids into valid UUIDs and failure results for malformed ones."""
+    valid, invalid = [], []
+    for reservation_id in reservation_ids:
+        try:
+            valid.append(UUID(reservation_id))
+        except ValueError:
+            invalid.append(ReservationBulkResult(
+                reservation_id=reservation_id, success=False, detail="Invalid reservation id"
+            ))
+    return valid, invalid
+
+def _bulk_response(outcomes: List[dict], invalid: List[ReservationBulkResult]) -> ReservationBulkResponse:
+    """Build the per-reservation response of a group operation."""
+    results = [
+        ReservationBulkResult(
+            reservation_id=str(outcome["reservation_id"]),
+            success=outcome["success"],
+            detail=outcome["detail"]
+        )
+        for outcome in outcomes
+    ] + invalid
+    succeeded = sum(1 for result in results if result.success)
+    return ReservationBulkResponse(
+        processed=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+@router.get("", response_model=CursorPage[ReservationResponse])
+async def list_reservations(
+    status: Optional[ReservationStatusEnum] = None,
+    guest_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_receptionist)
+):
+    """
+    List reservations, newest first, one page at a time.
+    `fields` limits the response to the listed fields; nested fields use dots,
+    e.g. `checkin_date,status,guest.last_name,room.room_number`.
+    """
+    fieldset = parse_fields(fields, ReservationResponse)
+    statement = select(Reservation).options(*load_options(Reservation, ReservationResponse, fieldset))
+    if status:
+        statement = statement.where(Reservation.status == status)
+    if guest_id:
+        statement = statement.where(Reservation.guest_id == guest_id)
+    reservations, next_cursor = paginate(db, statement, Reservation, cursor, limit)
+    return fieldset_page(ReservationResponse, fieldset, reservations, next_cursor, limit)
+
+@router.post("/bulk-checkin", response_model=ReservationBulkResponse)
+async def group_checkin(
+    request: ReservationBulkCheckin,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_receptionist)
+):
+    """
+    Check in a group of reservations in one transaction.
+    Eligible reservations are checked in; the others are reported with the reason.
+    """
+    started = time.perf_counter()
+    reservation_ids, invalid = _parse_ids(request.reservation_ids)
+    outcomes = bulk_checkin(db, reservation_ids, request.checkin_time) if reservation_ids else []
+    response = _bulk_response(outcomes, invalid)
+
+    logger.info(
+        f"Group check-in by {current_user.username}: {response.succeeded}/{response.processed} "
+        f"reservations in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return response
+
+@router.post("/bulk-checkout", response_model=ReservationBulkResponse)
+async def group_checkout(
+    request: ReservationBulkCheckout,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_receptionist)
+):
+    """
+    Check out a group of reservations in one transaction.
+    Eligible reservations are checked out; the others are reported with the reason.
+    """
+    started = time.perf_counter()
+    reservation_ids, invalid = _parse_ids(request.reservation_ids)
+    outcomes = bulk_checkout(db, reservation_ids, request.checkout_time) if reservation_ids else []
+    response = _bulk_response(outcomes, invalid)
+
+    logger.info(
+        f"Group check-out by {current_user.username}: {response.succeeded}/{response.processed} "
+        f"reservations in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return response
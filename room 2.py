@@ -7,6 +7,7 @@ from pydantic import BaseModel, validator
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 from ..models.room import RoomStatusEnum
 
 class RoomTypeBase(BaseModel):
@@ -42,7 +43,7 @@ class RoomTypeUpdate(BaseModel):
 
 class RoomTypeResponse(RoomTypeBase):
     """Schema for room type response."""
-    id: str
+    id: UUID
     created_at: datetime
     
     class Config:
@@ -79,8 +80,8 @@ class RoomStatusUpdate(BaseModel):
 
 class RoomResponse(RoomBase):
     """Schema for room response."""
-    id: str
-    room_type_id: str
+    id: UUID
+    room_type_id: UUID
     room_type: RoomTypeResponse
     created_at: datetime
     updated_at: datetime
@@ -0,0 +1,184 @@
+"""
+Hotel Management System - Room Status Board
+In-memory room status map kept current from committed Room changes and pushed to front desk screens.
+"""
+
+from fastapi import Request
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.events import Broadcaster, RESYNC, CLOSED, format_sse, format_heartbeat
+from ..core.invalidation import invalidation_bus
+from ..models import Room
+import asyncio
+import enum
+import logging
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "room_board_pending"
+
+def _status_value(status) -> Optional[str]:
+    return status.value if isinstance(status, enum.Enum) else status
+
+class RoomStatusBoard(Broadcaster):
+    """
+    Room id -> (room number, status) map with a version counter.
+    Clients get a full snapshot on connect, then deltas carrying only the
+    rooms changed by each commit.
+    """
+
+    def __init__(self):
+        super().__init__("Room status board")
+        self._lock = threading.Lock()
+        self._rooms: Dict[str, dict] = {}
+        self._version = 0
+
+    def load(self, db: Session):
+        """Fill the map from the rooms table."""
+        rows = db.execute(select(Room.id, Room.room_number, Room.status)).all()
+        with self._lock:
+            self._rooms = {
+                str(room_id): {"id": str(room_id), "room_number": room_number, "status": _status_value(status)}
+                for room_id, room_number, status in rows
+            }
+            self._version += 1
+        logger.info(f"Room status board loaded with {len(rows)} rooms")
+
+    def refresh(self, session_factory=SessionLocal):
+        """Reload the rooms after another worker changed them and publish the differences."""
+        db = session_factory()
+        try:
+            rows = db.execute(select(Room.id, Room.room_number, Room.status)).all()
+        finally:
+            db.close()
+        changes = [
+            {"id": str(room_id), "room_number": room_number, "status": _status_value(status)}
+            for room_id, room_number, status in rows
+        ]
+        with self._lock:
+            current = {change["id"] for change in changes}
+            changes += [{"id": room_id, "deleted": True} for room_id in self._rooms if room_id not in current]
+        self.apply(changes)
+
+    def snapshot(self) -> dict:
+        """Get the full board with its version."""
+        with self._lock:
+            return {"version": self._version, "rooms": [dict(room) for room in self._rooms.values()]}
+
+    def apply(self, changes: List[dict]):
+        """Apply committed room changes and publish them as one delta."""
+        with self._lock:
+            delta = []
+            for change in changes:
+                room_id = change["id"]
+                if change.get("deleted"):
+                    if self._rooms.pop(room_id, None) is not None:
+                        delta.append({"id": room_id, "status": None})
+                    continue
+                room = self._rooms.setdefault(room_id, {"id": room_id, "room_number": None, "status": None})
+                updated = {key: value for key, value in change.items() if value is not None and room.get(key) != value}
+                if updated:
+                    room.update(updated)
+                    delta.append({"id": room_id, **updated})
+            if not delta:
+                return
+            self._version += 1
+            version = self._version
+        self.publish({"version": version, "changes": delta})
+
+    async def stream(self, request: Request):
+        """SSE body: a snapshot, then deltas, with heartbeats while idle."""
+        subscriber = self.subscribe()
+        try:
+            snapshot = self.snapshot()
+            version = snapshot["version"]
+            yield format_sse("snapshot", snapshot, version)
+
+            while True:
+                item = await subscriber.next(settings.sse_heartbeat_interval)
+                if item is None:
+                    if await request.is_disconnected():
+                        break
+                    yield format_heartbeat()
+                elif item is CLOSED:
+                    break
+                elif item is RESYNC:
+                    snapshot = self.snapshot()
+                    version = snapshot["version"]
+                    yield format_sse("snapshot", snapshot, version)
+                elif item["version"] > version:
+                    version = item["version"]
+                    yield format_sse("delta", item["changes"], version)
+        finally:
+            self.unsubscribe(subscriber)
+
+room_board = RoomStatusBoard()
+
+def queue_room_changes(session: Session, changes: List[dict]):
+    """
+    Queue room changes made with set-based statements, which bypass the flush
+    hooks; they are published once the session commits.
+    """
+    session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+def _room_change(room: Room, deleted: bool = False) -> dict:
+    change = {"id": str(room.id)}
+    if deleted:
+        change["deleted"] = True
+    else:
+        change["room_number"] = room.room_number
+        # Column defaults are only applied at flush time
+        status = room.status if room.status is not None else Room.__table__.c.status.default.arg
+        change["status"] = _status_value(status)
+    return change
+
+def _before_flush(session: Session, flush_context, instances):
+    """Collect room inserts, status/number changes and deletes before they are flushed."""
+    changes = []
+    for room in session.new:
+        if isinstance(room, Room):
+            # Assign the primary key up front so the change can reference it
+            if room.id is None:
+                room.id = uuid.uuid4()
+            changes.append(_room_change(room))
+    for room in session.dirty:
+        if not isinstance(room, Room):
+            continue
+        state = inspect(room)
+        if state.attrs.status.history.has_changes() or state.attrs.room_number.history.has_changes():
+            changes.append(_room_change(room))
+    for room in session.deleted:
+        if isinstance(room, Room):
+            changes.append(_room_change(room, deleted=True))
+    if changes:
+        queue_room_changes(session, changes)
+
+def _after_commit(session: Session):
+    """Publish the committed room changes."""
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        room_board.apply(changes)
+
+def _after_soft_rollback(session: Session, previous_transaction):
+    """Discard room changes of rolled back transactions."""
+    session.info.pop(_PENDING_KEY, None)
+
+def start_room_board(loop: asyncio.AbstractEventLoop, session_factory=SessionLocal):
+    """Load the board, bind it to the event loop and start listening to commits."""
+    db = session_factory()
+    try:
+        room_board.load(db)
+    finally:
+        db.close()
+    room_board.bind(loop)
+    if not event.contains(session_factory, "before_flush", _before_flush):
+        event.listen(session_factory, "before_flush", _before_flush)
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+        # Rooms changed by other workers
+        invalidation_bus.register(Room.__tablename__, lambda table_name: room_board.refresh(session_factory), local=False)
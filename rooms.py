@@ -0,0 +1,31 @@
+"""
+Hotel Management System - Rooms Router
+Handles room status for the front desk.
+"""
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from ..core.security import get_current_identity, AuthenticatedUser
+from ..services.room_board import room_board
+
+router = APIRouter(prefix="/rooms", tags=["Rooms"])
+
+@router.get("/status-board")
+async def get_status_board(current_user: AuthenticatedUser = Depends(get_current_identity)):
+    """
+    Get the current status of every room, served from memory.
+    """
+    return room_board.snapshot()
+
+@router.get("/status-stream")
+async def stream_status_board(request: Request, current_user: AuthenticatedUser = Depends(get_current_identity)):
+    """
+    Stream room status changes as Server-Sent Events.
+    Sends a `snapshot` event on connect (and after falling behind), then a
+    `delta` event per committed change carrying only the rooms that changed.
+    """
+    return StreamingResponse(
+        room_board.stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -4,21 +4,29 @@ Handles authentication, authorization, password hashing, and JWT tokens.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Union
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-from .database import get_db
+from .database import get_db, SessionLocal
+from .audit import USER_KEY as AUDIT_USER_KEY
+from .invalidation import invalidation_bus
 import logging
+import uuid
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    Get the password hashing context, created on first use so importing passlib
+    and loading the bcrypt backend stay off the startup path.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # JWT token security
 security = HTTPBearer()
@@ -31,14 +39,15 @@ class UserRole:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
+    from jose import jwt  # Deferred: python-jose loads its crypto backends on import
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -51,6 +60,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode JWT token."""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -69,19 +79,15 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        # Extract token from credentials
-        token = credentials.credentials
-        payload = verify_token(token)
+    # Extract token from credentials; verify_token handles decoding errors
+    token = credentials.credentials
+    payload = verify_token(token)
+    
+    if payload is None:
+        raise credentials_exception
         
-        if payload is None:
-            raise credentials_exception
-            
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-            
-    except JWTError:
+    username: str = payload.get("sub")
+    if username is None:
         raise credentials_exception
     
     # Import here to avoid circular imports
@@ -96,9 +102,57 @@ async def get_current_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
+    
+    # Attribute audited changes made in this session to the user
+    db.info[AUDIT_USER_KEY] = user.id
         
     return user
 
+class AuthenticatedUser(NamedTuple):
+    """Identity of an active user, for endpoints that do not need the User row."""
+    id: uuid.UUID
+    username: str
+    role: str
+
+# Username -> identity of active users, dropped whenever any worker changes the users table
+_identities: Dict[str, AuthenticatedUser] = {}
+
+invalidation_bus.register("users", lambda table_name: _identities.clear())
+
+async def get_current_identity(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthenticatedUser:
+    """
+    Get the authenticated user's identity from the JWT token, without a database
+    session once the user is cached in this worker.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = verify_token(credentials.credentials)
+    username = payload.get("sub") if payload else None
+    if username is None:
+        raise credentials_exception
+
+    identity = _identities.get(username)
+    if identity is None:
+        from ..models.user import User
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.username == username).first()
+        finally:
+            db.close()
+        if user is None:
+            raise credentials_exception
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inactive user"
+            )
+        identity = AuthenticatedUser(user.id, user.username, user.role)
+        _identities[username] = identity
+    return identity
+
 async def get_current_active_user(current_user = Depends(get_current_user)):
     """Get current active user."""
     return current_user
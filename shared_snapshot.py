@@ -0,0 +1,161 @@
+"""
+Hotel Management System - Shared Snapshots
+Memory-mapped snapshots written by one elected process and read by every worker.
+"""
+
+from typing import Callable, Optional, Tuple
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sequence number, write time and payload length
+HEADER = struct.Struct("<QdQ")
+_SEQUENCE = struct.Struct("<Q")
+_METADATA = struct.Struct("<dQ")
+
+# Reads retried while a write is in progress before giving up
+READ_ATTEMPTS = 100
+
+class SharedSnapshot:
+    """
+    Fixed-size memory-mapped file holding the latest version of a payload.
+    The sequence number in the header works as a seqlock: it is odd while the
+    single writer updates the payload, and a reader retries when it is odd or
+    changed while the payload was copied.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        # (sequence, payload, written_at) of the last read, so unchanged snapshots are not copied again
+        self._cached: Tuple[int, Optional[bytes], float] = (0, None, 0.0)
+
+    def _mapping(self) -> mmap.mmap:
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                    try:
+                        if os.fstat(fd).st_size < self.size:
+                            os.ftruncate(fd, self.size)
+                        self._map = mmap.mmap(fd, self.size)
+                    finally:
+                        os.close(fd)
+        return self._map
+
+    def write(self, payload: bytes):
+        """Publish a new payload; only one process may write."""
+        if HEADER.size + len(payload) > self.size:
+            raise ValueError(f"Snapshot of {len(payload)} bytes does not fit in {self.path}")
+        mapping = self._mapping()
+        sequence = _SEQUENCE.unpack_from(mapping, 0)[0]
+        # An odd sequence means a previous writer died mid-update
+        writing = sequence if sequence % 2 else sequence + 1
+        _SEQUENCE.pack_into(mapping, 0, writing)
+        mapping[HEADER.size:HEADER.size + len(payload)] = payload
+        _METADATA.pack_into(mapping, _SEQUENCE.size, time.time(), len(payload))
+        _SEQUENCE.pack_into(mapping, 0, writing + 1)
+
+    def read(self) -> Tuple[Optional[bytes], float]:
+        """Get the latest payload and its write time; (None, 0) if nothing was published yet."""
+        mapping = self._mapping()
+        for _ in range(READ_ATTEMPTS):
+            sequence, written_at, length = HEADER.unpack_from(mapping, 0)
+            if sequence == 0:
+                return None, 0.0
+            if sequence % 2:
+                time.sleep(0)
+                continue
+            cached_sequence, cached_payload, cached_written_at = self._cached
+            if sequence == cached_sequence:
+                return cached_payload, cached_written_at
+            payload = bytes(mapping[HEADER.size:HEADER.size + length])
+            if _SEQUENCE.unpack_from(mapping, 0)[0] == sequence:
+                self._cached = (sequence, payload, written_at)
+                return payload, written_at
+        return None, 0.0
+
+class SnapshotRefresher:
+    """
+    Recomputes a shared snapshot in a single process per host. Workers compete
+    for an exclusive lock on a file next to the snapshot; the holder refreshes
+    periodically and when triggered, the others keep retrying in case it exits.
+    """
+
+    def __init__(self, snapshot: SharedSnapshot, compute: Callable[[], bytes], name: str,
+                 interval: float, min_interval: float):
+        self.snapshot = snapshot
+        self.compute = compute
+        self.name = name
+        self.interval = interval
+        self.min_interval = min_interval
+        self.is_refresher = False
+        self.refreshes = 0
+        self._lock_fd: Optional[int] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def trigger(self):
+        """Ask for an early refresh, e.g. after the underlying data changed."""
+        self._wake.set()
+
+    def start(self):
+        """Start competing for the refresher role."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop refreshing and give up the refresher role."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            self.is_refresher = False
+
+    def _acquire(self) -> bool:
+        """Try to become the refresher; the OS releases the lock if this process dies."""
+        import fcntl
+        if self._lock_fd is None:
+            self._lock_fd = os.open(f"{self.snapshot.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        logger.info(f"This worker (pid {os.getpid()}) refreshes the {self.name} snapshot")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.is_refresher:
+                self.is_refresher = self._acquire()
+                if not self.is_refresher:
+                    self._stop.wait(self.interval)
+                    continue
+            self._wake.clear()
+            started = time.perf_counter()
+            try:
+                self.snapshot.write(self.compute())
+                self.refreshes += 1
+                logger.debug(f"{self.name} snapshot refreshed in {(time.perf_counter() - started) * 1000:.1f} ms")
+            except Exception as e:
+                logger.error(f"{self.name} snapshot refresh failed: {e}")
+            # Refresh again after the interval, or sooner when triggered, but never more often than min_interval
+            if self._stop.wait(self.min_interval):
+                break
+            self._wake.wait(max(self.interval - self.min_interval, 0))
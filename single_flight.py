@@ -0,0 +1,114 @@
+"""
+Hotel Management System - Request Coalescing
+Runs identical concurrent computations once and shares the result between callers.
+"""
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import enum
+import functools
+import inspect
+import time
+
+class SingleFlight:
+    """
+    The first caller for a key starts the computation as a task; callers
+    arriving while it runs await the same task. With a hold time, results are
+    also kept briefly for callers arriving just after it finished.
+    """
+
+    def __init__(self, hold_seconds: float = 0.0):
+        self.hold_seconds = hold_seconds
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._held: Dict[Hashable, Tuple[float, Any]] = {}
+        # Per key name (the first element of the key)
+        self.executions = Counter()
+        self.coalesced = Counter()
+        self.held = Counter()
+
+    async def do(self, key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the result of compute() for the key, running it only if no other caller is."""
+        name = key[0]
+        held = self._held.get(key)
+        if held is not None and held[0] > time.monotonic():
+            self.held[name] += 1
+            return held[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+            self.executions[name] += 1
+        else:
+            self.coalesced[name] += 1
+        # A caller disconnecting must not cancel the computation the others wait for
+        return await asyncio.shield(task)
+
+    def _finished(self, key: tuple, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.hold_seconds <= 0:
+            return
+        now = time.monotonic()
+        self._held = {held_key: held for held_key, held in self._held.items() if held[0] > now}
+        self._held[key] = (now + self.hold_seconds, task.result())
+
+    def stats(self) -> dict:
+        """Executions and the executions saved by coalescing or held results, per key name."""
+        names = set(self.executions) | set(self.coalesced) | set(self.held)
+        return {
+            name: {
+                "executions": self.executions[name],
+                "coalesced": self.coalesced[name],
+                "held": self.held[name],
+                "saved": self.coalesced[name] + self.held[name],
+            }
+            for name in sorted(names)
+        }
+
+def _normalize(value) -> Hashable:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return tuple(sorted((name, _normalize(field)) for name, field in value.model_dump().items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_normalize(item) for item in value)
+    return value
+
+def coalesce(flight: SingleFlight, session_factory: Optional[Callable[[], Session]] = None,
+             exclude=("db", "current_user")):
+    """
+    Decorate an async endpoint so identical concurrent calls, with the same
+    parameters other than the excluded ones, share one computation. The
+    computation runs in the threadpool, since the endpoints query the database
+    synchronously and would otherwise hold the event loop. It uses its own
+    session from session_factory rather than the first caller's, which is
+    closed if that caller disconnects while the others still wait.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        def compute(arguments: dict):
+            if session_factory is None or "db" not in arguments:
+                return asyncio.run(endpoint(**arguments))
+            db = session_factory()
+            try:
+                return asyncio.run(endpoint(**{**arguments, "db": db}))
+            finally:
+                db.close()
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (endpoint.__name__,) + tuple(
+                (name, _normalize(value)) for name, value in bound.arguments.items() if name not in exclude
+            )
+            return await flight.do(key, lambda: run_in_threadpool(compute, dict(bound.arguments)))
+
+        return wrapper
+    return decorator
@@ -0,0 +1,80 @@
+"""
+Hotel Management System - Startup Timing
+Per-phase startup timing, and a cold start measurement for CI.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Optional
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+class StartupTimer:
+    """Records how long each startup phase takes, from the first application import."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.total: Optional[float] = None
+
+    def mark(self, name: str):
+        """Record a phase that ran from the start until now (e.g. module imports)."""
+        self.phases[name] = time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as a named phase."""
+        phase_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - phase_started
+
+    def finish(self):
+        """Record the total startup time."""
+        self.total = time.perf_counter() - self.started
+
+    def report(self) -> dict:
+        """Get the startup times in milliseconds."""
+        return {
+            "total_ms": round(self.total * 1000, 1) if self.total is not None else None,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+        }
+
+    def summary(self) -> str:
+        """One-line startup report for the log."""
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        return f"Startup took {self.total * 1000:.0f} ms ({phases})"
+
+# Created when app.main starts importing, so the imports phase covers the whole import chain
+startup_timer = StartupTimer()
+
+def main():
+    """Start and stop the application once and print the startup times as JSON."""
+    parser = argparse.ArgumentParser(description="Measure application cold start")
+    parser.add_argument("--budget-ms", type=float, help="Exit with an error if startup takes longer")
+    parser.add_argument("--output", help="Also write the JSON report to this file, e.g. as a CI artifact")
+    args = parser.parse_args()
+
+    # Run as a script this module is __main__, so use the timer app.main uses
+    from ..main import app
+    from .startup import startup_timer as timer
+
+    async def start_and_stop():
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(start_and_stop())
+    report = timer.report()
+    print(json.dumps(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file)
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"Startup took {report['total_ms']} ms, over the {args.budget_ms} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Hotel Management System - Front Desk Tests
+Per-reservation outcomes of group check-in and check-out.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Guest, Reservation, ReservationStatusEnum, Room, RoomStatusEnum, RoomType
+from app.services.front_desk import bulk_checkin, bulk_checkout
+import uuid
+import pytest
+
+pytestmark = pytest.mark.skipif(not settings.test_database_url, reason="TEST_DATABASE_URL is not set")
+
+@pytest.fixture(scope="module")
+def session_factory():
+    engine = create_engine(settings.test_database_url)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def guest(db):
+    guest = Guest(first_name="Ada", last_name="Group", phone=f"+1{uuid.uuid4().int % 10**9:09d}")
+    db.add(guest)
+    db.commit()
+    return guest
+
+@pytest.fixture
+def room_type(db):
+    room_type = RoomType(name=f"Double {uuid.uuid4().hex[:8]}", base_price=Decimal("100.00"), max_occupancy=2)
+    db.add(room_type)
+    db.commit()
+    return room_type
+
+def make_room(db, room_type) -> Room:
+    room = Room(room_number=uuid.uuid4().hex[:10], room_type_id=room_type.id, floor_number=1)
+    db.add(room)
+    db.commit()
+    return room
+
+def make_reservation(db, guest, room, checkin_date=None, status=ReservationStatusEnum.CONFIRMED) -> Reservation:
+    checkin_date = checkin_date or date.today()
+    reservation = Reservation(
+        guest_id=guest.id,
+        room_id=room.id,
+        checkin_date=checkin_date,
+        checkout_date=checkin_date + timedelta(days=2),
+        total_amount=Decimal("200.00"),
+        status=status
+    )
+    db.add(reservation)
+    db.commit()
+    return reservation
+
+def outcomes(results) -> dict:
+    return {result["reservation_id"]: (result["success"], result["detail"]) for result in results}
+
+def test_checkin_moves_eligible_reservations_and_rooms(db, guest, room_type):
+    rooms = [make_room(db, room_type) for _ in range(2)]
+    reservations = [make_reservation(db, guest, room) for room in rooms]
+
+    results = outcomes(bulk_checkin(db, [reservation.id for reservation in reservations]))
+
+    assert all(success for success, _ in results.values())
+    db.expire_all()
+    assert {reservation.status for reservation in reservations} == {ReservationStatusEnum.CHECKED_IN}
+    assert all(reservation.actual_checkin is not None for reservation in reservations)
+    assert {room.status for room in rooms} == {RoomStatusEnum.OCCUPIED}
+
+def test_checkin_reports_ineligible_reservations(db, guest, room_type):
+    eligible = make_reservation(db, guest, make_room(db, room_type))
+    future = make_reservation(db, guest, make_room(db, room_type), checkin_date=date.today() + timedelta(days=3))
+    cancelled = make_reservation(db, guest, make_room(db, room_type), status=ReservationStatusEnum.CANCELLED)
+    missing_id = uuid.uuid4()
+
+    results = outcomes(bulk_checkin(db, [eligible.id, future.id, cancelled.id, missing_id]))
+
+    assert results[eligible.id] == (True, None)
+    assert results[future.id] == (False, f"Check-in date is {future.checkin_date.isoformat()}")
+    assert results[cancelled.id] == (False, "Reservation is cancelled")
+    assert results[missing_id] == (False, "Reservation not found")
+    db.expire_all()
+    assert future.status == ReservationStatusEnum.CONFIRMED
+    assert cancelled.status == ReservationStatusEnum.CANCELLED
+
+def test_checkin_allows_one_reservation_per_room(db, guest, room_type):
+    room = make_room(db, room_type)
+    first = make_reservation(db, guest, room)
+    second = make_reservation(db, guest, room)
+
+    results = outcomes(bulk_checkin(db, [first.id, second.id]))
+
+    assert results[first.id] == (True, None)
+    assert results[second.id] == (False, f"Room is already checked in for reservation {first.id}")
+    db.expire_all()
+    assert first.status == ReservationStatusEnum.CHECKED_IN
+    assert second.status == ReservationStatusEnum.CONFIRMED
+
+def test_checkin_rejects_room_checked_in_by_an_earlier_group(db, guest, room_type):
+    room = make_room(db, room_type)
+    first = make_reservation(db, guest, room)
+    second = make_reservation(db, guest, room)
+    bulk_checkin(db, [first.id])
+
+    results = outcomes(bulk_checkin(db, [second.id]))
+
+    assert results[second.id] == (False, f"Room is already checked in for reservation {first.id}")
+
+def test_checkout_moves_rooms_to_cleaning(db, guest, room_type):
+    room = make_room(db, room_type)
+    checked_in = make_reservation(db, guest, room)
+    confirmed = make_reservation(db, guest, make_room(db, room_type))
+    bulk_checkin(db, [checked_in.id])
+
+    results = outcomes(bulk_checkout(db, [checked_in.id, confirmed.id]))
+
+    assert results[checked_in.id] == (True, None)
+    assert results[confirmed.id] == (False, "Reservation is confirmed")
+    db.expire_all()
+    assert checked_in.status == ReservationStatusEnum.CHECKED_OUT
+    assert room.status == RoomStatusEnum.CLEANING
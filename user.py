@@ -6,6 +6,7 @@ Pydantic models for user-related API requests and responses.
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from ..models.user import UserRoleEnum
 
 class UserBase(BaseModel):
@@ -52,7 +53,7 @@ class UserChangePassword(BaseModel):
 
 class UserResponse(UserBase):
     """Schema for user response."""
-    id: str
+    id: UUID
     created_at: datetime
     updated_at: datetime
     
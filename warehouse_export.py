@@ -0,0 +1,170 @@
+"""
+Hotel Management System - Warehouse Export Service
+Writes payments, orders and order lines to date-partitioned Parquet files for BI.
+"""
+
+from sqlalchemy import select, func, Boolean, Date, DateTime, DECIMAL, Enum, Integer, Numeric
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from ..core.config import settings
+from ..core.database import open_analytics_session
+from ..models import Payment, Order, OrderLine
+import pyarrow as pa
+import pyarrow.parquet as pq
+import argparse
+import enum
+import json
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Tables exported to the warehouse
+EXPORT_MODELS = {
+    "payments": Payment,
+    "orders": Order,
+    "order_lines": OrderLine,
+}
+
+# Rows fetched from the server-side cursor per record batch
+BATCH_SIZE = 50000
+
+WATERMARK_FILE = "_watermark.json"
+
+def arrow_type(column) -> pa.DataType:
+    """Map a SQLAlchemy column type to an Arrow type."""
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        # Dictionary encoding stores each enum value once per row group
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(column_type, (DECIMAL, Numeric)) and column_type.precision:
+        return pa.decimal128(column_type.precision, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    return pa.string()
+
+def arrow_schema(model) -> pa.Schema:
+    """Build the Arrow schema of a model's table."""
+    return pa.schema([
+        pa.field(column.name, arrow_type(column), nullable=column.nullable)
+        for column in model.__table__.columns
+    ])
+
+def _arrow_value(value):
+    """Convert a column value to something Arrow can ingest for its mapped type."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+def record_batch(rows: list, schema: pa.Schema) -> pa.RecordBatch:
+    """Convert a chunk of Core rows into an Arrow record batch, column by column."""
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [_arrow_value(row[index]) for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def partition_path(output_dir: str, table_name: str, business_date: date) -> str:
+    """Get the Parquet file of a table for a business date (Hive-style layout)."""
+    return os.path.join(output_dir, table_name, f"business_date={business_date.isoformat()}", "part-0.parquet")
+
+def read_watermarks(output_dir: str) -> Dict[str, str]:
+    """Read the last exported business date per table."""
+    path = os.path.join(output_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as watermark_file:
+        return json.load(watermark_file)
+
+def write_watermarks(output_dir: str, watermarks: Dict[str, str]):
+    """Atomically persist the watermarks."""
+    path = os.path.join(output_dir, WATERMARK_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as watermark_file:
+        json.dump(watermarks, watermark_file, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def export_day(db, model, business_date: date, output_dir: str) -> int:
+    """Export one business date of a table to Parquet; returns the row count."""
+    schema = arrow_schema(model)
+    day_start = datetime.combine(business_date, datetime.min.time())
+    statement = select(*model.__table__.columns).where(
+        model.created_at >= day_start,
+        model.created_at < day_start + timedelta(days=1)
+    ).order_by(model.created_at, model.id).execution_options(yield_per=BATCH_SIZE)
+
+    path = partition_path(output_dir, model.__tablename__, business_date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    row_count = 0
+    # Write to a temporary file so readers never see a partial partition
+    with pq.ParquetWriter(path + ".tmp", schema, compression="snappy") as writer:
+        for rows in db.execute(statement).partitions():
+            writer.write_batch(record_batch(rows, schema))
+            row_count += len(rows)
+    os.replace(path + ".tmp", path)
+    return row_count
+
+def export_table(db, table_name: str, output_dir: str, watermarks: Dict[str, str],
+                 since: Optional[date] = None, until: Optional[date] = None) -> List[date]:
+    """Export every complete business date after the table's watermark."""
+    model = EXPORT_MODELS[table_name]
+    until = until or date.today() - timedelta(days=1)
+
+    if since:
+        start = since
+    elif table_name in watermarks:
+        start = date.fromisoformat(watermarks[table_name]) + timedelta(days=1)
+    else:
+        first_created = db.execute(select(func.min(model.created_at))).scalar()
+        if first_created is None:
+            return []
+        start = first_created.date() if isinstance(first_created, datetime) else date.fromisoformat(str(first_created)[:10])
+
+    exported = []
+    business_date = start
+    while business_date <= until:
+        row_count = export_day(db, model, business_date, output_dir)
+        watermarks[table_name] = business_date.isoformat()
+        write_watermarks(output_dir, watermarks)
+        logger.info(f"Exported {row_count} {table_name} rows for {business_date}")
+        exported.append(business_date)
+        business_date += timedelta(days=1)
+    return exported
+
+def run_export(output_dir: Optional[str] = None, tables: Optional[List[str]] = None,
+               since: Optional[date] = None, until: Optional[date] = None) -> Dict[str, List[date]]:
+    """Run an incremental warehouse export for the given tables."""
+    output_dir = output_dir or settings.warehouse_export_dir
+    os.makedirs(output_dir, exist_ok=True)
+    watermarks = read_watermarks(output_dir)
+
+    db = open_analytics_session()
+    try:
+        return {
+            table_name: export_table(db, table_name, output_dir, watermarks, since, until)
+            for table_name in (tables or list(EXPORT_MODELS))
+        }
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export finance tables to partitioned Parquet files")
+    parser.add_argument("--output", help="Output directory (default: WAREHOUSE_EXPORT_DIR)")
+    parser.add_argument("--table", action="append", choices=list(EXPORT_MODELS), help="Table to export (repeatable)")
+    parser.add_argument("--since", type=date.fromisoformat, help="Re-export from this business date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last business date to export (default: yesterday)")
+    args = parser.parse_args()
+    run_export(args.output, args.table, args.since, args.until)